@@ -1,44 +1,90 @@
 import streamlit as st
-from rdflib import Graph, URIRef, Literal, Namespace, RDF
 import logging
-import plotly.graph_objects as go
-import networkx as nx
-import pandas as pd
-import json
-from typing import Dict, List, Any
-import PyPDF2
-from PIL import Image
-import pytesseract
-import requests
-from bs4 import BeautifulSoup
-from io import BytesIO
-import docx
-import spacy
-import re
-import tempfile
 import os
+import tempfile
+from importlib import metadata
+from entity_extraction.spacy_extraction import (
+    DEFAULT_DISABLED_PIPES,
+    ENTITY_TYPES,
+    entities_from_doc,
+    extract_from_doc,
+    relationships_from_doc,
+)
+from pipeline.extraction_cache import DEFAULT_CACHE_DIR, EXTRACTOR_VERSION, ExtractionCache
+from pipeline.jobs import COMPLETED, FINISHED_STATES, JobManager, JobStore
+from pipeline.large_files import LARGE_FILE_BYTES
+from pipeline.logging_config import configure_logging
+from pipeline.metrics import (
+    EXTRACT,
+    GRAPH_BUILD,
+    NLP_PARSE,
+    VISUALIZE,
+    RunProfiler,
+    default_registry,
+    stage,
+)
+
+# spaCy, PyPDF2, Tesseract, lxml, rdflib, networkx and plotly
+# are imported by the functions that use them, so the first render does not wait
+# for every format handler to load.
+
+SPACY_MODEL = os.environ.get("KG_CONSTRUCTION_SPACY_MODEL", "en_core_web_sm")
+# Characters of extracted text rendered in the page
+TEXT_PREVIEW_CHARS = 20000
+# Worker processes matching relationships in long documents; opt-in, since shipping sentence
+# batches costs more than the matching saves unless there are spare cores (1 matches in-process)
+RELATION_PROCESSES = int(os.environ.get("KG_CONSTRUCTION_RELATION_PROCESSES", "1"))
+
+@st.cache_resource(show_spinner="Loading spaCy model...")
+def load_nlp(model_name=SPACY_MODEL):
+    """Load the spaCy model once per process; it must be installed with the app"""
+    import spacy
+    try:
+        return spacy.load(model_name)
+    except OSError as e:
+        raise RuntimeError(
+            f"spaCy model '{model_name}' is not installed. "
+            f"Install it at build time with: python -m spacy download {model_name}"
+        ) from e
 
-# Load spaCy model for entity extraction
-try:
-    nlp = spacy.load("en_core_web_sm")
-except:
-    st.warning("Downloading spaCy model...")
-    os.system("python -m spacy download en_core_web_sm")
-    nlp = spacy.load("en_core_web_sm")
+def model_version(model_name=SPACY_MODEL):
+    """Installed version of the spaCy model package, read without loading the model"""
+    try:
+        return metadata.version(model_name)
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+@st.cache_resource
+def get_extraction_cache():
+    # Extraction results keyed by upload content hash; the model version is part of the key
+    return ExtractionCache(version=f"{EXTRACTOR_VERSION}-{SPACY_MODEL}-{model_version()}")
+
+@st.cache_resource
+def get_ocr_engine():
+    # Shared OCR worker pool settings for uploaded images and scanned PDF pages
+    from multi_format_processing.ocr_engine import OcrEngine
+    return OcrEngine()
+
+@st.cache_resource
+def get_graph_store():
+    # Persistent graph that documents are added to (and removed from) one at a time
+    from graph_population.graph_store import GraphStore
+    return GraphStore(
+        os.path.join(os.environ.get("KG_CONSTRUCTION_OUTPUT_DIR", "."), "knowledge_graph.db")
+    )
 
 # Setup logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('knowledge_graph.log'),
-        logging.StreamHandler()
-    ]
-)
+configure_logging(log_file='knowledge_graph.log')
 logger = logging.getLogger(__name__)
 
+@st.cache_resource
+def get_job_manager():
+    # Shared by all sessions so uploads keep running across reruns
+    return JobManager(JobStore(os.path.join(DEFAULT_CACHE_DIR, "jobs.db")), max_workers=2)
+
 class DocumentProcessor:
     def __init__(self):
+        self._session = None
         self.supported_formats = {
             'pdf': self.process_pdf,
             'image': self.process_image,
@@ -46,14 +92,21 @@ class DocumentProcessor:
             'docx': self.process_docx
         }
 
+    @property
+    def session(self):
+        # Reused across URL requests so connections are kept alive
+        if self._session is None:
+            import requests
+            self._session = requests.Session()
+        return self._session
+
     def process_pdf(self, file_content):
         """Extract text from PDF file"""
         try:
-            pdf_reader = PyPDF2.PdfReader(BytesIO(file_content))
-            text = ""
-            for page in pdf_reader.pages:
-                text += page.extract_text() + "\n"
-            return text
+            from multi_format_processing.ocr_engine import fill_scanned_pages
+            from multi_format_processing.pdf_extraction import iter_pdf_pages
+            pages = fill_scanned_pages(file_content, list(iter_pdf_pages(file_content)), get_ocr_engine())
+            return "".join(page + "\n" for page in pages)
         except Exception as e:
             logger.error(f"Error processing PDF: {e}")
             return ""
@@ -61,9 +114,7 @@ class DocumentProcessor:
     def process_image(self, file_content):
         """Extract text from image using OCR"""
         try:
-            image = Image.open(BytesIO(file_content))
-            text = pytesseract.image_to_string(image)
-            return text
+            return get_ocr_engine().ocr_image(file_content)["text"]
         except Exception as e:
             logger.error(f"Error processing image: {e}")
             return ""
@@ -71,99 +122,112 @@ class DocumentProcessor:
     def process_url(self, url):
         """Extract text from web page"""
         try:
-            response = requests.get(url)
-            soup = BeautifulSoup(response.text, 'html.parser')
-            # Remove script and style elements
-            for script in soup(["script", "style"]):
-                script.decompose()
-            text = soup.get_text()
-            # Clean up whitespace
-            lines = (line.strip() for line in text.splitlines())
-            text = ' '.join(chunk for chunk in lines if chunk)
+            from multi_format_processing.streaming_extraction import extract_html_text
+            with stage(EXTRACT, items=1) as record:
+                # The body is parsed as it downloads; boilerplate is dropped on the fly
+                with self.session.get(url, timeout=10, stream=True) as response:
+                    charset_declared = 'charset' in response.headers.get('content-type', '')
+                    chunks = response.iter_content(64 * 1024)
+                    text = extract_html_text(chunks, response.encoding if charset_declared else None)
+                    record.bytes = response.raw.tell()
             return text
         except Exception as e:
             logger.error(f"Error processing URL: {e}")
             return ""
 
+    def process_file(self, file_content, file_type):
+        """Extract text from uploaded file content by its MIME subtype"""
+        with stage(EXTRACT, bytes=len(file_content), items=1):
+            if file_type in ['png', 'jpg', 'jpeg']:
+                return self.process_image(file_content)
+            elif file_type == 'pdf':
+                return self.process_pdf(file_content)
+            elif file_type in ['docx', 'vnd.openxmlformats-officedocument.wordprocessingml.document']:
+                return self.process_docx(file_content)
+            return ""
+
     def process_docx(self, file_content):
         """Extract text from DOCX file"""
         try:
-            doc = docx.Document(BytesIO(file_content))
-            text = "\n".join([paragraph.text for paragraph in doc.paragraphs])
-            return text
+            from multi_format_processing.streaming_extraction import extract_docx_text
+            # Streams word/document.xml, including tables, headers and footers
+            return extract_docx_text(file_content)
         except Exception as e:
             logger.error(f"Error processing DOCX: {e}")
             return ""
 
 class EntityExtractor:
-    def __init__(self):
-        self.nlp = nlp
-        self.entity_types = {
-            'PERSON': 'Person',
-            'ORG': 'Organization',
-            'GPE': 'Location',
-            'DATE': 'Date',
-            'MONEY': 'Money',
-            'PRODUCT': 'Product'
-        }
+    def __init__(self, disable=DEFAULT_DISABLED_PIPES, nlp=None, relation_processes=RELATION_PROCESSES):
+        self._nlp = nlp
+        self.entity_types = ENTITY_TYPES
+        # Documents longer than one sentence batch have their relationships matched in this many processes
+        self.relation_processes = relation_processes
+        # Pipeline components skipped on every parse
+        self.disable = list(disable)
+
+    @property
+    def nlp(self):
+        # Loaded on first use, from the process-wide cache
+        if self._nlp is None:
+            self._nlp = load_nlp()
+        return self._nlp
+
+    def parse(self, text, disable=None):
+        """Parse text once with spaCy, skipping the disabled components"""
+        with stage(NLP_PARSE, bytes=len(text.encode('utf-8'))) as record:
+            doc = self.nlp(text, disable=self.disable if disable is None else list(disable))
+            record.items = len(doc)
+        return doc
+
+    def extract(self, text, disable=None):
+        """Extract entities and relationships from a single parse of the text"""
+        doc = self.parse(text, disable)
+        return extract_from_doc(doc, self.entity_types, self.relation_processes)
 
     def extract_entities(self, text):
         """Extract entities from text using spaCy"""
-        doc = self.nlp(text)
-        entities = {}
-        
-        for ent in doc.ents:
-            if ent.label_ in self.entity_types:
-                entity_type = self.entity_types[ent.label_]
-                if entity_type not in entities:
-                    entities[entity_type] = set()
-                entities[entity_type].add(ent.text)
-
-        # Convert sets to lists for JSON serialization
-        return {k: list(v) for k, v in entities.items()}
+        return entities_from_doc(self.parse(text), self.entity_types)
 
     def extract_relationships(self, text):
         """Extract basic relationships between entities"""
-        doc = self.nlp(text)
-        relationships = []
-
-        for sent in doc.sents:
-            doc_sent = self.nlp(sent.text)
-            for token in doc_sent:
-                if token.dep_ in ('nsubj', 'nsubjpass') and token.head.pos_ == 'VERB':
-                    for obj in token.head.children:
-                        if obj.dep_ in ('dobj', 'pobj'):
-                            relationships.append({
-                                'subject': token.text,
-                                'predicate': token.head.text,
-                                'object': obj.text
-                            })
-
-        return relationships
-
-def build_knowledge_graph(entities, relationships):
+        return relationships_from_doc(self.parse(text), self.relation_processes)
+
+    def extract_batch(self, documents, batch_size=32, n_process=1, max_chunk_chars=100000):
+        """Stream (doc_id, entities, relationships) for many (doc_id, text) pairs via nlp.pipe"""
+        from entity_extraction.bulk_extraction import BulkExtractor
+        extractor = BulkExtractor(
+            nlp=self.nlp,
+            batch_size=batch_size,
+            n_process=n_process,
+            max_chunk_chars=max_chunk_chars,
+            disable=self.disable,
+            entity_types=self.entity_types,
+            relation_processes=self.relation_processes,
+        )
+        return extractor.extract(documents)
+
+def build_knowledge_graph(entities, relationships, resolve_entities=True):
     """Build knowledge graph from extracted entities and relationships"""
+    from rdflib import Graph, Namespace
+    from graph_population.bulk_loader import UriInterner, bulk_add, extraction_triples
+    if resolve_entities:
+        # Merge spelling variants so each real-world entity becomes one node
+        from graph_population.entity_resolution import resolve_extraction
+        entities, relationships = resolve_extraction(entities, relationships)
     g = Graph()
     ns = Namespace("http://example.org/")
     g.bind("ex", ns)
 
-    # Add entities
-    for entity_type, entity_list in entities.items():
-        for entity in entity_list:
-            entity_uri = URIRef(ns[re.sub(r'\s+', '_', entity)])
-            g.add((entity_uri, RDF.type, ns[entity_type]))
-
-    # Add relationships
-    for rel in relationships:
-        subj_uri = URIRef(ns[re.sub(r'\s+', '_', rel['subject'])])
-        obj_uri = URIRef(ns[re.sub(r'\s+', '_', rel['object'])])
-        pred_uri = URIRef(ns[re.sub(r'\s+', '_', rel['predicate'])])
-        g.add((subj_uri, pred_uri, obj_uri))
+    # Entity and relationship triples share one URI cache and go in via addN batches
+    with stage(GRAPH_BUILD) as record:
+        record.items = bulk_add(g, extraction_triples(entities, relationships, UriInterner(ns)))
 
     return g
 
 def visualize_graph(graph):
     """Create interactive visualization of the knowledge graph"""
+    import networkx as nx
+    import plotly.graph_objects as go
     G = nx.Graph()
     
     # Add nodes and edges
@@ -235,9 +299,170 @@ def visualize_graph(graph):
     
     return fig
 
+def run_extraction_job(context, file_content, file_type):
+    """Background job: text extraction and NLP for one upload, reporting each stage"""
+    extraction_cache = get_extraction_cache()
+    cache_key = extraction_cache.key_for(file_content)
+    cached = extraction_cache.get(cache_key)
+    if cached:
+        return cached
+
+    context.stage("extract", 0.1)
+    text = DocumentProcessor().process_file(file_content, file_type)
+    context.stage("nlp", 0.5)
+    entities, relationships = EntityExtractor().extract(text) if text else ({}, [])
+    context.stage("cache", 0.95)
+    result = {"text": text, "entities": entities, "relationships": relationships}
+    extraction_cache.put(cache_key, result)
+    return result
+
+def process_large_upload(uploaded_file, entity_extractor, extraction_cache):
+    """
+    Large-file mode: spool the upload to disk, extract text to disk and run NLP chunk by chunk.
+
+    st.file_uploader already holds the whole upload in memory, so this bounds
+    the memory of extraction and NLP, not of the upload itself.
+    """
+    from pipeline.large_files import SpooledUpload, TextSpool, extract_entities_chunked, extract_large_file
+    # Reruns of the same upload look up its cache key instead of copying and hashing the file again
+    upload_id = f"{getattr(uploaded_file, 'file_id', uploaded_file.name)}:{uploaded_file.size}"
+    upload_keys = st.session_state.setdefault("large_upload_keys", {})
+    if upload_id in upload_keys:
+        cached = extraction_cache.get(upload_keys[upload_id])
+        if cached:
+            return {**cached, "cache_hit": True}
+    file_type = uploaded_file.type.split('/')[-1]
+    suffix = os.path.splitext(uploaded_file.name)[1]
+    with SpooledUpload(uploaded_file, suffix=suffix) as upload:
+        # Separate from normal-mode entries, whose record holds the full text
+        cache_key = extraction_cache.key_for_file(upload.path) + ":large"
+        upload_keys[upload_id] = cache_key
+        cached = extraction_cache.get(cache_key)
+        if cached:
+            return {**cached, "cache_hit": True}
+        with TextSpool(preview_chars=TEXT_PREVIEW_CHARS) as spool:
+            with st.spinner(f'Extracting text from {upload.size / (1024 * 1024):.0f} MB file...'):
+                try:
+                    extract_large_file(upload.path, file_type, spool, get_ocr_engine())
+                except Exception as e:
+                    logger.error(f"Error processing large file: {e}")
+                    return {"text": "", "chars": 0, "entities": {}, "relationships": []}
+            entities, relationships = {}, []
+            if spool.chars:
+                with st.spinner(f'Extracting entities and relationships from {spool.chars:,} characters...'):
+                    try:
+                        entities, relationships = extract_entities_chunked(spool, entity_extractor)
+                    except RuntimeError as e:
+                        st.error(str(e))
+                        st.stop()
+            result = {"text": spool.preview, "chars": spool.chars, "entities": entities,
+                      "relationships": relationships}
+    extraction_cache.put(cache_key, result)
+    return result
+
+def show_jobs(job_manager):
+    """Job list with progress and cancel buttons; returns the completed job picked for viewing"""
+    st.button("Refresh job status")
+    jobs = job_manager.list_jobs()
+    for job in jobs:
+        col1, col2 = st.columns([4, 1])
+        with col1:
+            st.progress(job["progress"], text=f"{job['name']}: {job['status']} ({job['stage'] or 'queued'})")
+            if job["error"]:
+                st.caption(job["error"])
+        with col2:
+            if job["status"] not in FINISHED_STATES and st.button("Cancel", key=f"cancel_{job['id']}"):
+                job_manager.cancel(job["id"])
+    completed = {f"{job['name']} ({job['id'][:8]})": job["id"] for job in jobs if job["status"] == COMPLETED}
+    if not completed:
+        return None
+    choice = st.selectbox("Show results of", list(completed))
+    return job_manager.get(completed[choice])
+
+def show_graph_query(graph, version):
+    """Lookup, neighborhood, path and SPARQL queries over the last generated graph"""
+    from rdflib import Namespace
+    from graph_population.graph_query import default_index_cache
+    index = default_index_cache.get(graph, version)
+    ns = Namespace("http://example.org/")
+
+    def node(name):
+        return ns[name.strip().replace(' ', '_')] if name.strip() else None
+
+    st.subheader("Query Knowledge Graph")
+    query_type = st.selectbox("Query", ["Triple lookup", "Neighborhood", "Shortest path", "SPARQL"])
+    if query_type == "Triple lookup":
+        col1, col2, col3 = st.columns(3)
+        s, p, o = col1.text_input("Subject"), col2.text_input("Predicate"), col3.text_input("Object")
+        st.write([tuple(str(term) for term in triple) for triple in index.triples(node(s), node(p), node(o))[:500]])
+    elif query_type == "Neighborhood":
+        start = st.text_input("Entity")
+        hops = st.slider("Hops", 1, 4, 1)
+        if start:
+            st.write({str(n): hop for n, hop in index.neighborhood(node(start), hops).items()})
+    elif query_type == "Shortest path":
+        source, target = st.text_input("From"), st.text_input("To")
+        if source and target:
+            path = index.shortest_path(node(source), node(target))
+            st.write([str(n) for n in path] if path else "No path found")
+    else:
+        query = st.text_area("SPARQL", "SELECT ?s ?p ?o WHERE { ?s ?p ?o } LIMIT 25")
+        if st.button("Run query"):
+            try:
+                st.write(index.sparql(query))
+            except Exception as e:
+                st.error(f"Query failed: {e}")
+
+def show_graph_analytics(graph, version):
+    """Top entities and community summaries, computed once per graph version"""
+    from graph_population.graph_query import default_index_cache
+    analytics = default_index_cache.get(graph, version).analytics()
+    if not len(analytics):
+        return
+    st.subheader("Graph Analytics")
+    summary = analytics.summary()
+    cols = st.columns(4)
+    cols[0].metric("Entities", summary["nodes"])
+    cols[1].metric("Links", summary["links"])
+    cols[2].metric("Components", summary["components"])
+    cols[3].metric("Communities", summary["communities"])
+    col1, col2 = st.columns(2)
+    with col1:
+        ranking = st.selectbox("Rank entities by", ["pagerank", "degree"])
+        st.dataframe(analytics.top_entities(20, by=ranking), hide_index=True)
+    with col2:
+        st.caption(f"Modularity {summary['modularity']:.2f}; largest component {summary['largest_component']} entities")
+        st.dataframe([
+            {**community, "types": ", ".join(community["types"]), "top_members": ", ".join(community["top_members"])}
+            for community in analytics.communities(limit=50)
+        ], hide_index=True)
+
+def show_metrics(profiler):
+    """Sidebar view of the per-stage totals of this process, plus the profile of this run"""
+    with st.sidebar.expander("Pipeline metrics"):
+        snapshot = default_registry.snapshot()
+        if snapshot:
+            st.table([
+                {"stage": name, **{field: round(value, 3) for field, value in totals.items()}}
+                for name, totals in sorted(snapshot.items())
+            ])
+        st.download_button("Metrics (JSON)", default_registry.to_json(), "metrics.json", "application/json")
+        st.download_button("Metrics (Prometheus)", default_registry.to_prometheus(), "metrics.prom", "text/plain")
+    if profiler.enabled:
+        with st.expander("Profile of this run"):
+            st.text(profiler.report())
+
 def main():
+    profile_run = st.sidebar.checkbox("Profile this run (cProfile + tracemalloc)", value=False)
+    with RunProfiler(enabled=profile_run) as profiler:
+        render_pipeline()
+    show_metrics(profiler)
+
+def render_pipeline():
     st.title("Automated Knowledge Graph Builder")
     
+    extraction_cache = get_extraction_cache()
+    
     # Initialize processors
     doc_processor = DocumentProcessor()
     entity_extractor = EntityExtractor()
@@ -245,10 +470,14 @@ def main():
     # Input method selection
     input_method = st.radio(
         "Choose input method",
-        ["File Upload", "URL Input"]
+        ["File Upload", "URL Input", "Background Jobs"]
     )
     
     extracted_text = ""
+    doc_id = None
+    cache_key = None
+    cached = None
+    large_result = None
     
     if input_method == "File Upload":
         uploaded_file = st.file_uploader(
@@ -256,33 +485,86 @@ def main():
             type=['pdf', 'png', 'jpg', 'jpeg', 'docx']
         )
         
-        if uploaded_file:
+        large_file_mode = st.checkbox(
+            "Large file mode (spool to disk, chunked NLP, text preview only)", value=False,
+            help=f"Used automatically for files over {LARGE_FILE_BYTES // (1024 * 1024)} MB"
+        )
+        
+        if uploaded_file and (large_file_mode or uploaded_file.size > LARGE_FILE_BYTES):
+            doc_id = uploaded_file.name
+            large_result = process_large_upload(uploaded_file, entity_extractor, extraction_cache)
+            cached = large_result if large_result.get("cache_hit") else None
+            extracted_text = large_result["text"]
+        elif uploaded_file:
             file_content = uploaded_file.read()
+            doc_id = uploaded_file.name
             file_type = uploaded_file.type.split('/')[-1]
+            cache_key = extraction_cache.key_for(file_content)
+            cached = extraction_cache.get(cache_key)
             
-            with st.spinner('Processing file...'):
-                if file_type in ['png', 'jpg', 'jpeg']:
-                    extracted_text = doc_processor.process_image(file_content)
-                elif file_type == 'pdf':
-                    extracted_text = doc_processor.process_pdf(file_content)
-                elif file_type == 'docx':
-                    extracted_text = doc_processor.process_docx(file_content)
+            if cached:
+                extracted_text = cached["text"]
+            else:
+                with st.spinner('Processing file...'):
+                    extracted_text = doc_processor.process_file(file_content, file_type)
                 
+    elif input_method == "Background Jobs":
+        job_manager = get_job_manager()
+        uploaded_files = st.file_uploader(
+            "Choose files",
+            type=['pdf', 'png', 'jpg', 'jpeg', 'docx'],
+            accept_multiple_files=True
+        )
+        if uploaded_files and st.button("Submit jobs"):
+            for uploaded in uploaded_files:
+                job_manager.submit(
+                    uploaded.name, run_extraction_job, uploaded.getvalue(), uploaded.type.split('/')[-1]
+                )
+        job = show_jobs(job_manager)
+        if job and job["result"]:
+            doc_id = job["name"]
+            cached = job["result"]
+            extracted_text = cached["text"]
+    
     else:
         url = st.text_input("Enter URL:")
         if url and st.button("Process URL"):
+            doc_id = url
             with st.spinner('Processing URL...'):
                 extracted_text = doc_processor.process_url(url)
     
     if extracted_text:
         st.subheader("Extracted Text")
+        total_chars = large_result["chars"] if large_result else len(extracted_text)
         with st.expander("Show extracted text"):
-            st.text(extracted_text)
+            # Only a preview is rendered; the full text can be far larger than the page
+            st.text(extracted_text[:TEXT_PREVIEW_CHARS])
+        if total_chars > TEXT_PREVIEW_CHARS:
+            st.caption(f"Showing the first {TEXT_PREVIEW_CHARS:,} of {total_chars:,} characters")
         
         # Extract entities and relationships
-        with st.spinner('Extracting entities and relationships...'):
-            entities = entity_extractor.extract_entities(extracted_text)
-            relationships = entity_extractor.extract_relationships(extracted_text)
+        if cached or large_result:
+            result = cached or large_result
+            entities, relationships = result["entities"], result["relationships"]
+        else:
+            with st.spinner('Extracting entities and relationships...'):
+                try:
+                    entities, relationships = entity_extractor.extract(extracted_text)
+                except RuntimeError as e:
+                    st.error(str(e))
+                    st.stop()
+            if cache_key:
+                extraction_cache.put(cache_key, {
+                    "text": extracted_text,
+                    "entities": entities,
+                    "relationships": relationships
+                })
+        
+        cache_stats = extraction_cache.stats()
+        st.caption(
+            f"Extraction cache: {'hit' if cached else 'miss'} "
+            f"(hit rate {cache_stats['hit_rate']:.0%}, {cache_stats['entries']} documents)"
+        )
         
         # Display extracted information
         col1, col2 = st.columns(2)
@@ -294,21 +576,66 @@ def main():
             st.write(relationships)
         
         # Build and visualize knowledge graph
+        persist_graph = st.checkbox("Add to persistent knowledge graph", value=False)
+        large_graph_mode = st.checkbox("Large graph mode (sampled WebGL view)", value=False)
+        if large_graph_mode:
+            max_nodes = st.slider("Maximum nodes shown", 100, 10000, 2000, step=100)
+            sampling = st.selectbox("Sampling", ["degree", "kcore"])
+            focus = st.text_input("Expand around nodes (comma separated)")
         if st.button("Generate Knowledge Graph"):
             with st.spinner('Generating knowledge graph...'):
                 graph = build_knowledge_graph(entities, relationships)
+                # Kept for the query panel, which survives reruns
+                st.session_state["graph"] = graph
+                from graph_population.graph_query import graph_version
+                st.session_state["graph_version"] = graph_version(graph)
+                # Analytics run once here; reruns read them from the index of this graph version
+                from graph_population.graph_query import default_index_cache
+                default_index_cache.get(graph, st.session_state["graph_version"]).analytics()
+                if persist_graph and doc_id:
+                    # Replaces this document's previous triples; other documents are untouched
+                    graph_store = get_graph_store()
+                    graph_store.add_document(doc_id, graph)
+                    st.caption(f"Persistent graph: {len(graph_store.documents())} documents")
+                
+                from graph_population.columnar_store import ColumnarTripleStore
+                stats = ColumnarTripleStore.from_graph(graph)
+                with st.expander("Graph statistics"):
+                    col1, col2 = st.columns(2)
+                    col1.write("Entities per type")
+                    col1.table([(str(t).split('/')[-1], n) for t, n in stats.type_counts(top=20)])
+                    col2.write("Triples per predicate")
+                    col2.table([(str(p).split('/')[-1], n) for p, n in stats.predicate_histogram(top=20)])
                 
                 st.subheader("Knowledge Graph Visualization")
-                fig = visualize_graph(graph)
+                if large_graph_mode:
+                    from visualization.large_graph import visualize_large_graph
+                    focus_nodes = [node.strip().replace(' ', '_') for node in focus.split(',') if node.strip()]
+                    fig, shown, total = visualize_large_graph(
+                        graph, max_nodes=max_nodes, method=sampling, focus=focus_nodes
+                    )
+                    st.caption(f"Showing {shown} of {total} nodes")
+                else:
+                    with stage(VISUALIZE, items=len(graph)):
+                        fig = visualize_graph(graph)
                 st.plotly_chart(fig, use_container_width=True)
                 
-                # Download options
-                st.download_button(
-                    label="Download Graph (TTL)",
-                    data=graph.serialize(format="turtle"),
-                    file_name="knowledge_graph.ttl",
-                    mime="text/turtle"
-                )
+                # Download options: N-Triples streamed to a temporary file (timed as SERIALIZE by the writer)
+                # instead of one Turtle string; the download button then reads the file once
+                from graph_population.bulk_loader import write_ntriples
+                with tempfile.TemporaryFile(mode="w+", encoding="utf-8") as nt_file:
+                    write_ntriples(graph, nt_file)
+                    nt_file.seek(0)
+                    st.download_button(
+                        label="Download Graph (N-Triples)",
+                        data=nt_file,
+                        file_name="knowledge_graph.nt",
+                        mime="application/n-triples"
+                    )
+    
+    if "graph" in st.session_state:
+        show_graph_analytics(st.session_state["graph"], st.session_state["graph_version"])
+        show_graph_query(st.session_state["graph"], st.session_state["graph_version"])
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,64 @@
+"""
+Measures the Streamlit app's time to first render against eager imports.
+
+Each measurement runs in a fresh interpreter, so module import costs are cold.
+The baseline imports every format handler and loads the spaCy model up front,
+like app.py used to at module level; the app is then run headless with
+streamlit.testing.AppTest for its first render and a rerun.
+
+Usage:
+    python -m benchmarks.bench_app_startup [--model en_core_web_sm]
+"""
+import argparse
+import json
+import subprocess
+import sys
+
+EAGER_BASELINE = """
+import json, time
+start = time.perf_counter()
+import streamlit, spacy, plotly.graph_objects, networkx, pandas, PyPDF2, pytesseract, bs4, docx, rdflib
+imported = time.perf_counter()
+try:
+    spacy.load({model!r})
+    loaded = time.perf_counter()
+except OSError:
+    loaded = None
+print(json.dumps({{"imports": imported - start, "model": loaded and loaded - imported,
+                  "total": (loaded or imported) - start}}))
+"""
+
+APP_RUN = """
+import json, time
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+app = AppTest.from_file("app.py", default_timeout=120)
+app.run()
+first = time.perf_counter()
+app.run()
+rerun = time.perf_counter()
+print(json.dumps({"first_render": first - start, "rerun": rerun - first}))
+"""
+
+
+def run_snippet(code):
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--model", default="en_core_web_sm")
+    args = parser.parse_args()
+
+    baseline = run_snippet(EAGER_BASELINE.format(model=args.model))
+    app = run_snippet(APP_RUN)
+    model = f"{baseline['model']:.2f}s" if baseline["model"] is not None else "not installed"
+    print(f"eager imports:          {baseline['imports']:6.2f}s  (+ model load {model})")
+    print(f"eager total:            {baseline['total']:6.2f}s")
+    print(f"lazy app first render:  {app['first_render']:6.2f}s")
+    print(f"lazy app rerun:         {app['rerun']:6.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""
+Measures page-level PDF extraction throughput, serial versus the process pool.
+
+Usage:
+    python -m benchmarks.bench_pdf_pages [path/to/file.pdf] [--workers N] [--pages-per-task N]
+"""
+import argparse
+import os
+import time
+
+from multi_format_processing.pdf_extraction import iter_pdf_pages
+
+
+def run(path, max_workers, pages_per_task):
+    """Returns (pages, seconds to first page, total seconds) for one extraction."""
+    start = time.perf_counter()
+    first_page = None
+    pages = 0
+    for _ in iter_pdf_pages(path, max_workers=max_workers, pages_per_task=pages_per_task):
+        if first_page is None:
+            first_page = time.perf_counter() - start
+        pages += 1
+    return pages, first_page or 0.0, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("pdf", nargs="?", default="temp.pdf")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--pages-per-task", type=int, default=4)
+    args = parser.parse_args()
+
+    for label, workers in (("serial", 1), (f"{args.workers} workers", args.workers)):
+        pages, first_page, total = run(args.pdf, workers, args.pages_per_task)
+        print(f"{label:>12}: {pages} pages in {total:6.2f}s  "
+              f"{pages / total:7.1f} pages/s  first page after {first_page:5.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Measures relationship extraction throughput, serial versus sentence batches in worker processes.
+
+The document is parsed by hand (no trained model needed), so only the
+pattern matching and the batch shipping are timed.
+
+Usage:
+    python -m benchmarks.bench_relation_extraction [--sentences N] [--workers N] [--sentences-per-batch N]
+"""
+import argparse
+import os
+import time
+
+import spacy
+from spacy.tokens import Doc
+
+from entity_extraction.relation_extraction import DEFAULT_SENTENCES_PER_BATCH, RelationExtractor
+
+
+def parsed_doc(sentences):
+    """Builds 'The CompanyN bought the StartupN in CityN .' sentences with their parse and entities."""
+    words, heads, deps, pos, ents, sent_starts = [], [], [], [], [], []
+    for i in range(sentences):
+        offset = len(words)
+        words += ["The", f"Company{i}", "bought", "the", f"Startup{i}", "in", f"City{i % 50}", "."]
+        heads += [offset + 1, offset + 2, offset + 2, offset + 4, offset + 2, offset + 2, offset + 5, offset + 2]
+        deps += ["det", "nsubj", "ROOT", "det", "dobj", "prep", "pobj", "punct"]
+        pos += ["DET", "PROPN", "VERB", "DET", "PROPN", "ADP", "PROPN", "PUNCT"]
+        ents += ["O", "B-ORG", "O", "O", "B-ORG", "O", "B-GPE", "O"]
+        sent_starts += [True] + [False] * 7
+    return Doc(spacy.blank("en").vocab, words=words, heads=heads, deps=deps, pos=pos, ents=ents,
+               sent_starts=sent_starts)
+
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sentences", type=int, default=20000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--sentences-per-batch", type=int, default=DEFAULT_SENTENCES_PER_BATCH)
+    args = parser.parse_args()
+
+    doc = parsed_doc(args.sentences)
+    extractor = RelationExtractor(doc.vocab)
+    serial, serial_time = timed(extractor.extract, doc)
+    parallel, parallel_time = timed(extractor.extract_parallel, doc, n_process=args.workers,
+                                    sentences_per_batch=args.sentences_per_batch)
+    assert parallel == serial, "parallel extraction changed the result"
+
+    print(f"{args.sentences} sentences, {len(serial)} relationships, {os.cpu_count()} CPUs")
+    print(f"serial:       {serial_time:8.2f}s  {args.sentences / serial_time:10.0f} sentences/s")
+    print(f"{args.workers} workers:  {parallel_time:8.2f}s  {args.sentences / parallel_time:10.0f} sentences/s")
+    print(f"speedup:      {serial_time / parallel_time:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Compares the old entity/relationship extraction, which parsed the text twice and then every
+sentence again, with the single-pass API.
+
+Usage:
+    python -m benchmarks.bench_single_pass [path/to/file.pdf] [--max-chars N]
+"""
+import argparse
+import time
+
+import spacy
+from PyPDF2 import PdfReader
+
+from entity_extraction.spacy_extraction import (
+    DEFAULT_DISABLED_PIPES,
+    entities_from_doc,
+    extract_from_doc,
+)
+
+
+def legacy_extract(nlp, text):
+    """The previous behaviour: one parse for entities, one for the document and one per sentence."""
+    entities = entities_from_doc(nlp(text))
+    relationships = []
+    for sent in nlp(text).sents:
+        for token in nlp(sent.text):
+            if token.dep_ in ('nsubj', 'nsubjpass') and token.head.pos_ == 'VERB':
+                for obj in token.head.children:
+                    if obj.dep_ in ('dobj', 'pobj'):
+                        relationships.append({
+                            'subject': token.text,
+                            'predicate': token.head.text,
+                            'object': obj.text
+                        })
+    return entities, relationships
+
+
+def load_pdf_text(path, max_chars):
+    reader = PdfReader(path)
+    text = "\n".join(page.extract_text() or "" for page in reader.pages)
+    return text[:max_chars]
+
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("pdf", nargs="?", default="temp.pdf")
+    parser.add_argument("--max-chars", type=int, default=500000,
+                        help="Truncate the text to stay under spaCy's max_length.")
+    parser.add_argument("--model", default="en_core_web_sm")
+    args = parser.parse_args()
+
+    nlp = spacy.load(args.model)
+    text = load_pdf_text(args.pdf, args.max_chars)
+    print(f"{args.pdf}: {len(text)} characters")
+
+    (_, legacy_rels), legacy_time = timed(legacy_extract, nlp, text)
+    (_, single_rels), single_time = timed(
+        lambda: extract_from_doc(nlp(text, disable=list(DEFAULT_DISABLED_PIPES)))
+    )
+
+    print(f"legacy (3 parses):  {legacy_time:8.2f}s  {len(legacy_rels)} relationships")
+    print(f"single pass:        {single_time:8.2f}s  {len(single_rels)} relationships")
+    print(f"speedup:            {legacy_time / single_time:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Measures batch URL ingestion throughput against a local HTTP stand-in server.
+
+Usage:
+    python -m benchmarks.bench_url_ingestion [--urls N] [--concurrency N] [--per-host N] [--page-kb N]
+"""
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from multi_format_processing.url_ingestion import ValidatorStore, ingest_urls
+
+
+def make_handler(page):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.headers.get("If-None-Match") == '"bench"':
+                self.send_response(304)
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("ETag", '"bench"')
+            self.send_header("Content-Length", str(len(page)))
+            self.end_headers()
+            self.wfile.write(page)
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--urls", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--per-host", type=int, default=16)
+    parser.add_argument("--page-kb", type=int, default=50)
+    args = parser.parse_args()
+
+    paragraph = b"<p>The Nifty 50 index tracks fifty large Indian companies.</p><script>var x = 1;</script>"
+    page = b"<html><body>" + paragraph * (args.page_kb * 1024 // len(paragraph)) + b"</body></html>"
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(page))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    urls = [f"{base}/doc/{i}" for i in range(args.urls)]
+
+    validators = ValidatorStore()
+    try:
+        for label in ("cold", "conditional"):
+            _, report = ingest_urls(urls, concurrency=args.concurrency, per_host=args.per_host,
+                                    validators=validators)
+            stats = report.as_dict()
+            print(f"{label:>12}: {stats['fetched']} fetched, {stats['not_modified']} not modified, "
+                  f"{stats['failed']} failed in {stats['elapsed']:.2f}s "
+                  f"({stats['pages_per_second']:.1f} pages/s)")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
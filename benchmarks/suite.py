@@ -0,0 +1,301 @@
+"""
+Benchmark suite: real pipeline stages over the bundled PDFs and synthetic scaled corpora.
+
+Stages: PDF text extraction, infer_schema, graph_population's build_knowledge_graph
+(serial) and build_sharded_store (over every CPU), app.EntityExtractor, app.build_knowledge_graph
+and app.visualize_graph. Each stage is timed once (best of --repeat) and run once
+more under tracemalloc for its peak memory (of this process only). Results go to a JSON file. When a baseline exists, a stage whose
+throughput dropped or whose peak memory grew beyond the thresholds in
+benchmarks/thresholds.json fails the run (exit code 1).
+
+Usage:
+    python -m benchmarks.suite [--scales 1,10,100] [--repeat N] [--results FILE]
+                               [--baseline FILE] [--update-baseline] [--no-dataset]
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+from pipeline.logging_config import configure_logging
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATASET_DIR = os.path.join(ROOT, "schema_inference", "dataset_example")
+TEMP_PDF = os.path.join(ROOT, "temp.pdf")
+HERE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_THRESHOLDS = os.path.join(HERE, "thresholds.json")
+DEFAULT_BASELINE = os.path.join(HERE, "baseline.json")
+DEFAULT_RESULTS = os.path.join(HERE, "results", "latest.json")
+# Words per synthetic document; scale N means N documents
+WORDS_PER_DOCUMENT = 5000
+
+FIRST_NAMES = ["Asha", "Ravi", "Maria", "John", "Wei", "Fatima", "Luca", "Priya", "Kenji", "Olga",
+               "Samuel", "Nadia", "Arjun", "Elena", "Tom", "Aisha"]
+LAST_NAMES = ["Sharma", "Mehta", "Garcia", "Smith", "Chen", "Khan", "Rossi", "Iyer", "Sato", "Petrova",
+              "Okafor", "Haddad", "Rao", "Novak", "Brown", "Ali"]
+ORG_WORDS = ["Reserve", "National", "Global", "United", "Capital", "Pacific", "Northern", "Digital"]
+ORG_SUFFIXES = ["Bank", "Exchange", "Holdings", "Industries", "Securities", "Motors", "Labs", "Insurance"]
+PLACES = ["Mumbai", "Delhi", "London", "Paris", "Tokyo", "Singapore", "New York", "Frankfurt", "Chennai",
+          "Sydney", "Toronto", "Dubai"]
+TEMPLATES = [
+    "{person} joined {org} in {place} in {year}.",
+    "{org} acquired {org2} for {amount} million dollars.",
+    "{person} met {person2} at the {org} office in {place}.",
+    "The index rose after {org} reported record earnings in {year}.",
+    "{person} leads the {place} division of {org}.",
+]
+
+
+def synthetic_corpus(scale, seed=7):
+    """
+    Builds a deterministic synthetic corpus and its ground-truth extraction.
+
+    The entity pool grows with the scale so larger corpora also produce larger
+    graphs, not only longer texts.
+
+    Args:
+        scale (int): Number of documents of WORDS_PER_DOCUMENT words.
+        seed (int): Random seed.
+
+    Returns:
+        dict: documents (list of (doc_id, text)), entities (type -> names) and
+            relationships (subject/predicate/object dicts).
+    """
+    rng = random.Random(seed)
+    people = [f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {i}" for i in range(40 * scale)]
+    orgs = [f"{rng.choice(ORG_WORDS)} {rng.choice(ORG_SUFFIXES)} {i}" for i in range(15 * scale)]
+    documents = []
+    relationships = []
+    for doc_index in range(scale):
+        sentences = []
+        words = 0
+        while words < WORDS_PER_DOCUMENT:
+            values = {
+                "person": rng.choice(people), "person2": rng.choice(people),
+                "org": rng.choice(orgs), "org2": rng.choice(orgs),
+                "place": rng.choice(PLACES), "year": rng.randint(1995, 2024), "amount": rng.randint(5, 900),
+            }
+            template = rng.choice(TEMPLATES)
+            sentence = template.format(**values)
+            sentences.append(sentence)
+            words += len(sentence.split())
+            if "{person} joined" in template:
+                relationships.append({"subject": values["person"], "predicate": "joined", "object": values["org"]})
+            elif "acquired" in template:
+                relationships.append({"subject": values["org"], "predicate": "acquired", "object": values["org2"]})
+        documents.append((f"synthetic-{scale}x-{doc_index}", " ".join(sentences)))
+    entities = {"Person": people, "Organization": orgs, "Location": list(PLACES)}
+    return {"documents": documents, "entities": entities, "relationships": relationships}
+
+
+def measure(func, repeat=1):
+    """
+    Runs func for timing (best of repeat) and once more under tracemalloc.
+
+    Returns:
+        tuple: (func's result, best seconds, peak traced MB)
+    """
+    best = None
+    result = None
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return result, best, peak / 1e6
+
+
+def record(results, key, seconds, peak_mb, items, unit, nbytes=None):
+    entry = {
+        "seconds": seconds,
+        "items": items,
+        "unit": unit,
+        "throughput": items / seconds if seconds else 0.0,
+        "peak_mb": peak_mb,
+    }
+    if nbytes is not None:
+        entry["mb_per_second"] = nbytes / 1e6 / seconds if seconds else 0.0
+    results[key] = entry
+    print(f"{key:<40} {seconds:8.3f}s  {entry['throughput']:12.1f} {unit}/s  peak {peak_mb:8.1f} MB")
+
+
+def load_spacy(model):
+    import spacy
+    try:
+        return spacy.load(model)
+    except OSError:
+        return None
+
+
+def run_suite(scales, repeat=1, include_dataset=True, max_scale=None, spacy_model="en_core_web_sm"):
+    """
+    Runs every stage over the dataset corpus and each synthetic scale.
+
+    Args:
+        scales (list): Synthetic corpus scales, e.g. [1, 10, 100].
+        repeat (int): Timed runs per stage (best is kept).
+        include_dataset (bool): Also benchmark the bundled PDFs and temp.pdf.
+        max_scale (dict): Stage -> largest scale to run it at.
+        spacy_model (str): Model for the EntityExtractor stage; skipped if not installed.
+
+    Returns:
+        dict: Stage key ('stage@corpus') -> measurements.
+    """
+    import app
+    from graph_population.knowledge_graph_builder import build_knowledge_graph as build_schema_graph
+    from graph_population.knowledge_graph_builder import build_sharded_store
+    from multi_format_processing.extract_text import extract_text_from_pdf
+    from schema_inference.schema_inference_logic import infer_schema
+
+    max_scale = max_scale or {}
+    results = {}
+    corpora = []
+
+    if include_dataset:
+        pdfs = sorted(os.path.join(DATASET_DIR, name) for name in os.listdir(DATASET_DIR) if name.endswith(".pdf"))
+        pdfs.append(TEMP_PDF)
+        texts, seconds, peak = measure(
+            lambda: [(os.path.basename(path), extract_text_from_pdf(path, ocr=False) or "") for path in pdfs], repeat
+        )
+        record(results, "extract_pdf@dataset", seconds, peak, len(pdfs), "docs",
+               sum(os.path.getsize(path) for path in pdfs))
+        corpora.append(("dataset", texts, None))
+
+    for scale in scales:
+        corpus = synthetic_corpus(scale)
+        corpora.append((f"synthetic_{scale}x", corpus["documents"], corpus))
+
+    nlp = load_spacy(spacy_model)
+    if nlp is None:
+        print(f"spaCy model '{spacy_model}' is not installed; skipping EntityExtractor stages")
+
+    for name, documents, corpus in corpora:
+        scale = int(name.split("_")[1][:-1]) if corpus else 0
+        words = sum(len(text.split()) for _, text in documents)
+        nbytes = sum(len(text.encode("utf-8")) for _, text in documents)
+
+        schemas, seconds, peak = measure(lambda: {doc: infer_schema(text) for doc, text in documents if text}, repeat)
+        record(results, f"infer_schema@{name}", seconds, peak, words, "words", nbytes)
+
+        graph, seconds, peak = measure(lambda: build_schema_graph(schemas), repeat)
+        record(results, f"build_schema_graph@{name}", seconds, peak, len(graph), "triples")
+
+        store, seconds, peak = measure(lambda: build_sharded_store(schemas), repeat)
+        record(results, f"build_sharded_store@{name}", seconds, peak, len(store), "triples")
+
+        if nlp is not None and scale <= max_scale.get("entity_extractor", scale):
+            extractor = app.EntityExtractor(nlp=nlp)
+            extracted, seconds, peak = measure(
+                lambda: [extractor.extract(text[:nlp.max_length]) for _, text in documents if text], repeat
+            )
+            record(results, f"entity_extractor@{name}", seconds, peak, words, "words", nbytes)
+
+        if corpus is None:
+            continue
+        entities, relationships = corpus["entities"], corpus["relationships"]
+        graph, seconds, peak = measure(lambda: app.build_knowledge_graph(entities, relationships), repeat)
+        record(results, f"build_knowledge_graph@{name}", seconds, peak, len(graph), "triples")
+
+        if scale <= max_scale.get("visualize_graph", scale):
+            _, seconds, peak = measure(lambda: app.visualize_graph(graph), repeat)
+            record(results, f"visualize_graph@{name}", seconds, peak, len(graph), "triples")
+    return results
+
+
+def find_regressions(results, baseline, thresholds):
+    """
+    Compares results with a baseline.
+
+    Args:
+        results (dict): Stage key -> measurements of this run.
+        baseline (dict): Stage key -> measurements of the baseline run.
+        thresholds (dict): 'throughput_drop' and 'memory_growth' fractions, with
+            optional per-stage overrides under 'stages' (keyed by stage name).
+
+    Returns:
+        list: Human-readable descriptions of each regression.
+    """
+    regressions = []
+    for key, current in sorted(results.items()):
+        previous = baseline.get(key)
+        if not previous:
+            continue
+        limits = dict(thresholds)
+        limits.update(thresholds.get("stages", {}).get(key.split("@")[0], {}))
+        if previous["throughput"] and current["throughput"] < previous["throughput"] * (1 - limits["throughput_drop"]):
+            regressions.append(f"{key}: throughput {current['throughput']:.1f} {current['unit']}/s "
+                               f"vs baseline {previous['throughput']:.1f}")
+        if previous["peak_mb"] and current["peak_mb"] > previous["peak_mb"] * (1 + limits["memory_growth"]):
+            regressions.append(f"{key}: peak memory {current['peak_mb']:.1f} MB "
+                               f"vs baseline {previous['peak_mb']:.1f} MB")
+    return regressions
+
+
+def write_json(path, data):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", default=None, help="Comma-separated synthetic scales (default from thresholds)")
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--results", default=DEFAULT_RESULTS)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--thresholds", default=DEFAULT_THRESHOLDS)
+    parser.add_argument("--update-baseline", action="store_true", help="Store this run as the new baseline")
+    parser.add_argument("--no-dataset", action="store_true", help="Skip the bundled PDF corpus")
+    parser.add_argument("--model", default=os.environ.get("KG_CONSTRUCTION_SPACY_MODEL", "en_core_web_sm"))
+    args = parser.parse_args(argv)
+    configure_logging(level="WARNING")
+
+    with open(args.thresholds, encoding="utf-8") as f:
+        thresholds = json.load(f)
+    scales = [int(s) for s in args.scales.split(",")] if args.scales else thresholds["scales"]
+
+    results = run_suite(scales, args.repeat, not args.no_dataset, thresholds.get("max_scale"), args.model)
+    run = {
+        "environment": {
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+    write_json(args.results, run)
+    print(f"Results written to {args.results}")
+
+    if args.update_baseline:
+        write_json(args.baseline, run)
+        print(f"Baseline updated: {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        print("No baseline found; run with --update-baseline to create one")
+        return 0
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)["results"]
+    regressions = find_regressions(results, baseline, thresholds)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,132 @@
+import logging
+import re
+
+import spacy
+
+from .spacy_extraction import DEFAULT_DISABLED_PIPES, ENTITY_TYPES, extract_from_doc
+
+logger = logging.getLogger(__name__)
+
+# Sentence ends, or blank lines for text (e.g. PDF tables) without punctuation
+SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?])\s+|\n\s*\n')
+
+
+def chunk_text(text, max_chars=100000):
+    """
+    Splits text into chunks of at most max_chars, cutting at sentence boundaries.
+
+    A single sentence longer than max_chars is cut at the last whitespace that fits,
+    or hard-cut if it has none.
+
+    Args:
+        text (str): Text to split.
+        max_chars (int): Maximum chunk length in characters.
+
+    Yields:
+        str: Consecutive chunks of the text.
+    """
+    if max_chars <= 0:
+        raise ValueError("max_chars must be positive.")
+
+    start = 0
+    cut = 0
+    for match in SENTENCE_BOUNDARY.finditer(text):
+        if match.end() - start > max_chars and cut > start:
+            yield text[start:cut]
+            start = cut
+        while match.end() - start > max_chars:
+            end = _hard_cut(text, start, max_chars)
+            yield text[start:end]
+            start = end
+        cut = match.end()
+
+    while len(text) - start > max_chars:
+        end = cut if cut > start else _hard_cut(text, start, max_chars)
+        yield text[start:end]
+        start = end
+    if start < len(text):
+        yield text[start:]
+
+
+def _hard_cut(text, start, max_chars):
+    end = text.rfind(" ", start + 1, start + max_chars)
+    return end if end > start else start + max_chars
+
+
+def merge_entities(target, entities):
+    """
+    Merges an entities dict into a dict of sets, in place.
+
+    Args:
+        target (dict): Entity type -> set of entity texts.
+        entities (dict): Entity type -> list of entity texts.
+
+    Returns:
+        dict: The updated target.
+    """
+    for entity_type, entity_list in entities.items():
+        target.setdefault(entity_type, set()).update(entity_list)
+    return target
+
+
+class BulkExtractor:
+    """
+    Extracts entities and relationships from many documents with nlp.pipe.
+
+    Documents are split into sentence-aligned chunks so no single parse holds more
+    than max_chunk_chars characters, then streamed through spaCy in batches,
+    optionally across several worker processes. Relationships of each parsed
+    chunk are matched in relation_processes worker processes.
+    """
+
+    def __init__(self, nlp=None, model="en_core_web_sm", batch_size=32, n_process=1,
+                 max_chunk_chars=100000, disable=DEFAULT_DISABLED_PIPES, entity_types=ENTITY_TYPES,
+                 relation_processes=1):
+        self.nlp = nlp if nlp is not None else spacy.load(model)
+        self.batch_size = batch_size
+        self.n_process = n_process
+        self.max_chunk_chars = max_chunk_chars
+        self.disable = list(disable)
+        self.entity_types = entity_types
+        self.relation_processes = relation_processes
+
+    def _chunks(self, documents):
+        for doc_id, text in documents:
+            chunks = chunk_text(text or "", self.max_chunk_chars)
+            chunk = next(chunks, "")
+            for next_chunk in chunks:
+                yield chunk, (doc_id, False)
+                chunk = next_chunk
+            yield chunk, (doc_id, True)
+
+    def extract(self, documents):
+        """
+        Streams extraction results for (doc_id, text) pairs.
+
+        nlp.pipe keeps input order, so every document's chunks arrive together and a
+        document is yielded as soon as its last chunk is parsed. Only that one
+        document's partial results are held in memory.
+
+        Args:
+            documents (iterable): (doc_id, text) pairs; may be a lazy generator.
+
+        Yields:
+            tuple: (doc_id, entities dict, relationships list)
+        """
+        entities = {}
+        relationships = []
+        docs = self.nlp.pipe(
+            self._chunks(documents),
+            as_tuples=True,
+            batch_size=self.batch_size,
+            n_process=self.n_process,
+            disable=self.disable,
+        )
+        for doc, (doc_id, is_last) in docs:
+            chunk_entities, chunk_relationships = extract_from_doc(doc, self.entity_types, self.relation_processes)
+            merge_entities(entities, chunk_entities)
+            relationships.extend(chunk_relationships)
+            if is_last:
+                yield doc_id, {k: list(v) for k, v in entities.items()}, relationships
+                entities = {}
+                relationships = []
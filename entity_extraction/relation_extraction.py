@@ -0,0 +1,215 @@
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+from spacy.attrs import DEP, ENT_IOB, ENT_TYPE, HEAD, LEMMA, MORPH, POS, TAG
+from spacy.matcher import DependencyMatcher
+from spacy.tokens import Doc, DocBin
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SENTENCES_PER_BATCH = 256
+# Token annotations shipped to relation extraction workers
+BATCH_ATTRS = [TAG, POS, MORPH, LEMMA, DEP, HEAD, ENT_IOB, ENT_TYPE]
+
+# Subject and object dependency labels, following spaCy's English (ClearNLP) scheme
+SUBJECT_DEPS = ["nsubj", "nsubjpass"]
+OBJECT_DEPS = ["dobj", "obj"]
+
+PATTERNS = {
+    # "Apple bought Beats"
+    "svo": [
+        {"RIGHT_ID": "verb", "RIGHT_ATTRS": {"POS": "VERB"}},
+        {"LEFT_ID": "verb", "REL_OP": ">", "RIGHT_ID": "subject", "RIGHT_ATTRS": {"DEP": {"IN": SUBJECT_DEPS}}},
+        {"LEFT_ID": "verb", "REL_OP": ">", "RIGHT_ID": "object", "RIGHT_ATTRS": {"DEP": {"IN": OBJECT_DEPS}}},
+    ],
+    # "Infosys is headquartered in Bangalore", "HDFC Bank merged with HDFC"
+    "verb_prep": [
+        {"RIGHT_ID": "verb", "RIGHT_ATTRS": {"POS": "VERB"}},
+        {"LEFT_ID": "verb", "REL_OP": ">", "RIGHT_ID": "subject", "RIGHT_ATTRS": {"DEP": {"IN": SUBJECT_DEPS}}},
+        {"LEFT_ID": "verb", "REL_OP": ">", "RIGHT_ID": "prep", "RIGHT_ATTRS": {"DEP": "prep"}},
+        {"LEFT_ID": "prep", "REL_OP": ">", "RIGHT_ID": "object", "RIGHT_ATTRS": {"DEP": "pobj"}},
+    ],
+    # "Beats was bought by Apple": the agent is the real subject
+    "passive_agent": [
+        {"RIGHT_ID": "verb", "RIGHT_ATTRS": {"POS": "VERB"}},
+        {"LEFT_ID": "verb", "REL_OP": ">", "RIGHT_ID": "object", "RIGHT_ATTRS": {"DEP": "nsubjpass"}},
+        {"LEFT_ID": "verb", "REL_OP": ">", "RIGHT_ID": "agent", "RIGHT_ATTRS": {"DEP": "agent"}},
+        {"LEFT_ID": "agent", "REL_OP": ">", "RIGHT_ID": "subject", "RIGHT_ATTRS": {"DEP": "pobj"}},
+    ],
+}
+
+
+class RelationExtractor:
+    """
+    Rule-based subject-predicate-object extraction with spaCy's DependencyMatcher.
+
+    Patterns run over an already parsed Doc, so nothing is parsed twice. Each
+    argument is widened from its head token to the named entity or noun chunk
+    that contains it (without leading determiners), so "the Reserve Bank of
+    India" yields "Reserve Bank", not "Bank". Pronoun arguments are dropped.
+    """
+
+    def __init__(self, vocab, patterns=PATTERNS):
+        self.matcher = DependencyMatcher(vocab)
+        self._token_ids = {}
+        for name, pattern in patterns.items():
+            self.matcher.add(name, [pattern])
+            self._token_ids[vocab.strings[name]] = [node["RIGHT_ID"] for node in pattern]
+
+    @staticmethod
+    def _argument_spans(doc):
+        """Maps token index -> widest entity or noun chunk span containing it."""
+        spans = {}
+        try:
+            chunks = list(doc.noun_chunks)
+        except (NotImplementedError, ValueError):
+            # Languages without a noun chunk iterator fall back to entities and compounds
+            chunks = []
+        for span in chunks + list(doc.ents):
+            start = span.start
+            while start < span.end - 1 and doc[start].pos_ in ("DET", "PRON") and doc[start].dep_ in ("det", "poss"):
+                start += 1
+            trimmed = doc[start:span.end]
+            for token in trimmed:
+                spans[token.i] = trimmed
+        return spans
+
+    @staticmethod
+    def _compound_span(token):
+        start = token.i
+        for child in reversed(list(token.lefts)):
+            if child.dep_ in ("compound", "amod", "nummod") and child.i == start - 1:
+                start = child.i
+            else:
+                break
+        return token.doc[start:token.i + 1]
+
+    def _argument(self, token, spans):
+        if token.pos_ == "PRON":
+            return None
+        span = spans.get(token.i) or self._compound_span(token)
+        return span.text
+
+    @staticmethod
+    def _predicate(verb, prep=None, use_lemma=False):
+        base = verb.lemma_ if use_lemma and verb.lemma_ else verb.text
+        return f"{base} {prep.text}" if prep is not None else base
+
+    def extract(self, doc):
+        """
+        Extracts relationships from a parsed Doc (or a sentence span's as_doc()).
+
+        Args:
+            doc (spacy.tokens.Doc): Document with dependency annotations.
+
+        Returns:
+            list: Dicts with 'subject', 'predicate' and 'object' keys, in text order.
+        """
+        if not doc.has_annotation("DEP"):
+            logger.debug("Document has no dependency parse; no relationships extracted.")
+            return []
+        spans = self._argument_spans(doc)
+        # has_annotation scans the whole Doc, so it is checked once, not per match
+        use_lemma = doc.has_annotation("LEMMA")
+        seen = set()
+        relationships = []
+        for match_id, token_indices in sorted(self.matcher(doc), key=lambda match: match[1]):
+            tokens = dict(zip(self._token_ids[match_id], (doc[i] for i in token_indices)))
+            subject = self._argument(tokens["subject"], spans)
+            obj = self._argument(tokens["object"], spans)
+            if not subject or not obj or subject == obj:
+                continue
+            relationship = (subject, self._predicate(tokens["verb"], tokens.get("prep"), use_lemma), obj)
+            if relationship not in seen:
+                seen.add(relationship)
+                relationships.append(dict(zip(("subject", "predicate", "object"), relationship)))
+        return relationships
+
+    def extract_parallel(self, doc, n_process=None, sentences_per_batch=DEFAULT_SENTENCES_PER_BATCH):
+        """
+        Extracts relationships from batches of sentences in worker processes.
+
+        The Doc is parsed once by the caller; its annotations are exported with
+        one to_array call and sliced into batches of whole sentences, which are
+        shipped to the workers as DocBin bytes (tokens, tags, dependencies and
+        entities). Workers need no model, only a blank vocabulary of the same
+        language. Worth it for very long documents on several cores; documents
+        of a single batch are handled in-process.
+
+        Args:
+            doc (spacy.tokens.Doc): Parsed document.
+            n_process (int): Worker processes; defaults to the CPU count.
+            sentences_per_batch (int): Sentences per worker task.
+
+        Returns:
+            list: Relationships in text order, as returned by extract.
+        """
+        n_process = n_process or os.cpu_count() or 1
+        if not doc.has_annotation("DEP"):
+            return []
+        sentences = list(doc.sents)
+        if n_process <= 1 or len(sentences) <= sentences_per_batch:
+            return self.extract(doc)
+
+        batches = [_batch_bytes(part) for part in _sentence_batches(doc, sentences, sentences_per_batch)]
+
+        relationships = []
+        seen = set()
+        with ProcessPoolExecutor(max_workers=n_process) as executor:
+            for batch in executor.map(_extract_batch, [doc.lang_] * len(batches), batches):
+                for relationship in batch:
+                    key = (relationship["subject"], relationship["predicate"], relationship["object"])
+                    if key not in seen:
+                        seen.add(key)
+                        relationships.append(relationship)
+        return relationships
+
+
+def _sentence_batches(doc, sentences, sentences_per_batch):
+    """
+    Splits a parsed Doc into standalone Docs of consecutive whole sentences.
+
+    Span.as_doc exports the annotations of the whole Doc on every call, so the
+    Doc is exported once here and each batch is rebuilt from its rows.
+    """
+    array = doc.to_array(BATCH_ATTRS)
+    words = [token.text for token in doc]
+    spaces = [bool(token.whitespace_) for token in doc]
+    iob = BATCH_ATTRS.index(ENT_IOB)
+    starts = [sent.start for sent in sentences[::sentences_per_batch]] + [len(doc)]
+    for start, end in zip(starts, starts[1:]):
+        rows = array[start:end].copy()
+        # An entity continued from the previous batch starts this one ("I" -> "B")
+        if rows[0, iob] == 1:
+            rows[0, iob] = 3
+        part = Doc(doc.vocab, words=words[start:end], spaces=spaces[start:end])
+        yield part.from_array(BATCH_ATTRS, rows)
+
+
+def _batch_bytes(doc):
+    doc_bin = DocBin()
+    doc_bin.add(doc)
+    return doc_bin.to_bytes()
+
+
+@lru_cache(maxsize=8)
+def get_relation_extractor(vocab):
+    """Returns a RelationExtractor for a vocabulary, built once per vocabulary."""
+    return RelationExtractor(vocab)
+
+
+@lru_cache(maxsize=4)
+def _worker_vocab(lang):
+    import spacy
+    return spacy.blank(lang).vocab if lang else spacy.vocab.Vocab()
+
+
+def _extract_batch(lang, data):
+    vocab = _worker_vocab(lang)
+    extractor = get_relation_extractor(vocab)
+    relationships = []
+    for sent_doc in DocBin().from_bytes(data).get_docs(vocab):
+        relationships.extend(extractor.extract(sent_doc))
+    return relationships
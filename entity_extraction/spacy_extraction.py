@@ -0,0 +1,82 @@
+import logging
+
+from pipeline.metrics import RELATIONSHIPS, stage
+
+logger = logging.getLogger(__name__)
+
+# spaCy NER labels kept in the graph, mapped to the graph's entity types
+ENTITY_TYPES = {
+    'PERSON': 'Person',
+    'ORG': 'Organization',
+    'GPE': 'Location',
+    'DATE': 'Date',
+    'MONEY': 'Money',
+    'PRODUCT': 'Product'
+}
+
+# Components the entity/relationship extraction never reads from
+DEFAULT_DISABLED_PIPES = ("lemmatizer", "textcat", "textcat_multilabel")
+
+
+def entities_from_doc(doc, entity_types=ENTITY_TYPES):
+    """
+    Collects typed entities from an already parsed spaCy Doc.
+
+    Args:
+        doc (spacy.tokens.Doc): Parsed document.
+        entity_types (dict): Mapping of spaCy labels to graph entity types.
+
+    Returns:
+        dict: Entity type -> list of unique entity texts.
+    """
+    entities = {}
+    for ent in doc.ents:
+        if ent.label_ in entity_types:
+            entities.setdefault(entity_types[ent.label_], set()).add(ent.text)
+
+    # Convert sets to lists for JSON serialization
+    return {k: list(v) for k, v in entities.items()}
+
+
+def relationships_from_doc(doc, n_process=1):
+    """
+    Collects subject-predicate-object relationships from an already parsed spaCy Doc.
+
+    Dependency patterns (subject-verb-object, verb-preposition-object and
+    passive agents) are matched over the same Doc, so no sentence is parsed
+    again, and each argument is expanded to its entity or noun chunk.
+
+    Args:
+        doc (spacy.tokens.Doc): Parsed document with dependency annotations.
+        n_process (int): Worker processes for matching batches of sentences of
+            long documents; 1 matches in this process.
+
+    Returns:
+        list: Dicts with 'subject', 'predicate' and 'object' keys.
+    """
+    if not doc.has_annotation("DEP"):
+        logger.debug("Document has no dependency parse; no relationships extracted.")
+        return []
+
+    # Imported here so importing this module does not load spaCy
+    from entity_extraction.relation_extraction import get_relation_extractor
+    with stage(RELATIONSHIPS) as record:
+        relationships = get_relation_extractor(doc.vocab).extract_parallel(doc, n_process=n_process)
+        record.items = len(relationships)
+
+    return relationships
+
+
+def extract_from_doc(doc, entity_types=ENTITY_TYPES, n_process=1):
+    """
+    Extracts entities and relationships from one parsed Doc.
+
+    Args:
+        doc (spacy.tokens.Doc): Parsed document.
+        entity_types (dict): Mapping of spaCy labels to graph entity types.
+        n_process (int): Worker processes for relationship matching (see relationships_from_doc).
+
+    Returns:
+        tuple: (entities dict, relationships list)
+    """
+    return entities_from_doc(doc, entity_types), relationships_from_doc(doc, n_process)
@@ -0,0 +1,196 @@
+import logging
+import re
+from itertools import islice
+
+from rdflib import BNode, Literal, Namespace, RDF, URIRef
+
+from pipeline.metrics import SERIALIZE, stage
+
+logger = logging.getLogger(__name__)
+
+EX = Namespace("http://example.org/")
+SLUG_PATTERN = re.compile(r'\s+')
+ESCAPE_SEQUENCE = re.compile(r'\\(?:u([0-9A-Fa-f]{4})|U([0-9A-Fa-f]{8})|(.))', re.DOTALL)
+ESCAPED_CHARS = {'t': '\t', 'b': '\b', 'n': '\n', 'r': '\r', 'f': '\f', '"': '"', "'": "'", '\\': '\\'}
+DEFAULT_BATCH_SIZE = 10000
+
+
+class UriInterner:
+    """
+    Maps entity text to namespace URIs, building each URIRef only once.
+
+    Repeated mentions of the same entity reuse the cached URIRef, so slugging
+    and URIRef construction happen once per distinct text instead of per triple.
+    """
+
+    def __init__(self, namespace=EX):
+        self.namespace = namespace
+        self._uris = {}
+
+    def __call__(self, text):
+        uri = self._uris.get(text)
+        if uri is None:
+            uri = self._uris[text] = URIRef(self.namespace[SLUG_PATTERN.sub('_', text)])
+        return uri
+
+    def __len__(self):
+        return len(self._uris)
+
+
+def extraction_triples(entities, relationships, interner=None):
+    """
+    Yields the triples for extracted entities and relationships.
+
+    Args:
+        entities (dict): Entity type -> list of entity texts.
+        relationships (list): Dicts with 'subject', 'predicate' and 'object' keys.
+        interner (UriInterner): URI cache; a fresh one is used if omitted.
+
+    Yields:
+        tuple: (s, p, o) rdflib terms.
+    """
+    interner = interner or UriInterner()
+    for entity_type, entity_list in entities.items():
+        type_uri = interner(entity_type)
+        for entity in entity_list:
+            yield interner(entity), RDF.type, type_uri
+
+    for rel in relationships:
+        yield interner(rel['subject']), interner(rel['predicate']), interner(rel['object'])
+
+
+def bulk_add(graph, triples, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Adds triples to a graph in Graph.addN batches.
+
+    Args:
+        graph (rdflib.Graph): Target graph.
+        triples (iterable): (s, p, o) rdflib terms; consumed lazily.
+        batch_size (int): Triples per addN call.
+
+    Returns:
+        int: Number of triples submitted.
+    """
+    triples = iter(triples)
+    total = 0
+    while True:
+        batch = [(s, p, o, graph) for s, p, o in islice(triples, batch_size)]
+        if not batch:
+            break
+        graph.addN(batch)
+        total += len(batch)
+    logger.info(f"Bulk loaded {total} triples")
+    return total
+
+
+def _escape(value):
+    return (value.replace('\\', '\\\\').replace('"', '\\"')
+            .replace('\n', '\\n').replace('\r', '\\r'))
+
+
+def nt_term(term):
+    """
+    Formats an rdflib term in N-Triples syntax.
+
+    Args:
+        term (rdflib.term.Node): URIRef, BNode or Literal.
+
+    Returns:
+        str: The N-Triples representation.
+    """
+    if isinstance(term, Literal):
+        text = f'"{_escape(str(term))}"'
+        if term.language:
+            return f"{text}@{term.language}"
+        if term.datatype:
+            return f"{text}^^<{term.datatype}>"
+        return text
+    if isinstance(term, BNode):
+        return f"_:{term}"
+    return f"<{term}>"
+
+
+def _unescape_match(match):
+    code = match.group(1) or match.group(2)
+    if code:
+        return chr(int(code, 16))
+    return ESCAPED_CHARS.get(match.group(3), match.group(0))
+
+
+def term_from_n3(text):
+    """
+    Parses a term written by rdflib's Node.n3() or by nt_term.
+
+    Replaces rdflib.util.from_n3, whose unicode-escape decoding fails on
+    literals containing a backslash followed by 'x' (e.g. Windows paths).
+
+    Args:
+        text (str): <uri>, _:id or a quoted literal with an optional @lang or ^^<datatype>.
+
+    Returns:
+        rdflib.term.Node: The URIRef, BNode or Literal.
+    """
+    if text.startswith('<'):
+        return URIRef(text[1:-1])
+    if text.startswith('_:'):
+        return BNode(text[2:])
+    end = text.rfind('"')
+    # Multi-line literals are written between triple quotes
+    quote = 3 if text.startswith('"""') and end >= 5 else 1
+    value = ESCAPE_SEQUENCE.sub(_unescape_match, text[quote:end - quote + 1])
+    suffix = text[end + 1:]
+    if suffix.startswith('@'):
+        return Literal(value, lang=suffix[1:])
+    if suffix.startswith('^^<'):
+        return Literal(value, datatype=URIRef(suffix[3:-1]))
+    return Literal(value)
+
+
+def write_ntriples(triples, fh, chunk_size=DEFAULT_BATCH_SIZE, context=None):
+    """
+    Streams triples to a text file handle as N-Triples, or N-Quads with a context.
+
+    Lines are written chunk by chunk, so the serialized graph is never held in
+    memory as a whole.
+
+    Args:
+        triples (iterable): (s, p, o) rdflib terms, e.g. an rdflib.Graph.
+        fh (file): Text file handle to write to.
+        chunk_size (int): Lines formatted per write call.
+        context (rdflib.term.Node): Graph name written as the fourth term (N-Quads).
+
+    Returns:
+        int: Number of statements written.
+    """
+    suffix = f" {nt_term(context)} .\n" if context is not None else " .\n"
+    triples = iter(triples)
+    total = 0
+    with stage(SERIALIZE) as record:
+        while True:
+            lines = [f"{nt_term(s)} {nt_term(p)} {nt_term(o)}{suffix}" for s, p, o in islice(triples, chunk_size)]
+            if not lines:
+                break
+            chunk = "".join(lines)
+            fh.write(chunk)
+            total += len(lines)
+            record.bytes += len(chunk)
+        record.items = total
+    return total
+
+
+def write_nquads(dataset, fh, chunk_size=DEFAULT_BATCH_SIZE):
+    """
+    Streams every named graph of an rdflib Dataset to a file handle as N-Quads.
+
+    Args:
+        dataset (rdflib.Dataset): Dataset whose graphs are written.
+        fh (file): Text file handle to write to.
+        chunk_size (int): Lines formatted per write call.
+
+    Returns:
+        int: Number of statements written.
+    """
+    total = 0
+    for graph in dataset.graphs():
+        total += write_ntriples(graph, fh, chunk_size, context=graph.identifier)
+    return total
@@ -0,0 +1,243 @@
+import logging
+
+import numpy as np
+from rdflib import Graph, RDF
+
+from .bulk_loader import bulk_add, term_from_n3
+
+logger = logging.getLogger(__name__)
+
+
+class ColumnarTripleStore:
+    """
+    Compact, dictionary-encoded triple table for in-process analytics.
+
+    Every distinct term is stored once as N3 text in a single UTF-8 buffer with
+    an offsets array (the Arrow string layout), and triples are three int32 id
+    arrays. This avoids one Python object per term and per triple, which is
+    what makes rdflib.Graph and networkx copies of large graphs so heavy.
+    Aggregations run as NumPy bincounts over the id arrays.
+    """
+
+    def __init__(self, term_data, term_offsets, s, p, o):
+        self.term_data = term_data
+        self.term_offsets = term_offsets
+        self.s = s
+        self.p = p
+        self.o = o
+        self._term_ids = None
+
+    @classmethod
+    def from_triples(cls, triples):
+        """
+        Encodes rdflib triples.
+
+        Args:
+            triples (iterable): (s, p, o) rdflib terms, e.g. an rdflib Graph.
+
+        Returns:
+            ColumnarTripleStore: The encoded store.
+        """
+        term_ids = {}
+        encoded_terms = []
+        ids = []
+        for triple in triples:
+            for term in triple:
+                term_id = term_ids.get(term)
+                if term_id is None:
+                    term_id = term_ids[term] = len(encoded_terms)
+                    encoded_terms.append(term.n3().encode("utf-8"))
+                ids.append(term_id)
+        ids = np.array(ids, dtype=np.int32).reshape(-1, 3)
+        offsets = np.zeros(len(encoded_terms) + 1, dtype=np.int64)
+        np.cumsum([len(term) for term in encoded_terms], out=offsets[1:])
+        data = np.frombuffer(b"".join(encoded_terms), dtype=np.uint8)
+        store = cls(data, offsets, ids[:, 0].copy(), ids[:, 1].copy(), ids[:, 2].copy())
+        logger.info(f"Encoded {len(store)} triples over {store.num_terms} terms")
+        return store
+
+    from_graph = from_triples
+
+    @classmethod
+    def merge(cls, stores):
+        """
+        Merges stores into one, re-encoding their terms and dropping duplicate triples.
+
+        Each store's dictionary is mapped onto a shared one once per distinct
+        term; the triples themselves are only remapped and deduplicated as
+        integer arrays, keeping the first occurrence of each.
+
+        Args:
+            stores (iterable): ColumnarTripleStore instances, e.g. built by shard workers.
+
+        Returns:
+            ColumnarTripleStore: The merged, duplicate-free store.
+        """
+        term_ids = {}
+        encoded_terms = []
+        columns = ([], [], [])
+        for store in stores:
+            data = store.term_data.tobytes()
+            offsets = store.term_offsets.tolist()
+            remap = np.empty(store.num_terms, dtype=np.int32)
+            for i in range(store.num_terms):
+                term = data[offsets[i]:offsets[i + 1]]
+                term_id = term_ids.get(term)
+                if term_id is None:
+                    term_id = term_ids[term] = len(encoded_terms)
+                    encoded_terms.append(term)
+                remap[i] = term_id
+            for column, ids in zip(columns, (store.s, store.p, store.o)):
+                column.append(remap[ids])
+        s, p, o = (np.concatenate(column) if column else np.empty(0, dtype=np.int32) for column in columns)
+
+        order = np.lexsort((o, p, s))
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = ((s[order[1:]] != s[order[:-1]]) | (p[order[1:]] != p[order[:-1]])
+                     | (o[order[1:]] != o[order[:-1]]))
+        keep = np.sort(order[first])
+
+        offsets = np.zeros(len(encoded_terms) + 1, dtype=np.int64)
+        np.cumsum([len(term) for term in encoded_terms], out=offsets[1:])
+        data = np.frombuffer(b"".join(encoded_terms), dtype=np.uint8)
+        merged = cls(data, offsets, s[keep], p[keep], o[keep])
+        logger.info(f"Merged {len(s)} triples into {len(merged)} distinct triples over {merged.num_terms} terms")
+        return merged
+
+    def __len__(self):
+        return len(self.s)
+
+    @property
+    def num_terms(self):
+        return len(self.term_offsets) - 1
+
+    @property
+    def nbytes(self):
+        """Bytes held by the arrays of this store."""
+        return sum(array.nbytes for array in (self.term_data, self.term_offsets, self.s, self.p, self.o))
+
+    def term_n3(self, term_id):
+        start, stop = self.term_offsets[term_id], self.term_offsets[term_id + 1]
+        return self.term_data[start:stop].tobytes().decode("utf-8")
+
+    def term(self, term_id):
+        """Decodes a term id back to an rdflib term."""
+        return term_from_n3(self.term_n3(term_id))
+
+    def term_id(self, term):
+        """
+        Returns the id of an rdflib term, or None if it is not in the store.
+
+        The reverse dictionary is built on first use only.
+        """
+        if self._term_ids is None:
+            self._term_ids = {self.term_n3(i): i for i in range(self.num_terms)}
+        return self._term_ids.get(term.n3())
+
+    def triples(self):
+        """Yields the stored triples as rdflib terms, decoding each distinct term once."""
+        terms = [self.term(i) for i in range(self.num_terms)]
+        for s, p, o in zip(self.s.tolist(), self.p.tolist(), self.o.tolist()):
+            yield terms[s], terms[p], terms[o]
+
+    def to_graph(self):
+        """Decodes the store into a new rdflib Graph."""
+        graph = Graph()
+        bulk_add(graph, self.triples())
+        return graph
+
+    def _counts(self, ids, top=None):
+        counts = np.bincount(ids, minlength=self.num_terms)
+        present = np.flatnonzero(counts)
+        ranked = present[np.argsort(-counts[present], kind="stable")]
+        if top is not None:
+            ranked = ranked[:top]
+        return [(self.term(i), int(counts[i])) for i in ranked.tolist()]
+
+    def degree_counts(self, top=None, include_literals=False):
+        """
+        Counts the triples each term takes part in as subject or object.
+
+        Args:
+            top (int): Only return the highest-degree terms.
+            include_literals (bool): Also count literal objects.
+
+        Returns:
+            list: (term, degree) pairs, highest degree first.
+        """
+        objects = self.o
+        if not include_literals:
+            is_literal = self.term_data[self.term_offsets[:-1]] == ord('"')
+            objects = objects[~is_literal[objects]]
+        return self._counts(np.concatenate([self.s, objects]), top)
+
+    def predicate_histogram(self, top=None):
+        """Returns (predicate, triple count) pairs, most frequent first."""
+        return self._counts(self.p, top)
+
+    def type_counts(self, top=None):
+        """Returns (class, entity count) pairs from rdf:type triples, largest first."""
+        type_id = self.term_id(RDF.type)
+        if type_id is None:
+            return []
+        return self._counts(self.o[self.p == type_id], top)
+
+    def to_arrow(self):
+        """
+        Converts the store to a pyarrow Table.
+
+        Columns s, p and o are dictionary arrays that share one dictionary of
+        N3 term strings, so the ids are written as-is.
+
+        Returns:
+            pyarrow.Table: Table with dictionary-encoded s, p and o columns.
+        """
+        import pyarrow as pa
+        dictionary = pa.LargeStringArray.from_buffers(
+            self.num_terms, pa.py_buffer(self.term_offsets), pa.py_buffer(self.term_data)
+        )
+        return pa.table({
+            column: pa.DictionaryArray.from_arrays(pa.array(ids), dictionary)
+            for column, ids in (("s", self.s), ("p", self.p), ("o", self.o))
+        })
+
+    @classmethod
+    def from_arrow(cls, table):
+        """
+        Builds a store from a Table with s, p and o columns of N3 terms.
+
+        Args:
+            table (pyarrow.Table): String or dictionary-encoded s, p, o columns.
+
+        Returns:
+            ColumnarTripleStore: The store.
+        """
+        import pyarrow as pa
+        chunks = []
+        for name in ("s", "p", "o"):
+            column = table.column(name)
+            if pa.types.is_dictionary(column.type):
+                column = column.cast(column.type.value_type)
+            chunks.extend(column.cast(pa.large_string()).chunks)
+        # Re-encode the three columns against one shared dictionary
+        encoded = pa.chunked_array(chunks, pa.large_string()).combine_chunks().dictionary_encode()
+        ids = encoded.indices.to_numpy(zero_copy_only=False).astype(np.int32)
+        dictionary = encoded.dictionary
+        _, offsets_buffer, data_buffer = dictionary.buffers()
+        first = dictionary.offset
+        offsets = np.frombuffer(offsets_buffer, dtype=np.int64)[first:first + len(dictionary) + 1]
+        data = np.frombuffer(data_buffer, dtype=np.uint8)[offsets[0]:offsets[-1]].copy()
+        n = len(table)
+        return cls(data, offsets - offsets[0], ids[:n].copy(), ids[n:2 * n].copy(), ids[2 * n:].copy())
+
+    def write_parquet(self, path):
+        """Writes the store to a Parquet file with dictionary-encoded columns."""
+        import pyarrow.parquet as pq
+        pq.write_table(self.to_arrow(), path)
+        logger.info(f"Wrote {len(self)} triples to {path}")
+
+    @classmethod
+    def read_parquet(cls, path):
+        """Reads a store written by write_parquet (or any s/p/o Parquet file of N3 terms)."""
+        import pyarrow.parquet as pq
+        return cls.from_arrow(pq.read_table(path, columns=["s", "p", "o"]))
@@ -0,0 +1,243 @@
+import logging
+import re
+import unicodedata
+import zlib
+from collections import Counter, defaultdict
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Legal-form suffixes dropped so "Apple Inc." and "Apple" normalize alike
+CORPORATE_SUFFIXES = {"inc", "incorporated", "ltd", "limited", "llc", "plc", "corp", "corporation",
+                      "co", "company", "pvt", "gmbh", "ag", "sa"}
+NON_WORD = re.compile(r"[^\w\s]")
+POSSESSIVE = re.compile(r"['’]s\b")
+WHITESPACE = re.compile(r"\s+")
+NUMBER = re.compile(r"\d+")
+MERSENNE_PRIME = (1 << 61) - 1
+
+
+def normalize_entity(text):
+    """
+    Normalizes an entity mention for matching.
+
+    Applies NFKC, lowercases, drops possessives, punctuation, a leading 'the'
+    and trailing corporate suffixes, and collapses whitespace.
+
+    Args:
+        text (str): Entity mention.
+
+    Returns:
+        str: Normalized key ('' if nothing is left).
+    """
+    text = unicodedata.normalize("NFKC", text).casefold()
+    text = POSSESSIVE.sub("", text)
+    text = NON_WORD.sub(" ", text)
+    tokens = WHITESPACE.sub(" ", text).strip().split(" ")
+    if tokens and tokens[0] == "the" and len(tokens) > 1:
+        tokens = tokens[1:]
+    while len(tokens) > 1 and tokens[-1] in CORPORATE_SUFFIXES:
+        tokens.pop()
+    return " ".join(token for token in tokens if token)
+
+
+def shingles(text, n=3):
+    """Returns the set of character n-grams of a padded string."""
+    padded = f" {text} "
+    if len(padded) <= n:
+        return {padded}
+    return {padded[i:i + n] for i in range(len(padded) - n + 1)}
+
+
+class UnionFind:
+    """Disjoint sets with path compression and union by size."""
+
+    def __init__(self):
+        self.parent = {}
+        self.size = {}
+
+    def find(self, item):
+        parent = self.parent.setdefault(item, item)
+        if parent == item:
+            self.size.setdefault(item, 1)
+            return item
+        root = item
+        while self.parent[root] != root:
+            root = self.parent[root]
+        while self.parent[item] != root:
+            self.parent[item], item = root, self.parent[item]
+        return root
+
+    def union(self, a, b):
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a == root_b:
+            return root_a
+        if self.size[root_a] < self.size[root_b]:
+            root_a, root_b = root_b, root_a
+        self.parent[root_b] = root_a
+        self.size[root_a] += self.size.pop(root_b)
+        return root_a
+
+    def groups(self):
+        clusters = defaultdict(list)
+        for item in self.parent:
+            clusters[self.find(item)].append(item)
+        return list(clusters.values())
+
+
+class EntityResolver:
+    """
+    Clusters entity mentions that refer to the same thing.
+
+    Mentions with the same normalized key and entity type are merged directly.
+    Remaining keys are compared only within MinHash/LSH buckets of their
+    character 3-grams, and pairs whose shingle Jaccard similarity reaches the
+    threshold are merged with union-find, so no all-pairs comparison is made.
+    Keys whose numbers differ ("Nifty 50" and "Nifty 500") are never merged,
+    and a cluster never mixes two entity types; untyped mentions (such as
+    relationship arguments) may join a cluster of any one type.
+    """
+
+    def __init__(self, threshold=0.8, num_perm=64, bands=16, max_bucket_size=200, seed=1):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands.")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.max_bucket_size = max_bucket_size
+        rng = np.random.default_rng(seed)
+        # a, b < 2**31 and 32-bit shingle hashes keep a * x + b below 2**64
+        self._a = rng.integers(1, 1 << 31, size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, 1 << 31, size=num_perm, dtype=np.uint64)
+
+    def signature(self, shingle_set):
+        """Returns the MinHash signature of a shingle set as a uint64 array."""
+        hashes = np.fromiter((zlib.crc32(s.encode("utf-8")) for s in shingle_set),
+                             dtype=np.uint64, count=len(shingle_set))
+        return ((self._a * hashes[:, None] + self._b) % np.uint64(MERSENNE_PRIME)).min(axis=0)
+
+    def cluster_keys(self, keys):
+        """
+        Clusters normalized keys.
+
+        Args:
+            keys (iterable): Distinct (normalized key, entity type or None) pairs.
+
+        Returns:
+            UnionFind: Sets of (key, type) pairs considered the same entity.
+        """
+        union_find = UnionFind()
+        shingle_sets = {}
+        signatures = {}
+        cluster_types = {}
+        buckets = defaultdict(list)
+        rows = self.num_perm // self.bands
+        for item in keys:
+            key, entity_type = item
+            union_find.find(item)
+            cluster_types[item] = entity_type
+            # A key can occur under several types; it is shingled and hashed once
+            if key not in shingle_sets:
+                shingle_sets[key] = shingles(key)
+                signatures[key] = self.signature(shingle_sets[key])
+            signature = signatures[key]
+            for band in range(self.bands):
+                band_values = signature[band * rows:(band + 1) * rows].tobytes()
+                buckets[(band, band_values)].append(item)
+
+        compared = set()
+        for members in buckets.values():
+            if len(members) < 2:
+                continue
+            if len(members) > self.max_bucket_size:
+                logger.warning(f"Skipping LSH bucket of {len(members)} keys")
+                continue
+            for i, left in enumerate(members):
+                for right in members[i + 1:]:
+                    pair = (left, right) if (left[0], str(left[1])) < (right[0], str(right[1])) else (right, left)
+                    if pair in compared:
+                        continue
+                    compared.add(pair)
+                    if NUMBER.findall(left[0]) != NUMBER.findall(right[0]):
+                        continue
+                    a, b = shingle_sets[left[0]], shingle_sets[right[0]]
+                    if len(a & b) / len(a | b) < self.threshold:
+                        continue
+                    left_type = cluster_types[union_find.find(left)]
+                    right_type = cluster_types[union_find.find(right)]
+                    if left_type and right_type and left_type != right_type:
+                        continue
+                    cluster_types[union_find.union(left, right)] = left_type or right_type
+        return union_find
+
+    def resolve(self, mentions, types=None):
+        """
+        Maps every mention to a canonical mention of its cluster.
+
+        The canonical form is the most frequent surface form in the cluster,
+        preferring the longer one on ties.
+
+        Args:
+            mentions (iterable): Entity mention strings (repeats count as frequency).
+            types (dict): Mention -> entity type; mentions missing from it are untyped.
+
+        Returns:
+            dict: Mention -> canonical mention.
+        """
+        frequency = Counter(mentions)
+        types = types or {}
+        by_key = defaultdict(list)
+        for mention in frequency:
+            key = normalize_entity(mention)
+            if key:
+                by_key[(key, types.get(mention))].append(mention)
+
+        union_find = self.cluster_keys(by_key)
+        canonical = {}
+        for cluster in union_find.groups():
+            surface_forms = [mention for key in cluster for mention in by_key[key]]
+            best = max(surface_forms, key=lambda m: (frequency[m], len(m), m))
+            for mention in surface_forms:
+                canonical[mention] = best
+        for mention in frequency:
+            canonical.setdefault(mention, mention)
+        logger.info(f"Resolved {len(frequency)} distinct mentions into {len(union_find.groups())} entities")
+        return canonical
+
+
+def resolve_extraction(entities, relationships, resolver=None):
+    """
+    Rewrites extracted entities and relationships to canonical entity names.
+
+    Relationship subjects and objects are resolved in the same pool as the
+    typed entities, so they link to the typed entity nodes.
+
+    Args:
+        entities (dict): Entity type -> list of entity texts.
+        relationships (list): Dicts with 'subject', 'predicate' and 'object' keys.
+        resolver (EntityResolver): Resolver to use; a default one if omitted.
+
+    Returns:
+        tuple: (entities dict, relationships list) with duplicates removed.
+    """
+    mentions = [entity for entity_list in entities.values() for entity in entity_list]
+    mentions += [rel[role] for rel in relationships for role in ('subject', 'object')]
+    types = {}
+    for entity_type, entity_list in entities.items():
+        for entity in entity_list:
+            types.setdefault(entity, entity_type)
+    canonical = (resolver or EntityResolver()).resolve(mentions, types)
+
+    resolved_entities = {
+        entity_type: list(dict.fromkeys(canonical[entity] for entity in entity_list))
+        for entity_type, entity_list in entities.items()
+    }
+    resolved_relationships = list({
+        (canonical[rel['subject']], rel['predicate'], canonical[rel['object']]): None
+        for rel in relationships
+    })
+    return resolved_entities, [
+        {'subject': subject, 'predicate': predicate, 'object': obj}
+        for subject, predicate, obj in resolved_relationships
+    ]
@@ -0,0 +1,326 @@
+import logging
+from collections import Counter
+
+import numpy as np
+from rdflib import Literal, RDF
+from scipy import sparse
+from scipy.sparse.csgraph import connected_components
+
+from pipeline.metrics import ANALYTICS, stage
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DAMPING = 0.85
+DEFAULT_TOLERANCE = 1e-8
+DEFAULT_MAX_ITERATIONS = 100
+DEFAULT_PROPAGATION_ROUNDS = 30
+
+
+def local_name(term):
+    """Returns the label shown for a node: the last path segment of its URI."""
+    return str(term).split('/')[-1]
+
+
+def pagerank(adjacency, damping=DEFAULT_DAMPING, tolerance=DEFAULT_TOLERANCE, max_iterations=DEFAULT_MAX_ITERATIONS):
+    """
+    PageRank by power iteration over a sparse directed adjacency matrix.
+
+    Rank held by nodes without outgoing links is spread evenly over all nodes.
+
+    Args:
+        adjacency (scipy.sparse.csr_matrix): n x n matrix, row i -> column j for each link.
+        damping (float): Probability of following a link.
+        tolerance (float): Stop when the L1 change per node drops below this.
+        max_iterations (int): Upper bound on iterations.
+
+    Returns:
+        numpy.ndarray: Scores summing to 1.
+    """
+    n = adjacency.shape[0]
+    if n == 0:
+        return np.zeros(0)
+    out_degree = np.asarray(adjacency.sum(axis=1)).ravel()
+    dangling = out_degree == 0
+    inverse_degree = np.divide(1.0, out_degree, out=np.zeros(n), where=~dangling)
+    transposed = adjacency.T.tocsr()
+    rank = np.full(n, 1.0 / n)
+    for _ in range(max_iterations):
+        updated = damping * (transposed @ (rank * inverse_degree))
+        updated += (damping * rank[dangling].sum() + 1.0 - damping) / n
+        converged = np.abs(updated - rank).sum() < n * tolerance
+        rank = updated
+        if converged:
+            break
+    return rank / rank.sum()
+
+
+def colour_classes(adjacency, seed=0):
+    """
+    Splits the nodes into independent sets (a proper colouring), largest first.
+
+    Jones-Plassmann colouring: every round, each uncoloured node whose random
+    priority beats all of its uncoloured neighbours takes the next colour.
+    A round is a few array operations over the remaining subgraph.
+
+    Args:
+        adjacency (scipy.sparse.csr_matrix): Symmetric n x n matrix without self-loops.
+        seed (int): Seed of the priorities, so the colouring is reproducible.
+
+    Returns:
+        list: Arrays of node ids; no two nodes of one array are linked.
+    """
+    n = adjacency.shape[0]
+    priority = np.random.RandomState(seed).permutation(n)
+    remaining = np.arange(n)
+    subgraph = adjacency
+    classes = []
+    while len(remaining):
+        degree = np.diff(subgraph.indptr)
+        # Highest neighbour priority per node (-1 for isolated nodes)
+        highest = np.full(len(remaining), -1)
+        linked = degree > 0
+        neighbour_priority = priority[remaining][subgraph.indices]
+        highest[linked] = np.maximum.reduceat(neighbour_priority, subgraph.indptr[:-1][linked])
+        chosen = priority[remaining] > highest
+        classes.append(remaining[chosen])
+        remaining = remaining[~chosen]
+        subgraph = subgraph[~chosen][:, ~chosen].tocsr()
+    return sorted(classes, key=len, reverse=True)
+
+
+def _relabel(adjacency, labels, nodes):
+    # New label per node: its own when it is among the most common neighbour labels,
+    # else the smallest of the most common ones (isolated nodes keep theirs)
+    rows = adjacency[nodes]
+    voter = np.repeat(np.arange(len(nodes)), np.diff(rows.indptr))
+    updated = labels[nodes]
+    if not len(voter):
+        return updated
+    pairs, votes = np.unique(voter * len(labels) + labels[rows.indices], return_counts=True)
+    voter, label = pairs // len(labels), pairs % len(labels)
+    most = np.zeros(len(nodes), dtype=np.int64)
+    np.maximum.at(most, voter, votes)
+    top = votes == most[voter]
+    own = np.zeros(len(nodes), dtype=bool)
+    own[voter[top & (label == updated[voter])]] = True
+    # Pairs are sorted by (voter, label), so the first top pair of a voter has its smallest label
+    movers, first = np.unique(voter[top], return_index=True)
+    best = updated.copy()
+    best[movers] = label[top][first]
+    return np.where(own, updated, best)
+
+
+def label_propagation(adjacency, max_rounds=DEFAULT_PROPAGATION_ROUNDS, seed=0):
+    """
+    Community detection by semi-synchronous label propagation on sparse matrices.
+
+    Each node takes the label most common among its neighbours, keeping its
+    own label when that is one of the most common. Nodes are updated one
+    colour class at a time: no two nodes of a class are linked, so a node
+    always sees its neighbours' latest labels and the two-colour oscillation
+    of fully synchronous propagation (a linked pair, a path or a star
+    swapping labels forever) cannot happen. Each class update is a few array
+    operations, so no per-node Python loop runs.
+
+    Args:
+        adjacency (scipy.sparse.csr_matrix): Symmetric n x n 0/1 matrix without self-loops.
+        max_rounds (int): Upper bound on rounds (one update of every class).
+        seed (int): Seed of the colouring.
+
+    Returns:
+        numpy.ndarray: Community id per node, numbered 0.. by decreasing size.
+    """
+    n = adjacency.shape[0]
+    labels = np.arange(n)
+    classes = colour_classes(adjacency, seed)
+    for _ in range(max_rounds):
+        changed = False
+        for nodes in classes:
+            updated = _relabel(adjacency, labels, nodes)
+            if not np.array_equal(updated, labels[nodes]):
+                labels[nodes] = updated
+                changed = True
+        if not changed:
+            break
+    _, inverse, counts = np.unique(labels, return_inverse=True, return_counts=True)
+    # Renumber so community 0 is the largest
+    rank = np.empty(len(counts), dtype=np.int64)
+    rank[np.argsort(-counts, kind="stable")] = np.arange(len(counts))
+    return rank[inverse]
+
+
+def modularity(adjacency, communities):
+    """Newman modularity of a partition of an undirected 0/1 adjacency matrix."""
+    edges = adjacency.sum() / 2
+    if edges == 0:
+        return 0.0
+    degree = np.asarray(adjacency.sum(axis=1)).ravel()
+    coo = adjacency.tocoo()
+    internal = np.bincount(communities[coo.row[communities[coo.row] == communities[coo.col]]],
+                           minlength=communities.max() + 1) / 2
+    total_degree = np.bincount(communities, weights=degree, minlength=communities.max() + 1)
+    return float((internal / edges - (total_degree / (2 * edges)) ** 2).sum())
+
+
+class GraphAnalytics:
+    """
+    Degree, PageRank, connected components and communities of one graph snapshot.
+
+    Nodes are the resource terms that take part in a triple other than as a
+    predicate or rdf:type class; links are triples between two such nodes.
+    rdf:type is kept as a node attribute rather than a link, so class nodes
+    do not join every entity into one cluster. All measures are computed
+    once, with SciPy sparse matrices, when the object is built.
+    """
+
+    def __init__(self, terms, s, p, o, damping=DEFAULT_DAMPING):
+        with stage(ANALYTICS, items=len(s)) as record:
+            is_literal = np.fromiter((isinstance(term, Literal) for term in terms), dtype=bool, count=len(terms))
+            type_id = next((i for i, term in enumerate(terms) if term == RDF.type), -1)
+            is_type = p == type_id
+            links = ~is_type & ~is_literal[o] & (s != o)
+
+            in_graph = np.zeros(len(terms), dtype=bool)
+            in_graph[s] = True
+            in_graph[o[links]] = True
+            term_ids = np.flatnonzero(in_graph)
+            position = np.full(len(terms), -1, dtype=np.int64)
+            position[term_ids] = np.arange(len(term_ids))
+            n = len(term_ids)
+
+            self.nodes = [terms[i] for i in term_ids.tolist()]
+            self.types = {}
+            for node, class_id in zip(position[s[is_type]].tolist(), o[is_type].tolist()):
+                self.types.setdefault(node, local_name(terms[class_id]))
+
+            sources, targets = position[s[links]], position[o[links]]
+            directed = sparse.csr_matrix((np.ones(len(sources)), (sources, targets)), shape=(n, n))
+            # Several predicates between the same pair count as one link
+            directed.data[:] = 1.0
+            undirected = ((directed + directed.T) > 0).astype(np.float64).tocsr()
+
+            self.adjacency = undirected
+            self.links = int(undirected.nnz // 2)
+            self.degree = np.diff(undirected.indptr)
+            self.pagerank = pagerank(directed, damping)
+            self.component_count, self.component = (connected_components(undirected, directed=False) if n
+                                                    else (0, np.zeros(0, dtype=np.int32)))
+            self.community = label_propagation(undirected) if n else np.zeros(0, dtype=np.int64)
+            self.modularity = modularity(undirected, self.community) if n else 0.0
+            self._position = {node: i for i, node in enumerate(self.nodes)}
+            record.items = n
+        logger.info(f"Analysed {n} nodes: {self.component_count} components, "
+                    f"{self.community.max() + 1 if n else 0} communities (modularity {self.modularity:.3f})")
+
+    @classmethod
+    def from_index(cls, index, **kwargs):
+        """Analyses the graph held by a GraphIndex (reusing its term encoding)."""
+        return cls(index.terms, index.s, index.p, index.o, **kwargs)
+
+    @classmethod
+    def from_store(cls, store, **kwargs):
+        """Analyses a ColumnarTripleStore without building an rdflib Graph."""
+        terms = [store.term(i) for i in range(store.num_terms)]
+        return cls(terms, store.s.astype(np.int64), store.p.astype(np.int64), store.o.astype(np.int64), **kwargs)
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def node_attributes(self, node):
+        """
+        Returns the computed attributes of one node.
+
+        Args:
+            node (rdflib.term.Node): Node term.
+
+        Returns:
+            dict or None: label, type, degree, pagerank, component and community;
+            None if the node is not in the graph.
+        """
+        i = self._position.get(node)
+        if i is None:
+            return None
+        return {
+            "label": local_name(node),
+            "type": self.types.get(i),
+            "degree": int(self.degree[i]),
+            "pagerank": float(self.pagerank[i]),
+            "component": int(self.component[i]),
+            "community": int(self.community[i]),
+        }
+
+    def top_entities(self, n=10, by="pagerank"):
+        """
+        Returns the highest-ranked nodes with their attributes.
+
+        Args:
+            n (int): Number of nodes.
+            by (str): 'pagerank' or 'degree'.
+
+        Returns:
+            list: node_attributes dicts, highest first.
+        """
+        scores = self.pagerank if by == "pagerank" else self.degree
+        ranked = np.argsort(-scores, kind="stable")[:n]
+        return [self.node_attributes(self.nodes[i]) for i in ranked.tolist()]
+
+    def communities(self, top_members=5, limit=None):
+        """
+        Summarises each community, largest first.
+
+        Args:
+            top_members (int): Highest-PageRank members listed per community.
+            limit (int): Only summarise the largest communities.
+
+        Returns:
+            list: Dicts with community, size, links (internal), types and top members.
+        """
+        if not self.nodes:
+            return []
+        count = int(self.community.max()) + 1
+        sizes = np.bincount(self.community, minlength=count)
+        links = self.adjacency.tocoo()
+        same = self.community[links.row] == self.community[links.col]
+        internal = np.bincount(self.community[links.row[same]], minlength=count) // 2
+        order = np.lexsort((-self.pagerank, self.community))
+        starts = np.concatenate([[0], np.cumsum(sizes)])
+        summaries = []
+        for community in range(count if limit is None else min(limit, count)):
+            members = order[starts[community]:starts[community + 1]]
+            types = Counter(self.types[i] for i in members.tolist() if i in self.types)
+            summaries.append({
+                "community": community,
+                "size": int(sizes[community]),
+                "links": int(internal[community]),
+                "types": dict(types.most_common(3)),
+                "top_members": [local_name(self.nodes[i]) for i in members[:top_members].tolist()],
+            })
+        return summaries
+
+    def summary(self):
+        """Returns graph-level counts: nodes, links, components, largest component and communities."""
+        return {
+            "nodes": len(self.nodes),
+            "links": self.links,
+            "components": int(self.component_count),
+            "largest_component": int(np.bincount(self.component).max()) if self.nodes else 0,
+            "communities": int(self.community.max()) + 1 if self.nodes else 0,
+            "modularity": self.modularity,
+        }
+
+    def to_networkx(self):
+        """
+        Returns an undirected networkx Graph of the links with every attribute set on its nodes.
+
+        Returns:
+            networkx.Graph: Nodes are labels; attributes as in node_attributes.
+        """
+        import networkx as nx
+        graph = nx.Graph()
+        labels = [local_name(node) for node in self.nodes]
+        for node in self.nodes:
+            attributes = self.node_attributes(node)
+            graph.add_node(attributes["label"], **attributes)
+        upper = sparse.triu(self.adjacency, k=1).tocoo()
+        graph.add_edges_from((labels[i], labels[j]) for i, j in zip(upper.row.tolist(), upper.col.tolist()))
+        return graph
@@ -0,0 +1,285 @@
+import logging
+from collections import OrderedDict
+
+import numpy as np
+from rdflib import Literal
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_SIZE = 256
+
+
+def graph_version(graph):
+    """
+    Returns a cheap in-process version key for a graph's current contents.
+
+    Order-independent (XOR of triple hashes plus the size), so two graphs with
+    the same triples get the same version within one process.
+
+    Args:
+        graph (rdflib.Graph): Knowledge graph.
+
+    Returns:
+        tuple: (triple count, combined hash).
+    """
+    combined = 0
+    count = 0
+    for triple in graph:
+        combined ^= hash(triple)
+        count += 1
+    return count, combined
+
+
+class GraphIndex:
+    """
+    Read-only query index over a snapshot of an rdflib Graph.
+
+    Terms are dictionary-encoded to integer ids and the triples are held as
+    three id arrays with SPO, POS and OSP sort orders, so a pattern lookup is a
+    binary search. Links between resource nodes (non-literal objects) are also
+    stored as an undirected CSR adjacency (indptr/indices) for k-hop and
+    shortest-path queries. Query results are memoized in an LRU cache that
+    lives as long as the index, i.e. for one graph version.
+    """
+
+    def __init__(self, graph, cache_size=DEFAULT_CACHE_SIZE):
+        self.graph = graph
+        self.terms = []
+        self.term_ids = {}
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._analytics = None
+
+        encoded = [(self._encode(s), self._encode(p), self._encode(o)) for s, p, o in graph]
+        ids = np.array(encoded, dtype=np.int64).reshape(-1, 3)
+        self.s, self.p, self.o = ids[:, 0], ids[:, 1], ids[:, 2]
+        self._orders = {}
+        for column, keys in (("s", (self.o, self.p, self.s)), ("p", (self.s, self.o, self.p)),
+                             ("o", (self.p, self.s, self.o))):
+            order = np.lexsort(keys)
+            self._orders[column] = (keys[-1][order], order)
+        self._build_adjacency()
+        logger.info(f"Indexed {len(self.s)} triples over {len(self.terms)} terms")
+
+    def _encode(self, term):
+        term_id = self.term_ids.get(term)
+        if term_id is None:
+            term_id = self.term_ids[term] = len(self.terms)
+            self.terms.append(term)
+        return term_id
+
+    def _build_adjacency(self):
+        is_node = np.fromiter((not isinstance(term, Literal) for term in self.terms),
+                              dtype=bool, count=len(self.terms))
+        links = is_node[self.o] & (self.s != self.o)
+        sources = np.concatenate([self.s[links], self.o[links]])
+        targets = np.concatenate([self.o[links], self.s[links]])
+        order = np.lexsort((targets, sources))
+        sources, targets = sources[order], targets[order]
+        if len(sources):
+            # Drop parallel edges (several predicates between the same pair)
+            keep = np.ones(len(sources), dtype=bool)
+            keep[1:] = (sources[1:] != sources[:-1]) | (targets[1:] != targets[:-1])
+            sources, targets = sources[keep], targets[keep]
+        self.indices = targets
+        self.indptr = np.zeros(len(self.terms) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=len(self.terms)), out=self.indptr[1:])
+
+    def _cached(self, key, compute):
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            return self._cache[key]
+        result = compute()
+        self._cache[key] = result
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return result
+
+    def __len__(self):
+        return len(self.s)
+
+    def _matching_rows(self, pattern_ids):
+        bound = [(column, term_id) for column, term_id in zip("spo", pattern_ids) if term_id is not None]
+        if not bound:
+            return np.arange(len(self.s))
+        column, term_id = bound[0]
+        sorted_values, order = self._orders[column]
+        start, stop = np.searchsorted(sorted_values, [term_id, term_id + 1])
+        rows = order[start:stop]
+        for column, term_id in bound[1:]:
+            rows = rows[getattr(self, column)[rows] == term_id]
+        return rows
+
+    def triples(self, s=None, p=None, o=None):
+        """
+        Returns the triples matching a pattern.
+
+        Args:
+            s, p, o (rdflib.term.Node): Bound terms; None matches anything.
+
+        Returns:
+            list: Matching (s, p, o) triples.
+        """
+        def compute():
+            pattern_ids = []
+            for term in (s, p, o):
+                if term is None:
+                    pattern_ids.append(None)
+                elif term in self.term_ids:
+                    pattern_ids.append(self.term_ids[term])
+                else:
+                    return []
+            rows = self._matching_rows(pattern_ids)
+            terms = self.terms
+            return [(terms[a], terms[b], terms[c])
+                    for a, b, c in zip(self.s[rows].tolist(), self.p[rows].tolist(), self.o[rows].tolist())]
+        return self._cached(("triples", s, p, o), compute)
+
+    def _neighbor_ids(self, frontier):
+        # Gathers the CSR rows of all frontier nodes in one vectorized step
+        starts = self.indptr[frontier]
+        counts = self.indptr[frontier + 1] - starts
+        offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        return self.indices[np.repeat(starts, counts) + offsets]
+
+    def neighborhood(self, node, hops=1):
+        """
+        Returns the resource nodes within k hops of a node, ignoring edge direction.
+
+        Args:
+            node (rdflib.term.Node): Start node.
+            hops (int): Radius.
+
+        Returns:
+            dict: Node -> hop distance (the start node is at 0); empty if unknown.
+        """
+        def compute():
+            if node not in self.term_ids:
+                return {}
+            distance = np.full(len(self.terms), -1, dtype=np.int64)
+            frontier = np.array([self.term_ids[node]], dtype=np.int64)
+            distance[frontier] = 0
+            for hop in range(1, hops + 1):
+                candidates = self._neighbor_ids(frontier)
+                frontier = np.unique(candidates[distance[candidates] < 0])
+                if not len(frontier):
+                    break
+                distance[frontier] = hop
+            reached = np.flatnonzero(distance >= 0)
+            return {self.terms[i]: int(distance[i]) for i in reached.tolist()}
+        return self._cached(("neighborhood", node, hops), compute)
+
+    def shortest_path(self, source, target, max_hops=None):
+        """
+        Finds a shortest undirected path between two nodes with breadth-first search.
+
+        Args:
+            source (rdflib.term.Node): Start node.
+            target (rdflib.term.Node): End node.
+            max_hops (int): Give up beyond this length; unbounded if None.
+
+        Returns:
+            list or None: Nodes from source to target, or None if not connected.
+        """
+        def compute():
+            if source not in self.term_ids or target not in self.term_ids:
+                return None
+            source_id, target_id = self.term_ids[source], self.term_ids[target]
+            parent = np.full(len(self.terms), -1, dtype=np.int64)
+            parent[source_id] = source_id
+            frontier = np.array([source_id], dtype=np.int64)
+            hops = 0
+            while len(frontier) and parent[target_id] < 0:
+                if max_hops is not None and hops >= max_hops:
+                    return None
+                counts = self.indptr[frontier + 1] - self.indptr[frontier]
+                candidates = self._neighbor_ids(frontier)
+                origins = np.repeat(frontier, counts)
+                new = parent[candidates] < 0
+                candidates, origins = candidates[new], origins[new]
+                candidates, first = np.unique(candidates, return_index=True)
+                parent[candidates] = origins[first]
+                frontier = candidates
+                hops += 1
+            if parent[target_id] < 0:
+                return None
+            path = [target_id]
+            while path[-1] != source_id:
+                path.append(int(parent[path[-1]]))
+            return [self.terms[i] for i in reversed(path)]
+        return self._cached(("shortest_path", source, target, max_hops), compute)
+
+    def degree(self, node):
+        """Returns the number of distinct resource neighbours of a node."""
+        term_id = self.term_ids.get(node)
+        if term_id is None:
+            return 0
+        return int(self.indptr[term_id + 1] - self.indptr[term_id])
+
+    def analytics(self):
+        """
+        Returns degree, PageRank, component and community results for this graph version.
+
+        Computed on first use and kept with the index (outside the query LRU),
+        so every later view of the same version reads the stored results.
+
+        Returns:
+            GraphAnalytics: Per-node measures and community summaries.
+        """
+        if self._analytics is None:
+            from .graph_analytics import GraphAnalytics
+            self._analytics = GraphAnalytics.from_index(self)
+        return self._analytics
+
+    def sparql(self, query, **kwargs):
+        """
+        Runs a SPARQL query on the underlying rdflib Graph.
+
+        Args:
+            query (str): SPARQL query text.
+            **kwargs: Passed to rdflib.Graph.query (e.g. initBindings, initNs).
+
+        Returns:
+            list: Result rows (tuples), or a bool for ASK queries.
+        """
+        def compute():
+            result = self.graph.query(query, **kwargs)
+            if result.type == "ASK":
+                return result.askAnswer
+            if result.type == "CONSTRUCT" or result.type == "DESCRIBE":
+                return list(result.graph)
+            return [tuple(row) for row in result]
+        key = ("sparql", query, tuple(sorted((k, repr(v)) for k, v in kwargs.items())))
+        return self._cached(key, compute)
+
+
+class GraphIndexCache:
+    """Keeps the GraphIndex of the most recent graph versions."""
+
+    def __init__(self, max_entries=4):
+        self.max_entries = max_entries
+        self._indexes = OrderedDict()
+
+    def get(self, graph, version=None):
+        """
+        Returns the index for a graph, building it if this version is new.
+
+        Args:
+            graph (rdflib.Graph): Knowledge graph.
+            version (hashable): Version key; computed with graph_version if omitted.
+
+        Returns:
+            GraphIndex: Index of the graph.
+        """
+        key = version if version is not None else graph_version(graph)
+        if key in self._indexes:
+            self._indexes.move_to_end(key)
+            return self._indexes[key]
+        index = GraphIndex(graph)
+        self._indexes[key] = index
+        if len(self._indexes) > self.max_entries:
+            self._indexes.popitem(last=False)
+        return index
+
+
+default_index_cache = GraphIndexCache()
@@ -0,0 +1,154 @@
+import logging
+import sqlite3
+import threading
+
+from rdflib import Graph
+
+from .bulk_loader import bulk_add, term_from_n3
+
+logger = logging.getLogger(__name__)
+
+
+class GraphStore:
+    """
+    Persistent triple store that tracks which document each triple came from.
+
+    Triples are kept in a local SQLite file as N3-encoded terms together with the
+    id of the document that produced them. Adding or removing one document only
+    touches that document's rows, so the cost of an update depends on the size of
+    the document rather than on the size of the whole graph.
+    """
+
+    def __init__(self, path="knowledge_graph.db"):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS triples ("
+                "doc TEXT NOT NULL, s TEXT NOT NULL, p TEXT NOT NULL, o TEXT NOT NULL, "
+                "PRIMARY KEY (doc, s, p, o)) WITHOUT ROWID"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS triples_spo ON triples (s, p, o)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS triples_po ON triples (p, o)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS triples_o ON triples (o)")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS namespaces (prefix TEXT PRIMARY KEY, uri TEXT NOT NULL)"
+            )
+
+    def add_document(self, doc_id, triples):
+        """
+        Stores the triples of one document, replacing any it had before.
+
+        Args:
+            doc_id (str): Provenance id of the document.
+            triples (iterable): (s, p, o) rdflib terms, e.g. an rdflib.Graph.
+
+        Returns:
+            int: Number of triples stored for the document.
+        """
+        if isinstance(triples, Graph):
+            self.bind_namespaces(triples)
+        rows = ((doc_id, s.n3(), p.n3(), o.n3()) for s, p, o in triples)
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM triples WHERE doc = ?", (doc_id,))
+            self._conn.executemany("INSERT OR IGNORE INTO triples VALUES (?, ?, ?, ?)", rows)
+            count = self._conn.execute("SELECT COUNT(*) FROM triples WHERE doc = ?", (doc_id,)).fetchone()[0]
+        logger.info(f"Stored {count} triples for document {doc_id}")
+        return count
+
+    def remove_document(self, doc_id):
+        """
+        Removes every triple contributed by one document.
+
+        Triples also asserted by other documents stay in the graph.
+
+        Args:
+            doc_id (str): Provenance id of the document.
+
+        Returns:
+            int: Number of rows removed.
+        """
+        with self._lock, self._conn:
+            removed = self._conn.execute("DELETE FROM triples WHERE doc = ?", (doc_id,)).rowcount
+        logger.info(f"Removed {removed} triples of document {doc_id}")
+        return removed
+
+    def bind_namespaces(self, graph):
+        """Remembers the non-default prefixes bound in an rdflib Graph."""
+        rows = [(prefix, str(uri)) for prefix, uri in graph.namespaces()
+                if prefix and not str(uri).startswith("http://www.w3.org/")]
+        with self._lock, self._conn:
+            self._conn.executemany("INSERT OR REPLACE INTO namespaces VALUES (?, ?)", rows)
+
+    def documents(self):
+        """Returns the ids of all stored documents."""
+        with self._lock:
+            return [row[0] for row in self._conn.execute("SELECT DISTINCT doc FROM triples ORDER BY doc")]
+
+    def triples(self, pattern=(None, None, None), doc_id=None):
+        """
+        Yields distinct stored triples matching a pattern.
+
+        Args:
+            pattern (tuple): (s, p, o) rdflib terms, None matching anything.
+            doc_id (str): Restrict results to one document.
+
+        Yields:
+            tuple: (s, p, o) rdflib terms.
+        """
+        clauses = []
+        params = []
+        for column, term in zip(("s", "p", "o"), pattern):
+            if term is not None:
+                clauses.append(f"{column} = ?")
+                params.append(term.n3())
+        if doc_id is not None:
+            clauses.append("doc = ?")
+            params.append(doc_id)
+        query = "SELECT DISTINCT s, p, o FROM triples"
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        for s, p, o in rows:
+            yield term_from_n3(s), term_from_n3(p), term_from_n3(o)
+
+    def claims(self):
+        """
+        Yields every stored triple with the document that asserted it.
+
+        Used by conflict resolution to vote across documents.
+
+        Yields:
+            tuple: (s, p, o, doc_id).
+        """
+        with self._lock:
+            rows = self._conn.execute("SELECT s, p, o, doc FROM triples").fetchall()
+        for s, p, o, doc in rows:
+            yield term_from_n3(s), term_from_n3(p), term_from_n3(o), doc
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM (SELECT DISTINCT s, p, o FROM triples)").fetchone()[0]
+
+    def to_graph(self, doc_id=None):
+        """
+        Loads the stored triples into an in-memory rdflib Graph.
+
+        Args:
+            doc_id (str): Only load the triples of this document.
+
+        Returns:
+            rdflib.Graph: The (partial) knowledge graph.
+        """
+        g = Graph()
+        with self._lock:
+            namespaces = self._conn.execute("SELECT prefix, uri FROM namespaces").fetchall()
+        for prefix, uri in namespaces:
+            g.bind(prefix, uri)
+        bulk_add(g, self.triples(doc_id=doc_id))
+        return g
+
+    def close(self):
+        self._conn.close()
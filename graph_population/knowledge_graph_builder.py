@@ -1,16 +1,77 @@
 from rdflib import Graph, URIRef, Literal, Namespace
 from urllib.parse import quote
+from pipeline.metrics import GRAPH_BUILD, stage
+from .bulk_loader import bulk_add
+
+EX = Namespace("http://example.org/")
+
+def document_triples(doc, schema):
+    """
+    Yields the triples describing one document's schema.
+
+    Args:
+        doc (str): Document name or path.
+        schema (dict): Schema returned by infer_schema.
+
+    Yields:
+        tuple: (s, p, o) rdflib terms.
+    """
+    doc_uri = URIRef(EX[quote(doc.replace(" ", "_"))])  # URL encode the document name
+    yield doc_uri, EX.word_count, Literal(schema['word_count'])
+    for entity in schema['unique_entities']:
+        entity_uri = URIRef(EX[quote(entity.replace(" ", "_"))])  # URL encode the entity name
+        yield doc_uri, EX.has_entity, entity_uri
+        yield entity_uri, EX.entity_name, Literal(entity)
+
+def schema_item_triples(item):
+    """Triples of one (document, schema) pair; module-level so shard workers can run it."""
+    return document_triples(*item)
+
+def build_sharded_store(schemas, max_workers=None):
+    """
+    Builds the schema graph across worker processes as a columnar store.
+
+    Args:
+        schemas (dict): Document -> schema, as returned by process_dataset.
+        max_workers (int): Worker processes; defaults to the CPU count.
+
+    Returns:
+        ColumnarTripleStore: Duplicate-free triples of every document.
+    """
+    from .sharded_builder import build_sharded
+    return build_sharded(schemas.items(), schema_item_triples, max_workers=max_workers)
 
 def build_knowledge_graph(schemas):
+    """
+    Builds the rdflib graph of document schemas in this process.
+
+    Use build_sharded_store when the build has to scale with cores.
+
+    Args:
+        schemas (dict): Document -> schema, as returned by process_dataset.
+
+    Returns:
+        rdflib.Graph: The knowledge graph.
+    """
     g = Graph()
-    EX = Namespace("http://example.org/")
 
+    with stage(GRAPH_BUILD, items=len(schemas)):
+        for doc, schema in schemas.items():
+            bulk_add(g, document_triples(doc, schema))
+
+    return g
+
+def update_knowledge_graph(store, schemas):
+    """
+    Adds or replaces documents in a persistent GraphStore without rebuilding it.
+
+    Args:
+        store (GraphStore): Persistent store; each document is its own provenance.
+        schemas (dict): Document -> schema, as returned by process_dataset.
+
+    Returns:
+        GraphStore: The updated store.
+    """
     for doc, schema in schemas.items():
-        doc_uri = URIRef(EX[quote(doc.replace(" ", "_"))])  # URL encode the document name
-        g.add((doc_uri, EX.word_count, Literal(schema['word_count'])))
-        for entity in schema['unique_entities']:
-            entity_uri = URIRef(EX[quote(entity.replace(" ", "_"))])  # URL encode the entity name
-            g.add((doc_uri, EX.has_entity, entity_uri))
-            g.add((entity_uri, EX.entity_name, Literal(entity)))
-
-    return g
\ No newline at end of file
+        store.add_document(doc, document_triples(doc, schema))
+    return store
@@ -0,0 +1,140 @@
+"""
+Sharded, multi-process construction of the schema knowledge graph.
+
+Usage:
+    python -m graph_population.sharded_builder output/results.jsonl --output graph.parquet|graph.nt [--workers N]
+
+Reads the results written by `python -m pipeline.ingest` and builds the graph
+of every document schema across worker processes.
+"""
+import argparse
+import json
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from pipeline.logging_config import configure_logging
+from pipeline.metrics import GRAPH_BUILD, stage
+from .columnar_store import ColumnarTripleStore
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SHARDS_PER_WORKER = 4
+
+
+def shard_items(items, n_shards):
+    """
+    Splits items into at most n_shards contiguous, near-equal lists.
+
+    Args:
+        items (list): Items to split, e.g. (document, schema) pairs.
+        n_shards (int): Number of shards wanted.
+
+    Returns:
+        list: Non-empty lists of items, in order.
+    """
+    n_shards = max(1, min(n_shards, len(items)))
+    size, extra = divmod(len(items), n_shards)
+    shards = []
+    start = 0
+    for index in range(n_shards):
+        stop = start + size + (index < extra)
+        shards.append(items[start:stop])
+        start = stop
+    return [shard for shard in shards if shard]
+
+
+def encode_shard(triples_function, items):
+    """
+    Builds the partial graph of one shard as a dictionary-encoded store.
+
+    The store holds only NumPy arrays (N3 term bytes, offsets and int32 ids),
+    so returning it from a worker pickles a few flat buffers instead of
+    rdflib objects.
+
+    Args:
+        triples_function (callable): Module-level function mapping one item to (s, p, o) triples.
+        items (list): Items of this shard.
+
+    Returns:
+        ColumnarTripleStore: The shard's triples.
+    """
+    return ColumnarTripleStore.from_triples(triple for item in items for triple in triples_function(item))
+
+
+def build_sharded(items, triples_function, max_workers=None, shards_per_worker=DEFAULT_SHARDS_PER_WORKER):
+    """
+    Builds a graph from many items across worker processes.
+
+    Items are split into shards (several per worker, to even out uneven
+    documents), each worker encodes its shards' triples, and the partial
+    stores are merged with duplicate triples dropped.
+
+    Args:
+        items (iterable): Items to build from, e.g. (document, schema) pairs.
+        triples_function (callable): Module-level (picklable) function mapping an item to triples.
+        max_workers (int): Worker processes; defaults to the CPU count. 1 builds in this process.
+        shards_per_worker (int): Shards per worker process.
+
+    Returns:
+        ColumnarTripleStore: The merged, duplicate-free graph.
+    """
+    items = list(items)
+    max_workers = max_workers or os.cpu_count() or 1
+    shards = shard_items(items, max_workers * shards_per_worker)
+    with stage(GRAPH_BUILD, items=len(items)) as record:
+        if max_workers == 1 or len(shards) <= 1:
+            parts = [encode_shard(triples_function, shard) for shard in shards]
+        else:
+            with ProcessPoolExecutor(max_workers=min(max_workers, len(shards))) as executor:
+                parts = list(executor.map(encode_shard, [triples_function] * len(shards), shards))
+        store = ColumnarTripleStore.merge(parts)
+        record.bytes = store.nbytes
+    logger.info(f"Built {len(store)} triples from {len(items)} items in {len(shards)} shards")
+    return store
+
+
+def read_schemas(results_path):
+    """
+    Reads document -> schema from an ingestion results.jsonl (near-duplicates have no schema).
+
+    Undecodable lines, such as the torn last line of an interrupted ingestion
+    run, are skipped.
+    """
+    schemas = {}
+    with open(results_path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                result = json.loads(line)
+            except json.JSONDecodeError:
+                logger.warning(f"Skipping an undecodable line of {results_path}")
+                continue
+            if result.get("schema"):
+                schemas[result["path"]] = result["schema"]
+    return schemas
+
+
+def main(argv=None):
+    from .bulk_loader import write_ntriples
+    from .knowledge_graph_builder import build_sharded_store
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("results", help="results.jsonl written by pipeline.ingest")
+    parser.add_argument("--output", required=True, help="Graph file: .parquet (columnar) or .nt (N-Triples)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args(argv)
+    configure_logging()
+
+    schemas = read_schemas(args.results)
+    store = build_sharded_store(schemas, max_workers=args.workers)
+    if args.output.endswith(".parquet"):
+        store.write_parquet(args.output)
+    else:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            write_ntriples(store.triples(), fh)
+    print(f"Wrote {len(store)} triples from {len(schemas)} documents to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,7 +1,11 @@
 import logging
+import re
+from collections import defaultdict
+from decimal import Decimal
 
-# Set up logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+from rdflib import Graph, Literal, RDF
+
+logger = logging.getLogger(__name__)
 
 def resolve_conflicts(schema, conflicting_entities):
     """
@@ -15,18 +19,189 @@ def resolve_conflicts(schema, conflicting_entities):
         dict: Updated schema with conflicts resolved.
     """
     if "entities" not in schema:
-        logging.warning("Schema does not contain 'entities' key.")
+        logger.warning("Schema does not contain 'entities' key.")
         return schema
 
-    original_entities = set(schema["entities"])
-    updated_entities = [entity for entity in schema["entities"] if entity not in conflicting_entities]
-    removed_entities = original_entities - set(updated_entities)
+    # Hashed lookup keeps this linear in the number of entities
+    conflicting = set(conflicting_entities)
+    updated_entities = [entity for entity in schema["entities"] if entity not in conflicting]
+    removed_entities = conflicting.intersection(schema["entities"])
 
     schema["entities"] = updated_entities
 
     if removed_entities:
-        logging.info(f"Removed conflicting entities: {removed_entities}")
+        logger.info(f"Removed conflicting entities: {removed_entities}")
     else:
-        logging.info("No conflicting entities found.")
+        logger.info("No conflicting entities found.")
 
     return schema
+
+
+VOTE = "vote"
+CONFIDENCE = "confidence"
+KEEP_ALL = "keep_all"
+WHITESPACE = re.compile(r'\s+')
+
+
+def literal_key(term):
+    """
+    Returns the key under which equal-meaning objects are treated as duplicates.
+
+    Numeric literals compare by value, other literals by whitespace-collapsed,
+    case-folded text; URIs and blank nodes compare as themselves.
+
+    Args:
+        term (rdflib.term.Node): Object of a triple.
+
+    Returns:
+        tuple: Hashable key.
+    """
+    if isinstance(term, Literal):
+        value = term.toPython()
+        if isinstance(value, (int, float, Decimal)) and not isinstance(value, bool):
+            return ("number", float(value))
+        return ("text", WHITESPACE.sub(' ', str(term)).strip().casefold(), term.language)
+    return ("node", term)
+
+
+class ConflictResolver:
+    """
+    Resolves duplicate and contradicting claims over a whole graph in one pass.
+
+    Claims are (s, p, o, source) tuples. They are indexed in a hash map keyed by
+    (s, p) and the object's literal_key, so duplicate literals collapse as they
+    are read and each rule only looks at the values of one (s, p) at a time.
+
+    Rules map predicates to a policy:
+      - 'vote': keep the value asserted by the most sources
+      - 'confidence': keep the value with the highest summed source confidence
+      - 'keep_all': keep every distinct value (duplicates are still removed)
+    Predicates without a rule use default_policy. rdf:type is treated as
+    functional among entity_classes, which resolves an entity typed Person in
+    one document and Organization in another.
+    """
+
+    def __init__(self, rules=None, default_policy=KEEP_ALL, source_confidence=None,
+                 entity_classes=None, default_confidence=1.0):
+        self.rules = dict(rules or {})
+        self.default_policy = default_policy
+        self.source_confidence = source_confidence or {}
+        self.default_confidence = default_confidence
+        self.entity_classes = set(entity_classes or ())
+        for policy in list(self.rules.values()) + [default_policy]:
+            if policy not in (VOTE, CONFIDENCE, KEEP_ALL):
+                raise ValueError(f"Unknown conflict policy: {policy}")
+
+    def _index(self, claims):
+        index = defaultdict(dict)
+        for claim in claims:
+            s, p, o = claim[:3]
+            source = claim[3] if len(claim) > 3 else None
+            if p == RDF.type and o in self.entity_classes:
+                # All entity-class assertions of a subject compete with each other
+                key = (s, "entity_class")
+            else:
+                key = (s, p)
+            values = index[key]
+            entry = values.get(literal_key(o))
+            if entry is None:
+                entry = values[literal_key(o)] = {"triple": (s, p, o), "sources": set()}
+            entry["sources"].add(source)
+        return index
+
+    def _policy(self, key):
+        if key[1] == "entity_class":
+            return self.rules.get(RDF.type, VOTE)
+        return self.rules.get(key[1], self.default_policy)
+
+    def _score(self, entry, policy):
+        confidence = sum(self.source_confidence.get(source, self.default_confidence)
+                         for source in entry["sources"])
+        if policy == VOTE:
+            return (len(entry["sources"]), confidence, str(entry["triple"][2]))
+        return (confidence, len(entry["sources"]), str(entry["triple"][2]))
+
+    def resolve(self, claims):
+        """
+        Applies every rule to a batch of claims.
+
+        Args:
+            claims (iterable): (s, p, o) or (s, p, o, source) tuples, e.g. an
+                rdflib Graph or GraphStore.claims().
+
+        Returns:
+            tuple: (list of kept (s, p, o) triples, list of conflict reports with
+                'subject', 'predicate', 'kept' and 'dropped').
+        """
+        kept = []
+        conflicts = []
+        duplicates = 0
+        index = self._index(claims)
+        for key, values in index.items():
+            entries = list(values.values())
+            duplicates += sum(len(entry["sources"]) - 1 for entry in entries)
+            policy = self._policy(key)
+            if policy == KEEP_ALL or len(entries) == 1:
+                kept.extend(entry["triple"] for entry in entries)
+                continue
+            entries.sort(key=lambda entry: self._score(entry, policy), reverse=True)
+            kept.append(entries[0]["triple"])
+            conflicts.append({
+                "subject": key[0],
+                "predicate": entries[0]["triple"][1],
+                "kept": entries[0]["triple"][2],
+                "dropped": [entry["triple"][2] for entry in entries[1:]],
+            })
+        logger.info(f"Resolved {len(conflicts)} conflicts; {duplicates} duplicate claims merged.")
+        return kept, conflicts
+
+    def resolve_graph(self, graph):
+        """
+        Resolves an rdflib Graph into a new Graph.
+
+        Args:
+            graph (rdflib.Graph): Graph to clean.
+
+        Returns:
+            tuple: (rdflib.Graph, list of conflict reports)
+        """
+        kept, conflicts = self.resolve(graph)
+        resolved = Graph()
+        for prefix, namespace in graph.namespaces():
+            resolved.bind(prefix, namespace)
+        resolved.addN((s, p, o, resolved) for s, p, o in kept)
+        return resolved, conflicts
+
+
+def resolve_type_conflicts(doc_entities, policy=VOTE, source_confidence=None):
+    """
+    Merges entities extracted from several documents, giving each entity one type.
+
+    Args:
+        doc_entities (dict): Document id -> entities dict (type -> list of texts).
+        policy (str): 'vote' or 'confidence'.
+        source_confidence (dict): Document id -> confidence weight.
+
+    Returns:
+        tuple: (merged entities dict, list of conflict reports)
+    """
+    votes = defaultdict(lambda: defaultdict(set))
+    for doc_id, entities in doc_entities.items():
+        for entity_type, entity_list in entities.items():
+            for entity in entity_list:
+                votes[entity][entity_type].add(doc_id)
+
+    confidence = source_confidence or {}
+    merged = defaultdict(list)
+    conflicts = []
+    for entity, types in votes.items():
+        def score(entity_type):
+            sources = types[entity_type]
+            weight = sum(confidence.get(source, 1.0) for source in sources)
+            ranked = (len(sources), weight) if policy == VOTE else (weight, len(sources))
+            return ranked + (entity_type,)
+        ranked_types = sorted(types, key=score, reverse=True)
+        merged[ranked_types[0]].append(entity)
+        if len(ranked_types) > 1:
+            conflicts.append({"entity": entity, "kept": ranked_types[0], "dropped": ranked_types[1:]})
+    return dict(merged), conflicts
@@ -1,34 +1,46 @@
 import logging
-from PyPDF2 import PdfReader
-from pytesseract import image_to_string
-from PIL import Image
-from bs4 import BeautifulSoup
+import os
 import requests
+from pipeline.metrics import EXTRACT, stage
+from .ocr_engine import OcrEngine, fill_scanned_pages
+from .pdf_extraction import iter_pdf_pages
+from .streaming_extraction import extract_docx_text, extract_html_text
 
-# Set up logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
 
-def extract_text_from_pdf(pdf_file):
+IMAGE_EXTENSIONS = {".png", ".jpg", ".jpeg", ".tif", ".tiff", ".bmp", ".gif"}
+HTML_EXTENSIONS = {".html", ".htm"}
+SUPPORTED_EXTENSIONS = {".pdf", ".docx"} | IMAGE_EXTENSIONS | HTML_EXTENSIONS
+
+def extract_text_from_pdf(pdf_file, max_workers=None, ocr=True, page_break="\n"):
     """
     Extracts text from a PDF file.
 
+    Pages are decoded in parallel by iter_pdf_pages. Pages without a text layer
+    (scans) are OCR'd in parallel when ocr is True, and skipped otherwise.
+
     Args:
         pdf_file (str): Path to the PDF file.
+        max_workers (int): Worker processes for page decoding; defaults to the CPU count.
+        ocr (bool): OCR the images of pages that have no text.
+        page_break (str): Separator between pages, e.g. pipeline.dedup.PAGE_BREAK.
 
     Returns:
         str or None: Extracted text or None if extraction fails.
     """
     try:
-        reader = PdfReader(pdf_file)
-        text = "\n".join([page.extract_text() for page in reader.pages if page.extract_text()])
+        pages = list(iter_pdf_pages(pdf_file, max_workers=max_workers))
+        if ocr:
+            fill_scanned_pages(pdf_file, pages, OcrEngine(max_workers=max_workers))
+        text = page_break.join(page for page in pages if page)
         if text:
-            logging.info(f"Successfully extracted text from PDF: {pdf_file}")
+            logger.info(f"Successfully extracted text from PDF: {pdf_file}")
             return text.strip()
         else:
-            logging.warning(f"No text found in PDF: {pdf_file}")
+            logger.warning(f"No text found in PDF: {pdf_file}")
             return None
     except Exception as e:
-        logging.error(f"Error extracting text from PDF {pdf_file}: {e}")
+        logger.error(f"Error extracting text from PDF {pdf_file}: {e}")
         return None
 
 
@@ -43,19 +55,95 @@ def extract_text_from_image(image_file):
         str or None: Extracted text or None if extraction fails.
     """
     try:
-        img = Image.open(image_file)
-        text = image_to_string(img)
+        text = OcrEngine(max_workers=1).ocr_image(image_file)["text"]
+        if text:
+            logger.info(f"Successfully extracted text from image: {image_file}")
+            return text.strip()
+        else:
+            logger.warning(f"No text found in image: {image_file}")
+            return None
+    except Exception as e:
+        logger.error(f"Error extracting text from image {image_file}: {e}")
+        return None
+
+
+def extract_text_from_docx(docx_file):
+    """
+    Extracts paragraph, table, header and footer text from a DOCX file.
+
+    Args:
+        docx_file (str): Path to the DOCX file.
+
+    Returns:
+        str or None: Extracted text or None if extraction fails.
+    """
+    try:
+        text = extract_docx_text(docx_file)
         if text:
-            logging.info(f"Successfully extracted text from image: {image_file}")
+            logger.info(f"Successfully extracted text from DOCX: {docx_file}")
             return text.strip()
         else:
-            logging.warning(f"No text found in image: {image_file}")
+            logger.warning(f"No text found in DOCX: {docx_file}")
             return None
     except Exception as e:
-        logging.error(f"Error extracting text from image {image_file}: {e}")
+        logger.error(f"Error extracting text from DOCX {docx_file}: {e}")
         return None
 
 
+def extract_text_from_html(html_file, chunk_size=64 * 1024):
+    """
+    Extracts visible, non-boilerplate text from a local HTML file, parsing it in chunks.
+
+    Args:
+        html_file (str): Path to the HTML file.
+        chunk_size (int): Bytes fed to the parser at a time.
+
+    Returns:
+        str or None: Extracted text or None if extraction fails.
+    """
+    try:
+        with open(html_file, "rb") as f:
+            text = extract_html_text(iter(lambda: f.read(chunk_size), b""))
+        if text:
+            logger.info(f"Successfully extracted text from HTML: {html_file}")
+            return text
+        else:
+            logger.warning(f"No text found in HTML: {html_file}")
+            return None
+    except Exception as e:
+        logger.error(f"Error extracting text from HTML {html_file}: {e}")
+        return None
+
+
+def extract_text_from_file(path, max_workers=None, ocr=True, page_break="\n"):
+    """
+    Extracts text from a local file with the extractor matching its extension.
+
+    Args:
+        path (str): Path to a PDF, image, DOCX or HTML file.
+        max_workers (int): Worker processes for PDF page decoding.
+        ocr (bool): OCR scanned PDF pages.
+        page_break (str): Separator between PDF pages.
+
+    Returns:
+        str or None: Extracted text or None if extraction fails.
+
+    Raises:
+        ValueError: If the extension is not supported.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in SUPPORTED_EXTENSIONS:
+        raise ValueError(f"Unsupported file type: {path}")
+    with stage(EXTRACT, bytes=os.path.getsize(path), items=1):
+        if extension == ".pdf":
+            return extract_text_from_pdf(path, max_workers=max_workers, ocr=ocr, page_break=page_break)
+        if extension in IMAGE_EXTENSIONS:
+            return extract_text_from_image(path)
+        if extension == ".docx":
+            return extract_text_from_docx(path)
+        return extract_text_from_html(path)
+
+
 def extract_text_from_web(url):
     """
     Extracts text content from a web page.
@@ -67,19 +155,20 @@ def extract_text_from_web(url):
         str or None: Extracted text or None if extraction fails.
     """
     try:
-        response = requests.get(url, timeout=5)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.content, "html.parser")
-        text = soup.get_text()
+        with requests.get(url, timeout=5, stream=True) as response:
+            response.raise_for_status()
+            charset_declared = 'charset' in response.headers.get('content-type', '')
+            text = extract_html_text(response.iter_content(64 * 1024),
+                                     response.encoding if charset_declared else None)
         if text:
-            logging.info(f"Successfully extracted text from web page: {url}")
+            logger.info(f"Successfully extracted text from web page: {url}")
             return text.strip()
         else:
-            logging.warning(f"No text found on the web page: {url}")
+            logger.warning(f"No text found on the web page: {url}")
             return None
     except requests.exceptions.RequestException as e:
-        logging.error(f"Network error while accessing {url}: {e}")
+        logger.error(f"Network error while accessing {url}: {e}")
         return None
     except Exception as e:
-        logging.error(f"Error extracting text from web {url}: {e}")
+        logger.error(f"Error extracting text from web {url}: {e}")
         return None
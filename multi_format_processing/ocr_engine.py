@@ -0,0 +1,201 @@
+import logging
+import os
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from PIL import Image
+from pytesseract import image_to_string
+
+from pipeline.metrics import OCR, stage
+from .pdf_extraction import open_pdf_reader
+
+logger = logging.getLogger(__name__)
+
+# Tesseract gains little above ~300 DPI for a letter page (about 2550 x 3300)
+DEFAULT_MAX_PIXELS = 2550 * 3300
+
+
+def otsu_threshold(image):
+    """
+    Computes the Otsu binarization threshold of a grayscale image.
+
+    Args:
+        image (PIL.Image.Image): Image in mode 'L'.
+
+    Returns:
+        int: Threshold between 0 and 255.
+    """
+    histogram = image.histogram()[:256]
+    total = sum(histogram)
+    weighted_total = sum(i * count for i, count in enumerate(histogram))
+    background = 0
+    weighted_background = 0
+    best_threshold = 0
+    best_variance = 0.0
+    for i, count in enumerate(histogram):
+        background += count
+        if background == 0:
+            continue
+        foreground = total - background
+        if foreground == 0:
+            break
+        weighted_background += i * count
+        mean_background = weighted_background / background
+        mean_foreground = (weighted_total - weighted_background) / foreground
+        variance = background * foreground * (mean_background - mean_foreground) ** 2
+        if variance > best_variance:
+            best_variance = variance
+            best_threshold = i
+    return best_threshold
+
+
+def preprocess_image(image, max_pixels=DEFAULT_MAX_PIXELS, binarize=True):
+    """
+    Prepares an image for OCR: grayscale, downsample if oversized, binarize.
+
+    Args:
+        image (PIL.Image.Image): Source image.
+        max_pixels (int): Images with more pixels are scaled down to this area.
+        binarize (bool): Apply an Otsu threshold.
+
+    Returns:
+        PIL.Image.Image: The processed image.
+    """
+    image = image.convert("L")
+    width, height = image.size
+    if width * height > max_pixels:
+        scale = (max_pixels / (width * height)) ** 0.5
+        image = image.resize((max(1, int(width * scale)), max(1, int(height * scale))), Image.LANCZOS)
+    if binarize:
+        threshold = otsu_threshold(image)
+        image = image.point(lambda value: 255 if value > threshold else 0, mode="1")
+    return image
+
+
+class OcrEngine:
+    """
+    Runs Tesseract over many images in a worker pool.
+
+    pytesseract runs the tesseract binary in a subprocess, so a thread pool
+    already keeps several cores busy. Every result carries its own timings.
+    """
+
+    def __init__(self, max_workers=None, lang="eng", preprocess=True, max_pixels=DEFAULT_MAX_PIXELS,
+                 ocr_function=image_to_string):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.lang = lang
+        self.preprocess = preprocess
+        self.max_pixels = max_pixels
+        self.ocr_function = ocr_function
+
+    def ocr_image(self, source):
+        """
+        OCRs one image.
+
+        Args:
+            source (str, bytes or PIL.Image.Image): Image path, encoded bytes or image.
+
+        Returns:
+            dict: text, original size, preprocess_seconds and ocr_seconds.
+        """
+        with stage(OCR, bytes=len(source) if isinstance(source, (bytes, bytearray)) else 0, items=1):
+            start = time.perf_counter()
+            if isinstance(source, (bytes, bytearray)):
+                image = Image.open(BytesIO(source))
+            elif isinstance(source, Image.Image):
+                image = source
+            else:
+                image = Image.open(source)
+            size = image.size
+            if self.preprocess:
+                image = preprocess_image(image, self.max_pixels)
+            preprocessed = time.perf_counter()
+            text = self.ocr_function(image, lang=self.lang)
+        return {
+            "text": text,
+            "size": size,
+            "preprocess_seconds": preprocessed - start,
+            "ocr_seconds": time.perf_counter() - preprocessed,
+        }
+
+    def _safe_ocr(self, key, source):
+        try:
+            result = self.ocr_image(source)
+        except Exception as e:
+            logger.error(f"Error running OCR on {key}: {e}")
+            result = {"text": "", "error": str(e)}
+        result["key"] = key
+        return result
+
+    def ocr_images(self, sources):
+        """
+        OCRs (key, image) pairs in the worker pool, yielding results in input order.
+
+        Args:
+            sources (iterable): (key, image) pairs; images as accepted by ocr_image.
+
+        Yields:
+            dict: ocr_image result with the key added (or 'error' on failure).
+        """
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            pending = deque()
+            for key, source in sources:
+                pending.append(executor.submit(self._safe_ocr, key, source))
+                if len(pending) >= 2 * self.max_workers:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
+    def ocr_pdf_pages(self, pdf_source, page_numbers):
+        """
+        OCRs the embedded images of scanned PDF pages that have no text layer.
+
+        Page images are pulled out of the PDF one page at a time and handed to
+        the pool as soon as they are decoded.
+
+        Args:
+            pdf_source (str or bytes): Path to the PDF file, or its raw bytes.
+            page_numbers (iterable): Zero-based page indices to OCR.
+
+        Returns:
+            dict: Page index -> OCR text of that page's images.
+        """
+        reader = open_pdf_reader(pdf_source)
+
+        def page_images():
+            for page_number in page_numbers:
+                try:
+                    images = reader.pages[page_number].images
+                except Exception as e:
+                    logger.error(f"Error reading images of page {page_number}: {e}")
+                    continue
+                for image in images:
+                    yield page_number, image.data
+
+        texts = {}
+        for result in self.ocr_images(page_images()):
+            if result["text"].strip():
+                texts.setdefault(result["key"], []).append(result["text"].strip())
+        return {page_number: "\n".join(parts) for page_number, parts in texts.items()}
+
+
+def fill_scanned_pages(pdf_source, pages, engine=None):
+    """
+    Replaces empty page texts with the OCR text of those pages, in place.
+
+    Args:
+        pdf_source (str or bytes): Path to the PDF file, or its raw bytes.
+        pages (list): Page texts as returned by iter_pdf_pages.
+        engine (OcrEngine): Engine to use; a default one if omitted.
+
+    Returns:
+        list: The same pages list.
+    """
+    scanned = [i for i, page in enumerate(pages) if not page.strip()]
+    if scanned:
+        logger.info(f"Running OCR on {len(scanned)} pages without a text layer")
+        for page_number, text in (engine or OcrEngine()).ocr_pdf_pages(pdf_source, scanned).items():
+            pages[page_number] = text
+    return pages
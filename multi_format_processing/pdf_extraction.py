@@ -0,0 +1,77 @@
+import logging
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+
+from PyPDF2 import PdfReader
+
+logger = logging.getLogger(__name__)
+
+# Reader opened once per worker process by _init_worker
+_worker_reader = None
+
+
+def open_pdf_reader(source):
+    """Opens a PdfReader from a file path or the raw bytes of a PDF."""
+    if isinstance(source, (bytes, bytearray)):
+        return PdfReader(BytesIO(source))
+    return PdfReader(source)
+
+
+def _init_worker(source):
+    global _worker_reader
+    _worker_reader = open_pdf_reader(source)
+
+
+def _extract_page_range(start, stop):
+    """Extracts the text of pages [start, stop) with the worker's reader."""
+    return [_worker_reader.pages[i].extract_text() or "" for i in range(start, stop)]
+
+
+def iter_pdf_pages(source, max_workers=None, pages_per_task=8):
+    """
+    Yields the text of every page of a PDF, in page order.
+
+    Pages are decoded by a pool of worker processes, each opening the PDF once.
+    Results are yielded as soon as the next page range in order is ready, so
+    callers can start on the first pages before the rest of the file is decoded.
+    Small files, or max_workers=1, are decoded in this process.
+
+    Args:
+        source (str or bytes): Path to the PDF file, or its raw bytes.
+        max_workers (int): Worker processes; defaults to the CPU count.
+        pages_per_task (int): Pages decoded per worker task.
+
+    Yields:
+        str: Text of each page ('' for pages without a text layer).
+    """
+    reader = open_pdf_reader(source)
+    page_count = len(reader.pages)
+    max_workers = max_workers or os.cpu_count() or 1
+    pages_per_task = max(1, pages_per_task)
+
+    if max_workers == 1 or page_count <= pages_per_task:
+        for page in reader.pages:
+            yield page.extract_text() or ""
+        return
+    del reader
+
+    ranges = ((start, min(start + pages_per_task, page_count))
+              for start in range(0, page_count, pages_per_task))
+    executor = ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                   initargs=(source,))
+    try:
+        # Keep a bounded number of ranges in flight so memory does not grow with the file
+        pending = deque()
+        for page_range in ranges:
+            pending.append(executor.submit(_extract_page_range, *page_range))
+            if len(pending) >= 2 * max_workers:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+    finally:
+        # Also runs when the caller stops iterating early
+        executor.shutdown(cancel_futures=True)
+
+    logger.info(f"Extracted {page_count} pages with {max_workers} workers")
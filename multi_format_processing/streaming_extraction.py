@@ -0,0 +1,309 @@
+import codecs
+import logging
+import re
+import zipfile
+from io import BytesIO
+
+from lxml import etree
+
+logger = logging.getLogger(__name__)
+
+WORD_NAMESPACE = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+W = f"{{{WORD_NAMESPACE}}}"
+HEADER_PART = re.compile(r"^word/header\d*\.xml$")
+FOOTER_PART = re.compile(r"^word/footer\d*\.xml$")
+
+# Elements dropped with everything inside them
+BOILERPLATE_TAGS = {"script", "style", "noscript", "template", "nav", "aside", "form",
+                    "iframe", "svg", "button", "select", "option"}
+# Dropped only as page furniture: inside an article or main they hold headlines and bylines
+PAGE_FURNITURE_TAGS = {"header", "footer"}
+CONTENT_TAGS = {"article", "main"}
+# class/id tokens that mark navigation, ads and similar page furniture
+BOILERPLATE_MARKERS = re.compile(
+    r"(?:^|[\s_-])(?:nav|navbar|menu|footer|sidebar|breadcrumbs?|cookies?|banner|adverts?|ads|share|social|"
+    r"comments?|popup|newsletter)(?:$|[\s_-])",
+    re.IGNORECASE,
+)
+# Elements that end a line of extracted text
+BLOCK_TAGS = {"p", "div", "br", "li", "ul", "ol", "tr", "table", "section", "article", "main", "h1", "h2",
+              "h3", "h4", "h5", "h6", "title", "body", "blockquote", "pre", "dd", "dt", "figcaption"}
+# Elements whose text ends a cell of a tab-separated line
+CELL_TAGS = {"td", "th"}
+WHITESPACE = re.compile(r"\s+")
+# Leading bytes searched for a byte order mark or <meta charset>, as browsers do
+SNIFF_BYTES = 1024
+META_CHARSET = re.compile(rb"<meta[^>]*?charset\s*=\s*[\"']?\s*([-\w.:]+)", re.IGNORECASE)
+BYTE_ORDER_MARKS = ((codecs.BOM_UTF8, "utf-8-sig"), (codecs.BOM_UTF16_LE, "utf-16"), (codecs.BOM_UTF16_BE, "utf-16"))
+
+
+def _open_zip(source):
+    if isinstance(source, (bytes, bytearray)):
+        source = BytesIO(source)
+    return zipfile.ZipFile(source)
+
+
+def _paragraph_text(paragraph):
+    parts = []
+    for node in paragraph.iter(f"{W}t", f"{W}tab", f"{W}br", f"{W}cr"):
+        if node.tag == f"{W}t":
+            parts.append(node.text or "")
+        elif node.tag == f"{W}tab":
+            parts.append("\t")
+        else:
+            parts.append("\n")
+    return "".join(parts)
+
+
+def _iter_part_lines(archive, name):
+    """
+    Yields paragraph lines of one WordprocessingML part; table rows become tab-separated lines.
+
+    Tables can nest inside cells, so open rows and cells are kept on stacks; a
+    nested row becomes part of the text of the cell that contains it.
+    """
+    with archive.open(name) as part:
+        rows = []
+        cells = []
+        for event, element in etree.iterparse(part, events=("start", "end"),
+                                              tag=(f"{W}p", f"{W}tc", f"{W}tr")):
+            if event == "start":
+                if element.tag == f"{W}tr":
+                    rows.append([])
+                elif element.tag == f"{W}tc":
+                    cells.append([])
+                continue
+            if element.tag == f"{W}p":
+                text = _paragraph_text(element)
+                if cells:
+                    cells[-1].append(text)
+                elif text.strip():
+                    yield text
+            elif element.tag == f"{W}tc":
+                cell = " ".join(part for part in cells.pop() if part.strip())
+                if rows:
+                    rows[-1].append(cell)
+            else:
+                row = rows.pop()
+                if cells:
+                    cells[-1].append(" ".join(cell for cell in row if cell.strip()))
+                elif any(cell.strip() for cell in row):
+                    yield "\t".join(row)
+            # Nested tables finish inside a cell, so only free elements outside cells
+            if not cells:
+                element.clear(keep_tail=False)
+                parent = element.getparent()
+                while parent is not None and element.getprevious() is not None:
+                    del parent[0]
+
+
+def iter_docx_text(source, include_headers=True):
+    """
+    Yields the text of a DOCX file line by line without building the document.
+
+    word/document.xml is read straight from the zip with lxml's iterparse and
+    every finished paragraph or table row is released right away, so memory
+    stays flat however long the document is. Table rows are yielded as
+    tab-separated cell text. Headers come first and footers last.
+
+    Args:
+        source (str, bytes or file): Path, raw bytes or binary file object.
+        include_headers (bool): Also read header and footer parts.
+
+    Yields:
+        str: Paragraph or table-row text.
+    """
+    with _open_zip(source) as archive:
+        names = archive.namelist()
+        headers = sorted(name for name in names if HEADER_PART.match(name)) if include_headers else []
+        footers = sorted(name for name in names if FOOTER_PART.match(name)) if include_headers else []
+        for name in headers + ["word/document.xml"] + footers:
+            yield from _iter_part_lines(archive, name)
+
+
+def extract_docx_text(source, include_headers=True):
+    """Returns the text of a DOCX file, one paragraph or table row per line."""
+    return "\n".join(iter_docx_text(source, include_headers))
+
+
+def sniff_encoding(head):
+    """
+    Picks the encoding of an HTML document from its first bytes.
+
+    Args:
+        head (bytes): Start of the document, ideally SNIFF_BYTES long.
+
+    Returns:
+        str: The byte order mark's encoding, else the <meta> declared one, else utf-8.
+    """
+    for mark, encoding in BYTE_ORDER_MARKS:
+        if head.startswith(mark):
+            return encoding
+    match = META_CHARSET.search(head)
+    if match:
+        try:
+            encoding = codecs.lookup(match.group(1).decode("ascii")).name
+        except LookupError:
+            logger.warning(f"Unknown charset {match.group(1)!r} declared, decoding as utf-8")
+            return "utf-8"
+        # A utf-16 declaration read from ASCII bytes cannot be right
+        return "utf-8" if encoding.startswith("utf-16") else encoding
+    return "utf-8"
+
+
+def _is_boilerplate(element, in_content=False):
+    if not isinstance(element.tag, str):
+        return True
+    if element.tag in BOILERPLATE_TAGS:
+        return True
+    if element.tag in PAGE_FURNITURE_TAGS and not in_content:
+        return True
+    markers = f"{element.get('class', '')} {element.get('id', '')} {element.get('role', '')}"
+    return markers.strip() != "" and (
+        BOILERPLATE_MARKERS.search(markers) is not None or element.get("role") in ("navigation", "banner")
+    )
+
+
+class HtmlStreamExtractor:
+    """
+    Incremental, boilerplate-dropping HTML-to-text extractor built on lxml's pull parser.
+
+    Chunks are fed as they arrive. Text is emitted in document order as each
+    block element closes, and closed elements are removed from the partial
+    tree, so only the currently open elements are ever held in memory.
+    Navigation, page headers and footers, scripts, forms and elements whose
+    class, id or role looks like page furniture are skipped with their whole
+    subtree; headers and footers inside an article or main element are kept.
+    Table cells of one row are joined by tabs.
+    """
+
+    def __init__(self, encoding=None):
+        self._parser = etree.HTMLPullParser(events=("start", "end"), remove_comments=True, remove_pis=True)
+        # Without a known encoding the first bytes are held back until sniff_encoding can pick one
+        self._decoder = codecs.getincrementaldecoder(encoding)(errors="replace") if encoding else None
+        self._head = b""
+        self._fed = False
+        # Per open element: [element, skipped, has started a child, last finished child, inside article/main]
+        self._stack = []
+        self._buffer = []
+        # Finished cells of the current line
+        self._cells = []
+
+    def _emit(self, text):
+        if text:
+            self._buffer.append(text)
+
+    def _text(self):
+        text = WHITESPACE.sub(" ", "".join(self._buffer)).strip()
+        self._buffer = []
+        return text
+
+    def _flush(self):
+        rest = self._text()
+        cells = self._cells + [rest] if rest else self._cells
+        self._cells = []
+        return "\t".join(cells) if any(cells) else ""
+
+    def feed(self, chunk):
+        """
+        Parses a chunk and returns the lines completed by it.
+
+        Args:
+            chunk (bytes or str): Next piece of the document.
+
+        Returns:
+            list: Completed lines of visible text.
+        """
+        if isinstance(chunk, (bytes, bytearray)):
+            chunk = self._decode(chunk)
+        if chunk:
+            self._parser.feed(chunk)
+            self._fed = True
+        return self._drain()
+
+    def close(self):
+        """Finishes parsing and returns the remaining lines."""
+        rest = self._decode(b"", final=True)
+        if rest:
+            self._parser.feed(rest)
+            self._fed = True
+        if not self._fed:
+            # lxml refuses to close a parser that never saw any input
+            return []
+        self._parser.close()
+        lines = self._drain()
+        tail = self._flush()
+        return lines + [tail] if tail else lines
+
+    def _decode(self, data, final=False):
+        if self._decoder is None:
+            self._head += data
+            if len(self._head) < SNIFF_BYTES and not final:
+                return ""
+            self._decoder = codecs.getincrementaldecoder(sniff_encoding(self._head))(errors="replace")
+            data, self._head = self._head, b""
+        return self._decoder.decode(data, final)
+
+    def _drain(self):
+        lines = []
+        for event, element in self._parser.read_events():
+            if event == "start":
+                if self._stack:
+                    # The parent's text up to this child, or the previous sibling's tail, is complete now
+                    state = self._stack[-1]
+                    parent, parent_skipped, had_child, previous, in_content = state
+                    if not parent_skipped:
+                        self._emit(previous.tail if had_child else parent.text)
+                    if previous is not None:
+                        parent.remove(previous)
+                    state[2], state[3] = True, None
+                    skipped = parent_skipped or _is_boilerplate(element, in_content)
+                else:
+                    in_content = False
+                    skipped = _is_boilerplate(element)
+                if element.tag in BLOCK_TAGS and not skipped:
+                    self._flush_into(lines)
+                self._stack.append([element, skipped, False, None, in_content or element.tag in CONTENT_TAGS])
+                continue
+
+            _, skipped, had_child, last_child, _ = self._stack.pop()
+            if not skipped:
+                self._emit(last_child.tail if last_child is not None else (None if had_child else element.text))
+            if last_child is not None:
+                element.remove(last_child)
+            if element.tag in CELL_TAGS and not skipped:
+                self._cells.append(self._text())
+            elif element.tag in BLOCK_TAGS and not skipped:
+                self._flush_into(lines)
+            element.clear(keep_tail=True)
+            if self._stack:
+                self._stack[-1][3] = element
+        return lines
+
+    def _flush_into(self, lines):
+        line = self._flush()
+        if line:
+            lines.append(line)
+
+
+def iter_html_text(chunks, encoding=None):
+    """
+    Yields the visible, non-boilerplate text lines of an HTML document.
+
+    Args:
+        chunks (iterable): bytes or str pieces, e.g. response.iter_content().
+        encoding (str): Byte encoding, if known; otherwise sniffed from the first bytes.
+
+    Yields:
+        str: Lines of text, one per block element.
+    """
+    extractor = HtmlStreamExtractor(encoding)
+    for chunk in chunks:
+        if chunk:
+            yield from extractor.feed(chunk)
+    yield from extractor.close()
+
+
+def extract_html_text(chunks, encoding=None):
+    """Returns the visible text of an HTML document, one block per line."""
+    return "\n".join(iter_html_text(chunks, encoding))
@@ -0,0 +1,206 @@
+import asyncio
+import codecs
+import json
+import logging
+import os
+import time
+from collections import defaultdict
+from urllib.parse import urlsplit
+
+import aiohttp
+
+from .streaming_extraction import HtmlStreamExtractor
+
+logger = logging.getLogger(__name__)
+
+class ValidatorStore:
+    """
+    ETag/Last-Modified validators and last extracted text per URL.
+
+    Used to send conditional GETs; a 304 reply reuses the stored text. The store
+    is optionally persisted as JSON so validators survive between crawls.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self.entries = {}
+        if path and os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                self.entries = json.load(f)
+
+    def request_headers(self, url):
+        entry = self.entries.get(url)
+        headers = {}
+        if entry:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def update(self, url, response_headers, text):
+        etag = response_headers.get("ETag")
+        last_modified = response_headers.get("Last-Modified")
+        if etag or last_modified:
+            self.entries[url] = {"etag": etag, "last_modified": last_modified, "text": text}
+
+    def cached_text(self, url):
+        entry = self.entries.get(url)
+        return entry["text"] if entry else None
+
+    def save(self):
+        if self.path:
+            with open(self.path, "w", encoding="utf-8") as f:
+                json.dump(self.entries, f)
+
+
+class UrlIngestionReport:
+    """Throughput and failures of one batch URL ingestion."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.finished = None
+        self.fetched = 0
+        self.not_modified = 0
+        self.failures = []
+
+    @property
+    def elapsed(self):
+        return (self.finished or time.perf_counter()) - self.started
+
+    @property
+    def pages_per_second(self):
+        pages = self.fetched + self.not_modified
+        return pages / self.elapsed if self.elapsed else 0.0
+
+    def as_dict(self):
+        return {
+            "fetched": self.fetched,
+            "not_modified": self.not_modified,
+            "failed": len(self.failures),
+            "elapsed": self.elapsed,
+            "pages_per_second": self.pages_per_second,
+            "failures": self.failures,
+        }
+
+
+async def fetch_url_text(session, url, validators=None, chunk_size=64 * 1024):
+    """
+    Fetches one URL and extracts its visible text, one block per line, while the body streams in.
+
+    Args:
+        session (aiohttp.ClientSession): Shared session (connection pool).
+        url (str): URL to fetch.
+        validators (ValidatorStore): Enables conditional GETs when given.
+        chunk_size (int): Bytes read per body chunk.
+
+    Returns:
+        dict: url, status, text, not_modified and elapsed seconds.
+    """
+    start = time.perf_counter()
+    headers = validators.request_headers(url) if validators else {}
+    async with session.get(url, headers=headers) as response:
+        if response.status == 304 and validators:
+            return {"url": url, "status": 304, "text": validators.cached_text(url),
+                    "not_modified": True, "elapsed": time.perf_counter() - start}
+        response.raise_for_status()
+        extractor = HtmlStreamExtractor(_known_charset(response.charset))
+        lines = []
+        async for chunk in response.content.iter_chunked(chunk_size):
+            lines += extractor.feed(chunk)
+        text = "\n".join(lines + extractor.close())
+        if validators:
+            validators.update(url, response.headers, text)
+        return {"url": url, "status": response.status, "text": text,
+                "not_modified": False, "elapsed": time.perf_counter() - start}
+
+
+def _known_charset(charset):
+    # An unknown or missing charset is left for the extractor to sniff from the body
+    try:
+        return codecs.lookup(charset).name if charset else None
+    except LookupError:
+        return None
+
+
+async def iter_url_texts(urls, concurrency=64, per_host=4, timeout=10, validators=None, report=None):
+    """
+    Fetches many URLs concurrently and yields results as they complete.
+
+    One aiohttp session pools connections for the whole batch; concurrency caps
+    the number of requests in flight and per_host caps them per host. A request
+    first waits for its host's slot and a free overall slot, so its timeout
+    only starts once it can actually be sent.
+
+    Args:
+        urls (iterable): URLs to fetch.
+        concurrency (int): Maximum requests in flight overall.
+        per_host (int): Maximum requests in flight per host.
+        timeout (float): Total seconds allowed per request, once it holds a connection slot.
+        validators (ValidatorStore): Enables conditional GETs when given.
+        report (UrlIngestionReport): Collects throughput and failures.
+
+    Yields:
+        dict: Result of fetch_url_text, or url/error for failed requests.
+    """
+    report = report or UrlIngestionReport()
+    connector = aiohttp.TCPConnector(limit=concurrency, limit_per_host=per_host)
+    client_timeout = aiohttp.ClientTimeout(total=timeout)
+    # ClientTimeout(total=...) also counts time spent queued for a connector slot,
+    # so requests wait for these semaphores (per host first) before they start
+    host_slots = defaultdict(lambda: asyncio.Semaphore(per_host))
+    slots = asyncio.Semaphore(concurrency)
+    async with aiohttp.ClientSession(connector=connector, timeout=client_timeout) as session:
+
+        async def fetch(url):
+            try:
+                async with host_slots[urlsplit(url).netloc], slots:
+                    return await fetch_url_text(session, url, validators)
+            except (aiohttp.ClientError, asyncio.TimeoutError, UnicodeError) as e:
+                return {"url": url, "error": str(e) or type(e).__name__}
+
+        pending = set()
+        url_iter = iter(urls)
+        for url in url_iter:
+            pending.add(asyncio.ensure_future(fetch(url)))
+            if len(pending) >= 2 * concurrency:
+                break
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                result = task.result()
+                if "error" in result:
+                    logger.error(f"Error fetching {result['url']}: {result['error']}")
+                    report.failures.append(result)
+                elif result["not_modified"]:
+                    report.not_modified += 1
+                else:
+                    report.fetched += 1
+                yield result
+                next_url = next(url_iter, None)
+                if next_url is not None:
+                    pending.add(asyncio.ensure_future(fetch(next_url)))
+    report.finished = time.perf_counter()
+    if validators:
+        validators.save()
+    logger.info(f"Ingested {report.fetched + report.not_modified} URLs "
+                f"at {report.pages_per_second:.1f} pages/s, {len(report.failures)} failed")
+
+
+def ingest_urls(urls, **kwargs):
+    """
+    Synchronous wrapper around iter_url_texts.
+
+    Args:
+        urls (iterable): URLs to fetch.
+        **kwargs: Options for iter_url_texts.
+
+    Returns:
+        tuple: (list of results, UrlIngestionReport)
+    """
+    report = kwargs.pop("report", None) or UrlIngestionReport()
+
+    async def collect():
+        return [result async for result in iter_url_texts(urls, report=report, **kwargs)]
+
+    return asyncio.run(collect()), report
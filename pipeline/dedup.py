@@ -0,0 +1,267 @@
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import threading
+import zlib
+
+import numpy as np
+
+from pipeline.extraction_cache import DEFAULT_CACHE_DIR
+from pipeline.metrics import DEDUP, stage
+
+logger = logging.getLogger(__name__)
+
+# Separator between pages in extracted text; pages are deduplicated individually
+PAGE_BREAK = "\f"
+DOCUMENT = "document"
+PAGE = "page"
+
+DEFAULT_THRESHOLD = 0.85
+DEFAULT_NUM_PERM = 128
+DEFAULT_BANDS = 16
+DEFAULT_SHINGLE_SIZE = 5
+DEFAULT_MIN_WORDS = 20
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_SHINGLE_BLOCK = 8192
+WORD = re.compile(r"\w+")
+
+
+def shingle_hashes(text, shingle_size=DEFAULT_SHINGLE_SIZE):
+    """
+    Returns the distinct 32-bit hashes of the word shingles of a text.
+
+    Words are lower-cased, so case, punctuation and whitespace changes do not
+    affect the result.
+
+    Args:
+        text (str): Text to shingle.
+        shingle_size (int): Words per shingle.
+
+    Returns:
+        numpy.ndarray: Unique shingle hashes (uint64), empty for empty text.
+    """
+    words = WORD.findall(text.lower())
+    if not words:
+        return np.empty(0, dtype=np.uint64)
+    size = min(shingle_size, len(words))
+    hashes = {zlib.crc32(" ".join(words[i:i + size]).encode("utf-8"))
+              for i in range(len(words) - size + 1)}
+    return np.fromiter(hashes, dtype=np.uint64, count=len(hashes))
+
+
+class MinHasher:
+    """
+    MinHash signatures whose element-wise agreement estimates Jaccard similarity.
+
+    The permutations are seeded, so signatures computed in different processes
+    or runs are comparable and can be stored.
+    """
+
+    def __init__(self, num_perm=DEFAULT_NUM_PERM, seed=1):
+        rng = np.random.RandomState(seed)
+        # a, b < 2**31 and hashes < 2**32 keep a * x + b below 2**64
+        self.a = rng.randint(1, 1 << 31, size=(num_perm, 1), dtype=np.int64).astype(np.uint64)
+        self.b = rng.randint(0, 1 << 31, size=(num_perm, 1), dtype=np.int64).astype(np.uint64)
+        self.num_perm = num_perm
+
+    def signature(self, hashes):
+        """
+        Computes the signature of a set of shingle hashes.
+
+        Args:
+            hashes (numpy.ndarray): Shingle hashes from shingle_hashes.
+
+        Returns:
+            numpy.ndarray: num_perm uint64 minima.
+        """
+        signature = np.full(self.num_perm, _MERSENNE_PRIME, dtype=np.uint64)
+        # Blocks bound the (num_perm x shingles) intermediate for long documents
+        for start in range(0, len(hashes), _SHINGLE_BLOCK):
+            block = hashes[start:start + _SHINGLE_BLOCK]
+            permuted = (self.a * block + self.b) % _MERSENNE_PRIME
+            np.minimum(signature, permuted.min(axis=1), out=signature)
+        return signature
+
+
+def similarity(left, right):
+    """Returns the Jaccard similarity estimated from two MinHash signatures."""
+    return float(np.count_nonzero(left == right)) / len(left)
+
+
+class DuplicateIndex:
+    """
+    Persistent near-duplicate index of documents and pages (MinHash with LSH banding).
+
+    Signatures are split into bands and each band is stored under a bucket
+    hash in a SQLite file, so a lookup only compares against signatures that
+    share at least one bucket. A new text is a duplicate when its estimated
+    Jaccard similarity to an indexed text of another source reaches the
+    threshold. Lookup and insert happen in one write transaction, so
+    concurrent ingestion workers sharing the file agree on which copy came
+    first. Texts shorter than min_words are never treated as duplicates.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, threshold=DEFAULT_THRESHOLD, num_perm=DEFAULT_NUM_PERM,
+                 bands=DEFAULT_BANDS, shingle_size=DEFAULT_SHINGLE_SIZE, min_words=DEFAULT_MIN_WORDS):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        os.makedirs(cache_dir, exist_ok=True)
+        self.path = os.path.join(cache_dir, "duplicate_index.db")
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.min_words = min_words
+        self.hasher = MinHasher(num_perm)
+        self.duplicates = 0
+        self._lock = threading.Lock()
+        # Transactions are managed explicitly (BEGIN IMMEDIATE) to serialize workers
+        self._conn = sqlite3.connect(self.path, timeout=60, isolation_level=None, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS signatures ("
+            "id INTEGER PRIMARY KEY, kind TEXT NOT NULL, source TEXT NOT NULL, signature BLOB NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS signatures_source ON signatures (kind, source)")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS buckets ("
+            "kind TEXT NOT NULL, band INTEGER NOT NULL, bucket INTEGER NOT NULL, signature_id INTEGER NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS buckets_lookup ON buckets (kind, band, bucket)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS buckets_signature ON buckets (signature_id)")
+
+    def signature(self, text):
+        """
+        Returns the MinHash signature of a text, or None if it is too short to compare.
+
+        Args:
+            text (str): Document or page text.
+
+        Returns:
+            numpy.ndarray or None: Signature.
+        """
+        if len(WORD.findall(text)) < self.min_words:
+            return None
+        return self.hasher.signature(shingle_hashes(text, self.shingle_size))
+
+    def _buckets(self, signature):
+        for band in range(self.bands):
+            data = signature[band * self.rows:(band + 1) * self.rows].tobytes()
+            digest = hashlib.blake2b(data, digest_size=8).digest()
+            yield band, int.from_bytes(digest, "big", signed=True)
+
+    def _find(self, signature, kind, source):
+        best = None
+        seen = set()
+        for band, bucket in self._buckets(signature):
+            rows = self._conn.execute(
+                "SELECT s.id, s.source, s.signature FROM buckets b JOIN signatures s ON s.id = b.signature_id "
+                "WHERE b.kind = ? AND b.band = ? AND b.bucket = ?", (kind, band, bucket)).fetchall()
+            for signature_id, other_source, blob in rows:
+                if signature_id in seen or other_source == source:
+                    continue
+                seen.add(signature_id)
+                score = similarity(signature, np.frombuffer(blob, dtype=np.uint64))
+                if score >= self.threshold and (best is None or score > best[1]):
+                    best = (other_source, score)
+        return best
+
+    def _add(self, signature, kind, source):
+        # A changed source replaces its previous signature
+        for (signature_id,) in self._conn.execute(
+                "SELECT id FROM signatures WHERE kind = ? AND source = ?", (kind, source)).fetchall():
+            self._conn.execute("DELETE FROM buckets WHERE signature_id = ?", (signature_id,))
+            self._conn.execute("DELETE FROM signatures WHERE id = ?", (signature_id,))
+        signature_id = self._conn.execute(
+            "INSERT INTO signatures (kind, source, signature) VALUES (?, ?, ?)",
+            (kind, source, signature.tobytes())).lastrowid
+        self._conn.executemany(
+            "INSERT INTO buckets (kind, band, bucket, signature_id) VALUES (?, ?, ?, ?)",
+            [(kind, band, bucket, signature_id) for band, bucket in self._buckets(signature)])
+
+    def check_and_add(self, text, source, kind=DOCUMENT):
+        """
+        Looks a text up and indexes it unless it is a near-duplicate.
+
+        Args:
+            text (str): Document or page text.
+            source (str): Identifier of the text, e.g. its path; reindexing the
+                same source never matches itself.
+            kind (str): DOCUMENT or PAGE; each kind is matched separately.
+
+        Returns:
+            tuple or None: (source of the earlier copy, estimated similarity), or
+            None if the text is new (or too short to compare).
+        """
+        signature = self.signature(text)
+        if signature is None:
+            return None
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                match = self._find(signature, kind, source)
+                if match is None:
+                    self._add(signature, kind, source)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        if match is not None:
+            self.duplicates += 1
+        return match
+
+    def deduplicate(self, text, source):
+        """
+        Drops a whole near-duplicate document, or else its near-duplicate pages.
+
+        Pages are separated by PAGE_BREAK; a page repeated within the document
+        or across the corpus (cover pages, disclaimers) is kept only the first
+        time it is seen.
+
+        Args:
+            text (str): Extracted document text.
+            source (str): Document identifier, e.g. its path.
+
+        Returns:
+            tuple: (text to process with pages joined by newlines, or None for a
+            duplicate document; source of the earlier copy or None;
+            number of pages dropped)
+        """
+        with stage(DEDUP, bytes=len(text), items=1):
+            match = self.check_and_add(text, source, DOCUMENT)
+            if match is not None:
+                logger.info(f"{source} is a near-duplicate of {match[0]} (similarity {match[1]:.2f}); skipping")
+                return None, match[0], 0
+            pages = text.split(PAGE_BREAK)
+            kept = []
+            for number, page in enumerate(pages, start=1):
+                if len(pages) > 1 and self.check_and_add(page, f"{source}#page={number}", PAGE) is not None:
+                    continue
+                kept.append(page)
+        dropped = len(pages) - len(kept)
+        if dropped:
+            logger.info(f"Dropped {dropped} near-duplicate pages of {source}")
+        return "\n".join(page for page in kept if page), None, dropped
+
+    def stats(self):
+        """
+        Returns index metrics.
+
+        Returns:
+            dict: documents and pages indexed, and duplicates found by this instance.
+        """
+        with self._lock:
+            counts = dict(self._conn.execute("SELECT kind, COUNT(*) FROM signatures GROUP BY kind").fetchall())
+        return {"documents": counts.get(DOCUMENT, 0), "pages": counts.get(PAGE, 0), "duplicates": self.duplicates}
+
+    def clear(self):
+        """Removes every indexed signature."""
+        with self._lock:
+            self._conn.execute("DELETE FROM buckets")
+            self._conn.execute("DELETE FROM signatures")
+            self.duplicates = 0
+
+    def close(self):
+        self._conn.close()
@@ -0,0 +1,180 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Bump when text extraction or NLP output changes so stale entries stop matching
+EXTRACTOR_VERSION = "5"
+
+DEFAULT_CACHE_DIR = os.environ.get("KG_CONSTRUCTION_CACHE_DIR", ".kg_cache")
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+
+def content_hash(data):
+    """
+    Returns the SHA-256 hex digest of raw bytes.
+
+    Args:
+        data (bytes): Content to hash.
+
+    Returns:
+        str: Hex digest.
+    """
+    return hashlib.sha256(data).hexdigest()
+
+
+def file_hash(path, block_size=1024 * 1024):
+    """
+    Returns the SHA-256 hex digest of a file, read in blocks.
+
+    Args:
+        path (str): Path to the file.
+        block_size (int): Bytes read per block.
+
+    Returns:
+        str: Hex digest.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ExtractionCache:
+    """
+    On-disk cache of extraction results keyed by content hash and extractor version.
+
+    Entries are JSON records (text, entities, relationships, ...) stored in a single
+    SQLite file. When the stored size exceeds max_bytes the least recently used
+    entries are evicted.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES, version=EXTRACTOR_VERSION):
+        os.makedirs(cache_dir, exist_ok=True)
+        self.path = os.path.join(cache_dir, "extraction_cache.db")
+        self.max_bytes = max_bytes
+        self.version = version
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "size INTEGER NOT NULL, last_access REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS entries_lru ON entries (last_access)")
+
+    def key_for(self, data):
+        """Returns the cache key for raw content bytes."""
+        return f"{self.version}:{content_hash(data)}"
+
+    def key_for_file(self, path):
+        """Returns the cache key for the content of a file."""
+        return f"{self.version}:{file_hash(path)}"
+
+    def get(self, key):
+        """
+        Looks up a cached record and marks it as recently used.
+
+        Args:
+            key (str): Cache key from key_for or key_for_file.
+
+        Returns:
+            dict or None: The cached record, or None on a miss.
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            with self._conn:
+                self._conn.execute("UPDATE entries SET last_access = ? WHERE key = ?", (time.time(), key))
+            self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, key, record):
+        """
+        Stores a JSON-serializable record, evicting old entries if over budget.
+
+        Args:
+            key (str): Cache key from key_for or key_for_file.
+            record (dict): Record to store.
+        """
+        value = json.dumps(record)
+        size = len(value.encode("utf-8"))
+        if size > self.max_bytes:
+            logger.warning(f"Record of {size} bytes exceeds the cache budget; not cached.")
+            return
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, size, last_access) VALUES (?, ?, ?, ?)",
+                (key, value, size, time.time()),
+            )
+            self._evict()
+
+    def _evict(self):
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        evicted = 0
+        for key, size in self._conn.execute("SELECT key, size FROM entries ORDER BY last_access").fetchall():
+            if total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            total -= size
+            evicted += 1
+        logger.info(f"Evicted {evicted} cache entries")
+
+    def get_or_compute(self, key, compute):
+        """
+        Returns the cached record for key, computing and storing it on a miss.
+
+        Args:
+            key (str): Cache key.
+            compute (callable): Zero-argument function returning the record.
+
+        Returns:
+            dict: The cached or freshly computed record.
+        """
+        record = self.get(key)
+        if record is None:
+            record = compute()
+            self.put(key, record)
+        return record
+
+    def stats(self):
+        """
+        Returns cache metrics.
+
+        Returns:
+            dict: hits, misses, hit_rate, entries and bytes.
+        """
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": entries,
+            "bytes": size,
+        }
+
+    def clear(self):
+        """Removes every entry and resets the hit counters."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM entries")
+            self.hits = 0
+            self.misses = 0
+
+    def close(self):
+        self._conn.close()
@@ -0,0 +1,356 @@
+"""
+Batch ingestion of a directory tree: text extraction and schema inference.
+
+Usage:
+    python -m pipeline.ingest path/to/corpus [--output DIR] [--workers N] [--no-ocr] [--include-text]
+                              [--no-dedup] [--top-terms N] [--metrics FILE.json|FILE.prom] [--profile FILE.prof]
+
+Results are appended to DIR/results.jsonl as each document finishes and every
+outcome is recorded in DIR/manifest.jsonl, so rerunning the same command after
+an interruption skips the documents that already finished. Near-duplicate
+documents (and repeated pages) are recognised with the signature index in
+DIR/duplicate_index.db and are not analysed again. Each schema keeps the
+--top-terms most frequent words (1000 by default; 0 keeps every distinct word).
+"""
+import argparse
+import json
+import logging
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+
+from multi_format_processing.extract_text import SUPPORTED_EXTENSIONS, extract_text_from_file
+from pipeline.dedup import PAGE_BREAK, DuplicateIndex
+from pipeline.logging_config import configure_logging
+from pipeline.metrics import RunProfiler, default_registry
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_OUTPUT_DIR = os.environ.get("KG_CONSTRUCTION_OUTPUT_DIR", "output")
+DONE = "done"
+FAILED = "failed"
+# Frequent terms kept per schema, so a result row stays bounded however long the document
+DEFAULT_TOP_TERMS = 1000
+
+
+def iter_documents(root, extensions=SUPPORTED_EXTENSIONS):
+    """
+    Yields supported files under a directory, recursively, in a stable order.
+
+    Args:
+        root (str): File or directory path.
+        extensions (set): Lower-case extensions (with dot) to include.
+
+    Yields:
+        str: File paths.
+    """
+    if os.path.isfile(root):
+        yield root
+        return
+    for directory, subdirectories, filenames in os.walk(root):
+        subdirectories.sort()
+        for filename in sorted(filenames):
+            if os.path.splitext(filename)[1].lower() in extensions:
+                yield os.path.join(directory, filename)
+
+
+def file_signature(path):
+    """Returns (size, mtime_ns), used to tell whether a finished file has changed."""
+    stat = os.stat(path)
+    return stat.st_size, stat.st_mtime_ns
+
+
+def open_for_append(path, block_size=65536):
+    """
+    Opens a JSON lines file for appending, first cutting off a torn last line.
+
+    An interrupted run can leave a partial record without its newline; the
+    next record would otherwise be glued onto it and both would be lost.
+
+    Args:
+        path (str): File to append to; created if missing.
+        block_size (int): Bytes read at a time while looking for the last newline.
+
+    Returns:
+        file: Text file opened in append mode.
+    """
+    if os.path.exists(path):
+        with open(path, "r+b") as f:
+            end = f.seek(0, os.SEEK_END)
+            keep = end
+            while keep > 0:
+                start = max(0, keep - block_size)
+                f.seek(start)
+                newline = f.read(keep - start).rfind(b"\n")
+                if newline >= 0:
+                    keep = start + newline + 1
+                    break
+                keep = start
+            if keep < end:
+                logger.warning(f"Dropping a torn last line ({end - keep} bytes) from {path}")
+                f.truncate(keep)
+    return open(path, "a", encoding="utf-8")
+
+
+class Manifest:
+    """
+    Append-only checkpoint of per-document outcomes (JSON lines).
+
+    The last entry of a path wins. A path counts as finished when its last
+    entry is 'done' and the file's size and mtime are unchanged.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.entries = {}
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # A torn last line from an interrupted run
+                        continue
+                    self.entries[entry["path"]] = entry
+        self._file = open_for_append(path)
+
+    def is_done(self, path, signature):
+        entry = self.entries.get(path)
+        return bool(entry) and entry["status"] == DONE and [entry["size"], entry["mtime_ns"]] == list(signature)
+
+    def record(self, path, signature, status, error=None):
+        entry = {"path": path, "size": signature[0], "mtime_ns": signature[1], "status": status, "error": error}
+        self.entries[path] = entry
+        self._file.write(json.dumps(entry) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self):
+        self._file.close()
+
+
+class IngestionReport:
+    """Throughput and failures of one ingestion run."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.finished = None
+        self.processed = 0
+        self.skipped = 0
+        self.duplicates = 0
+        self.failures = []
+
+    @property
+    def elapsed(self):
+        return (self.finished or time.perf_counter()) - self.started
+
+    @property
+    def documents_per_second(self):
+        return self.processed / self.elapsed if self.elapsed else 0.0
+
+    def as_dict(self):
+        return {
+            "processed": self.processed,
+            "skipped": self.skipped,
+            "duplicates": self.duplicates,
+            "failed": len(self.failures),
+            "elapsed": self.elapsed,
+            "documents_per_second": self.documents_per_second,
+            "failures": self.failures,
+        }
+
+
+_duplicate_indexes = {}
+
+
+def _duplicate_index(directory):
+    # One connection per process, reused for every document it handles
+    if directory not in _duplicate_indexes:
+        _duplicate_indexes[directory] = DuplicateIndex(directory)
+    return _duplicate_indexes[directory]
+
+
+def process_document(path, ocr=True, include_text=False, dedup_dir=None, top_k=DEFAULT_TOP_TERMS):
+    """
+    Extracts one document and infers its schema; runs inside a worker process.
+
+    Args:
+        path (str): Document path.
+        ocr (bool): OCR scanned PDF pages.
+        include_text (bool): Keep the extracted text in the result.
+        dedup_dir (str): Directory of the shared near-duplicate index; None
+            analyses every document.
+        top_k (int): Frequent terms kept in the schema, counted in bounded memory;
+            None keeps every distinct word.
+
+    Returns:
+        dict: path, chars, seconds, schema (and text if requested). Near-duplicates
+        have duplicate_of instead of a schema; pages_dropped counts repeated pages.
+
+    Raises:
+        ValueError: If no text could be extracted.
+    """
+    from schema_inference.schema_inference_logic import infer_schema, infer_schema_streaming
+    start = time.perf_counter()
+    # One process per document already uses every core, so PDFs decode serially
+    text = extract_text_from_file(path, max_workers=1, ocr=ocr, page_break=PAGE_BREAK)
+    if not text:
+        raise ValueError("No text extracted")
+    result = {"path": path, "chars": len(text)}
+    if dedup_dir is not None:
+        text, duplicate_of, result["pages_dropped"] = _duplicate_index(dedup_dir).deduplicate(text, path)
+        if duplicate_of is not None:
+            result["duplicate_of"] = duplicate_of
+            result["seconds"] = time.perf_counter() - start
+            return result
+    else:
+        text = text.replace(PAGE_BREAK, "\n")
+    if top_k is None:
+        result["schema"] = infer_schema(text)
+    else:
+        result["schema"] = infer_schema_streaming(text.splitlines(keepends=True), top_k)
+    if include_text:
+        result["text"] = text
+    result["seconds"] = time.perf_counter() - start
+    return result
+
+
+def _process_in_worker(path, ocr, include_text, dedup_dir, top_k):
+    # Stage metrics recorded in a worker process are sent back with the result
+    default_registry.reset()
+    return process_document(path, ocr, include_text, dedup_dir, top_k), default_registry.snapshot()
+
+
+def _process_in_process(path, ocr, include_text, dedup_dir, top_k):
+    # Metrics already land in this process's registry
+    return process_document(path, ocr, include_text, dedup_dir, top_k), {}
+
+
+class SerialExecutor:
+    """Runs submitted calls immediately in this process (used when profiling)."""
+
+    def submit(self, func, *args):
+        future = Future()
+        try:
+            future.set_result(func(*args))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+def ingest_directory(root, output_dir=DEFAULT_OUTPUT_DIR, max_workers=None, ocr=True, include_text=False,
+                     max_pending=None, in_process=False, dedup=True, top_k=DEFAULT_TOP_TERMS):
+    """
+    Ingests every supported document under root in a process pool.
+
+    Args:
+        root (str): File or directory to ingest.
+        output_dir (str): Directory for results.jsonl and manifest.jsonl.
+        max_workers (int): Worker processes; defaults to the CPU count.
+        ocr (bool): OCR scanned PDF pages.
+        include_text (bool): Store extracted text in the results.
+        max_pending (int): Documents submitted ahead of completion; 2 x workers by default.
+        in_process (bool): Process documents one by one in this process, so a
+            profiler sees the work.
+        dedup (bool): Skip near-duplicate documents and pages, using the
+            signature index in output_dir.
+        top_k (int): Frequent terms kept per schema; None keeps every distinct word.
+
+    Returns:
+        IngestionReport: Counts, throughput and failures of this run.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    max_workers = max_workers or os.cpu_count() or 1
+    max_pending = max_pending or 2 * max_workers
+    manifest = Manifest(os.path.join(output_dir, "manifest.jsonl"))
+    report = IngestionReport()
+    dedup_dir = output_dir if dedup else None
+    pending = {}
+
+    def collect(done_futures):
+        for future in done_futures:
+            path, signature = pending.pop(future)
+            try:
+                result, metrics = future.result()
+                default_registry.merge(metrics)
+            except Exception as e:
+                logger.error(f"Failed to ingest {path}: {e}")
+                report.failures.append({"path": path, "error": str(e)})
+                manifest.record(path, signature, FAILED, str(e))
+                continue
+            # Results are written before the manifest entry, so a finished entry always has its result
+            results.write(json.dumps(result) + "\n")
+            results.flush()
+            manifest.record(path, signature, DONE)
+            report.processed += 1
+            report.duplicates += "duplicate_of" in result
+
+    with open_for_append(os.path.join(output_dir, "results.jsonl")) as results, \
+            (SerialExecutor() if in_process else ProcessPoolExecutor(max_workers=max_workers)) as executor:
+        try:
+            for path in iter_documents(root):
+                signature = file_signature(path)
+                if manifest.is_done(path, signature):
+                    report.skipped += 1
+                    continue
+                worker = _process_in_process if in_process else _process_in_worker
+                pending[executor.submit(worker, path, ocr, include_text, dedup_dir, top_k)] = (path, signature)
+                if len(pending) >= max_pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    collect(done)
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                collect(done)
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+            manifest.close()
+    report.finished = time.perf_counter()
+    logger.info(f"Ingested {report.processed} documents ({report.duplicates} near-duplicates, "
+                f"{report.skipped} already done, {len(report.failures)} failed) at {report.documents_per_second:.2f} docs/s")
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("root", help="File or directory to ingest")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT_DIR, help="Directory for results and manifest")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--no-ocr", action="store_true", help="Skip OCR of scanned PDF pages")
+    parser.add_argument("--include-text", action="store_true", help="Store extracted text in the results")
+    parser.add_argument("--no-dedup", action="store_true", help="Analyse near-duplicate documents and pages too")
+    parser.add_argument("--top-terms", type=int, default=DEFAULT_TOP_TERMS,
+                        help="Frequent terms kept per schema (0 keeps every distinct word)")
+    parser.add_argument("--metrics", help="Write per-stage metrics here (.prom for Prometheus text, else JSON)")
+    parser.add_argument("--profile", help="Profile the run in this process and write cProfile stats here")
+    args = parser.parse_args(argv)
+    configure_logging()
+
+    with RunProfiler(enabled=bool(args.profile)) as profiler:
+        report = ingest_directory(args.root, args.output, max_workers=args.workers, ocr=not args.no_ocr,
+                                  include_text=args.include_text, in_process=bool(args.profile),
+                                  dedup=not args.no_dedup, top_k=args.top_terms or None)
+    if args.profile:
+        profiler.dump(args.profile)
+        print(profiler.report())
+    if args.metrics:
+        default_registry.write(args.metrics)
+    print(f"Processed {report.processed} documents in {report.elapsed:.1f}s "
+          f"({report.documents_per_second:.2f} docs/s); {report.duplicates} near-duplicates, "
+          f"{report.skipped} already done, "
+          f"{len(report.failures)} failed")
+    for failure in report.failures:
+        print(f"  FAILED {failure['path']}: {failure['error']}")
+    return 1 if report.failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,218 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+CANCELLED = "cancelled"
+INTERRUPTED = "interrupted"
+FINISHED_STATES = (COMPLETED, FAILED, CANCELLED, INTERRUPTED)
+
+
+class JobCancelled(Exception):
+    """Raised inside a job when it has been asked to stop."""
+
+
+class JobStore:
+    """
+    SQLite-backed record of jobs: status, current stage, progress and result.
+
+    Jobs left running by a previous process are marked interrupted on open.
+    """
+
+    def __init__(self, path):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                "id TEXT PRIMARY KEY, name TEXT NOT NULL, status TEXT NOT NULL, "
+                "stage TEXT, progress REAL NOT NULL DEFAULT 0, error TEXT, result TEXT, "
+                "created REAL NOT NULL, updated REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, updated = ? WHERE status IN (?, ?)",
+                (INTERRUPTED, time.time(), QUEUED, RUNNING),
+            )
+
+    def create(self, job_id, name):
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO jobs (id, name, status, created, updated) VALUES (?, ?, ?, ?, ?)",
+                (job_id, name, QUEUED, now, now),
+            )
+
+    def update(self, job_id, **fields):
+        if "result" in fields:
+            fields["result"] = json.dumps(fields["result"])
+        fields["updated"] = time.time()
+        assignments = ", ".join(f"{column} = ?" for column in fields)
+        with self._lock, self._conn:
+            self._conn.execute(f"UPDATE jobs SET {assignments} WHERE id = ?", (*fields.values(), job_id))
+
+    def get(self, job_id):
+        """
+        Returns one job as a dict, or None if unknown.
+
+        Args:
+            job_id (str): Job id.
+
+        Returns:
+            dict or None: id, name, status, stage, progress, error, result, created, updated.
+        """
+        with self._lock:
+            cursor = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,))
+            row = cursor.fetchone()
+        return self._to_dict(cursor, row) if row else None
+
+    def list(self, limit=50):
+        """Returns the most recent jobs first, without their results."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "SELECT id, name, status, stage, progress, error, created, updated "
+                "FROM jobs ORDER BY created DESC LIMIT ?", (limit,))
+            rows = cursor.fetchall()
+        return [self._to_dict(cursor, row) for row in rows]
+
+    @staticmethod
+    def _to_dict(cursor, row):
+        job = dict(zip((column[0] for column in cursor.description), row))
+        if job.get("result") is not None:
+            job["result"] = json.loads(job["result"])
+        return job
+
+    def close(self):
+        self._conn.close()
+
+
+class JobContext:
+    """Handle passed to a running job to report progress and honour cancellation."""
+
+    def __init__(self, job_id, store, cancel_event):
+        self.job_id = job_id
+        self._store = store
+        self._cancel_event = cancel_event
+
+    @property
+    def cancelled(self):
+        return self._cancel_event.is_set()
+
+    def check_cancelled(self):
+        """Raises JobCancelled if the job has been cancelled."""
+        if self._cancel_event.is_set():
+            raise JobCancelled()
+
+    def stage(self, stage, progress):
+        """
+        Records the stage a job has reached; also a cancellation checkpoint.
+
+        Args:
+            stage (str): Stage name shown to users, e.g. 'extract' or 'nlp'.
+            progress (float): Fraction of the job done, 0 to 1.
+        """
+        self.check_cancelled()
+        self._store.update(self.job_id, stage=stage, progress=progress)
+
+
+class JobManager:
+    """
+    Runs pipeline jobs on a thread pool, off the caller's thread.
+
+    Each job function is called as func(context, *args, **kwargs) and its return
+    value, which must be JSON-serializable, is stored as the job result.
+    """
+
+    def __init__(self, store, max_workers=2):
+        self.store = store
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="kg-job")
+        self._cancel_events = {}
+        self._futures = {}
+
+    def submit(self, name, func, *args, **kwargs):
+        """
+        Queues a job.
+
+        Args:
+            name (str): Label shown in job lists.
+            func (callable): Job function taking a JobContext first.
+
+        Returns:
+            str: The new job id.
+        """
+        job_id = uuid.uuid4().hex
+        self.store.create(job_id, name)
+        cancel_event = threading.Event()
+        self._cancel_events[job_id] = cancel_event
+        self._futures[job_id] = self._executor.submit(self._run, job_id, cancel_event, func, args, kwargs)
+        return job_id
+
+    def _run(self, job_id, cancel_event, func, args, kwargs):
+        context = JobContext(job_id, self.store, cancel_event)
+        try:
+            context.check_cancelled()
+            self.store.update(job_id, status=RUNNING)
+            result = func(context, *args, **kwargs)
+            self.store.update(job_id, status=COMPLETED, stage="done", progress=1.0, result=result)
+        except JobCancelled:
+            self.store.update(job_id, status=CANCELLED)
+            logger.info(f"Job {job_id} cancelled")
+        except Exception as e:
+            self.store.update(job_id, status=FAILED, error=str(e))
+            logger.error(f"Job {job_id} failed: {e}")
+        finally:
+            self._cancel_events.pop(job_id, None)
+            self._futures.pop(job_id, None)
+
+    def cancel(self, job_id):
+        """
+        Asks a job to stop.
+
+        Queued jobs never start; running jobs stop at their next stage checkpoint.
+
+        Args:
+            job_id (str): Job id.
+
+        Returns:
+            bool: True if the job was still queued or running.
+        """
+        cancel_event = self._cancel_events.get(job_id)
+        if cancel_event is None:
+            return False
+        cancel_event.set()
+        future = self._futures.get(job_id)
+        if future is not None and future.cancel():
+            self.store.update(job_id, status=CANCELLED)
+            self._cancel_events.pop(job_id, None)
+            self._futures.pop(job_id, None)
+        return True
+
+    def get(self, job_id):
+        return self.store.get(job_id)
+
+    def list_jobs(self, limit=50):
+        return self.store.list(limit)
+
+    def wait(self, job_id, timeout=None):
+        """Blocks until a job finishes (mainly for scripts and tests)."""
+        future = self._futures.get(job_id)
+        if future is not None:
+            future.result(timeout)
+        return self.get(job_id)
+
+    def shutdown(self, wait=True):
+        for cancel_event in list(self._cancel_events.values()):
+            cancel_event.set()
+        self._executor.shutdown(wait=wait, cancel_futures=True)
@@ -0,0 +1,205 @@
+import logging
+import os
+import shutil
+import tempfile
+
+from pipeline.metrics import EXTRACT, stage
+
+logger = logging.getLogger(__name__)
+
+# Uploads above this size are processed in large-file mode
+LARGE_FILE_BYTES = int(os.environ.get("KG_CONSTRUCTION_LARGE_FILE_MB", "50")) * 1024 * 1024
+DEFAULT_COPY_CHUNK = 1024 * 1024
+DEFAULT_PREVIEW_CHARS = 20000
+DEFAULT_MAX_CHUNK_CHARS = 100000
+# PDF pages held in memory at once while their scanned pages are OCR'd
+PDF_PAGE_WINDOW = 32
+
+IMAGE_TYPES = ("png", "jpg", "jpeg")
+DOCX_TYPES = ("docx", "vnd.openxmlformats-officedocument.wordprocessingml.document")
+
+
+class SpooledUpload:
+    """
+    An upload copied to a temporary file in fixed-size chunks.
+
+    Readers then open the file by path (PyPDF2, zipfile and PIL all seek
+    within it), so the document never has to exist as one bytes object.
+    The file is removed on close.
+    """
+
+    def __init__(self, source, suffix="", directory=None, chunk_size=DEFAULT_COPY_CHUNK):
+        fd, self.path = tempfile.mkstemp(suffix=suffix, dir=directory)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                if hasattr(source, "seek"):
+                    source.seek(0)
+                shutil.copyfileobj(source, f, chunk_size)
+        except Exception:
+            os.remove(self.path)
+            raise
+        self.size = os.path.getsize(self.path)
+
+    def close(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+        return False
+
+
+class TextSpool:
+    """
+    Extracted text appended to a temporary file, with a bounded in-memory preview.
+
+    The text is read back in sentence-aligned chunks, so neither extraction nor
+    NLP ever holds more than a couple of chunks of it.
+    """
+
+    def __init__(self, directory=None, preview_chars=DEFAULT_PREVIEW_CHARS):
+        self._file = tempfile.TemporaryFile(mode="w+", encoding="utf-8", dir=directory)
+        self.preview_chars = preview_chars
+        self._preview = []
+        self._preview_length = 0
+        self.chars = 0
+
+    def write(self, text):
+        """Appends a piece of text (a page, paragraph or line)."""
+        if not text:
+            return
+        self._file.write(text)
+        self.chars += len(text)
+        if self._preview_length < self.preview_chars:
+            piece = text[:self.preview_chars - self._preview_length]
+            self._preview.append(piece)
+            self._preview_length += len(piece)
+
+    @property
+    def preview(self):
+        """The first preview_chars characters of the text."""
+        return "".join(self._preview)
+
+    @property
+    def truncated(self):
+        return self.chars > self._preview_length
+
+    def iter_chunks(self, max_chars=DEFAULT_MAX_CHUNK_CHARS):
+        """
+        Yields the spooled text in chunks of at most max_chars, cut at sentence boundaries.
+
+        Args:
+            max_chars (int): Maximum chunk length in characters.
+
+        Yields:
+            str: Consecutive chunks of the text.
+        """
+        from entity_extraction.bulk_extraction import chunk_text
+        self._file.flush()
+        self._file.seek(0)
+        carry = ""
+        for block in iter(lambda: self._file.read(max_chars), ""):
+            chunks = list(chunk_text(carry + block, max_chars))
+            # The last chunk may end mid-sentence, so it is continued by the next block
+            carry = chunks.pop()
+            yield from chunks
+        if carry:
+            yield carry
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+        return False
+
+
+def _spool_pdf(path, spool, ocr_engine, max_workers):
+    from multi_format_processing.pdf_extraction import iter_pdf_pages
+
+    def flush(window, first_page):
+        if ocr_engine is not None and any(not page.strip() for page in window):
+            scanned = {first_page + i for i, page in enumerate(window) if not page.strip()}
+            for page_number, text in ocr_engine.ocr_pdf_pages(path, sorted(scanned)).items():
+                window[page_number - first_page] = text
+        for page in window:
+            if page:
+                spool.write(page + "\n")
+
+    window = []
+    first_page = 0
+    for page in iter_pdf_pages(path, max_workers=max_workers):
+        window.append(page)
+        if len(window) == PDF_PAGE_WINDOW:
+            flush(window, first_page)
+            first_page += len(window)
+            window = []
+    flush(window, first_page)
+
+
+def extract_large_file(path, file_type, spool, ocr_engine=None, max_workers=None):
+    """
+    Extracts the text of a spooled upload into a TextSpool, piece by piece.
+
+    PDFs are read page by page from the file, with scanned pages OCR'd a
+    window at a time; DOCX is streamed paragraph by paragraph; images are
+    opened lazily from the file and downscaled before OCR.
+
+    Args:
+        path (str): Path of the spooled upload.
+        file_type (str): MIME subtype of the upload, as used by the app.
+        spool (TextSpool): Receives the extracted text.
+        ocr_engine (OcrEngine): Engine for images and scanned PDF pages; scanned
+            PDF pages are skipped when None.
+        max_workers (int): Worker processes for PDF page decoding.
+
+    Returns:
+        TextSpool: The spool, for chaining.
+
+    Raises:
+        ValueError: If the file type is not supported.
+    """
+    with stage(EXTRACT, bytes=os.path.getsize(path), items=1):
+        if file_type == "pdf":
+            _spool_pdf(path, spool, ocr_engine, max_workers)
+        elif file_type in DOCX_TYPES:
+            from multi_format_processing.streaming_extraction import iter_docx_text
+            for line in iter_docx_text(path):
+                spool.write(line + "\n")
+        elif file_type in IMAGE_TYPES:
+            from multi_format_processing.ocr_engine import OcrEngine
+            spool.write((ocr_engine or OcrEngine(max_workers=1)).ocr_image(path)["text"])
+        else:
+            raise ValueError(f"Unsupported file type: {file_type}")
+    logger.info(f"Extracted {spool.chars} characters from {os.path.getsize(path)} bytes")
+    return spool
+
+
+def extract_entities_chunked(spool, entity_extractor, max_chunk_chars=DEFAULT_MAX_CHUNK_CHARS, batch_size=4):
+    """
+    Runs entity and relationship extraction over the spooled text chunk by chunk.
+
+    Args:
+        spool (TextSpool): Extracted text.
+        entity_extractor (EntityExtractor): The app's extractor (its extract_batch is used).
+        max_chunk_chars (int): Characters per parse.
+        batch_size (int): Chunks per nlp.pipe batch.
+
+    Returns:
+        tuple: (entities dict, relationships list) for the whole text.
+    """
+    from entity_extraction.bulk_extraction import merge_entities
+    entities = {}
+    relationships = []
+    chunks = ((index, chunk) for index, chunk in enumerate(spool.iter_chunks(max_chunk_chars)))
+    for _, chunk_entities, chunk_relationships in entity_extractor.extract_batch(
+            chunks, batch_size=batch_size, max_chunk_chars=max_chunk_chars):
+        merge_entities(entities, chunk_entities)
+        relationships.extend(chunk_relationships)
+    return {k: list(v) for k, v in entities.items()}, relationships
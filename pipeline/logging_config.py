@@ -0,0 +1,29 @@
+import logging
+import os
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+_configured = False
+
+
+def configure_logging(level=None, log_file=None):
+    """
+    Sets up root logging once for an entry point (app, CLI or script).
+
+    Library modules only create loggers; this is the single place handlers
+    are installed, so importing several modules no longer races to configure
+    logging with different formats. Later calls are no-ops.
+
+    Args:
+        level (str or int): Log level; KG_CONSTRUCTION_LOG_LEVEL or INFO if omitted.
+        log_file (str): Also write the log to this file.
+    """
+    global _configured
+    if _configured:
+        return
+    level = level or os.environ.get("KG_CONSTRUCTION_LOG_LEVEL", "INFO")
+    handlers = [logging.StreamHandler()]
+    if log_file:
+        handlers.append(logging.FileHandler(log_file))
+    logging.basicConfig(level=level, format=LOG_FORMAT, handlers=handlers)
+    _configured = True
@@ -0,0 +1,194 @@
+import cProfile
+import io
+import json
+import logging
+import pstats
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+# Stage names used across the pipeline
+EXTRACT = "extract"
+OCR = "ocr"
+DEDUP = "dedup"
+NLP_PARSE = "nlp_parse"
+RELATIONSHIPS = "relationships"
+GRAPH_BUILD = "graph_build"
+ANALYTICS = "analytics"
+SERIALIZE = "serialize"
+VISUALIZE = "visualize"
+
+FIELDS = ("calls", "errors", "wall_seconds", "cpu_seconds", "bytes", "items")
+
+
+class StageRecord:
+    """Mutable handle yielded by MetricsRegistry.stage for counts known only at the end."""
+
+    def __init__(self, bytes=0, items=0):
+        self.bytes = bytes
+        self.items = items
+
+
+class MetricsRegistry:
+    """
+    Thread-safe per-stage totals of wall time, CPU time, bytes and item counts.
+
+    CPU time is that of the calling thread (time.thread_time), so stages that
+    run in job or OCR threads are measured correctly; work done in worker
+    processes is not included.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stages = {}
+
+    @contextmanager
+    def stage(self, name, bytes=0, items=0):
+        """
+        Times a block of code as one call of a stage.
+
+        Args:
+            name (str): Stage name, e.g. EXTRACT.
+            bytes (int): Input bytes, if known up front.
+            items (int): Items processed, if known up front.
+
+        Yields:
+            StageRecord: Set its bytes/items inside the block to report them.
+        """
+        record = StageRecord(bytes, items)
+        wall_start = time.perf_counter()
+        cpu_start = time.thread_time()
+        failed = False
+        try:
+            yield record
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            self.record(name, time.perf_counter() - wall_start, time.thread_time() - cpu_start,
+                        record.bytes, record.items, failed)
+
+    def record(self, name, wall_seconds, cpu_seconds=0.0, bytes=0, items=0, failed=False):
+        """Adds one already-measured call to a stage's totals."""
+        with self._lock:
+            totals = self._stages.setdefault(name, dict.fromkeys(FIELDS, 0))
+            totals["calls"] += 1
+            totals["errors"] += int(failed)
+            totals["wall_seconds"] += wall_seconds
+            totals["cpu_seconds"] += cpu_seconds
+            totals["bytes"] += bytes
+            totals["items"] += items
+
+    def merge(self, snapshot):
+        """Adds totals from another registry's snapshot, e.g. one from a worker process."""
+        with self._lock:
+            for name, totals in snapshot.items():
+                merged = self._stages.setdefault(name, dict.fromkeys(FIELDS, 0))
+                for field in FIELDS:
+                    merged[field] += totals.get(field, 0)
+
+    def snapshot(self):
+        """Returns a copy of the totals: stage name -> field -> value."""
+        with self._lock:
+            return {name: dict(totals) for name, totals in self._stages.items()}
+
+    def to_json(self, indent=2):
+        return json.dumps(self.snapshot(), indent=indent, sort_keys=True)
+
+    def to_prometheus(self, prefix="kg_pipeline"):
+        """
+        Renders the totals in the Prometheus text exposition format.
+
+        Returns:
+            str: One counter family per field, labelled by stage.
+        """
+        snapshot = self.snapshot()
+        units = {"wall_seconds": "seconds", "cpu_seconds": "seconds", "bytes": "bytes"}
+        lines = []
+        for field in FIELDS:
+            metric = f"{prefix}_stage_{field}_total"
+            lines.append(f"# HELP {metric} Stage {field.replace('_', ' ')} ({units.get(field, 'count')}).")
+            lines.append(f"# TYPE {metric} counter")
+            for name in sorted(snapshot):
+                lines.append(f'{metric}{{stage="{name}"}} {snapshot[name][field]}')
+        return "\n".join(lines) + "\n"
+
+    def write(self, path):
+        """Writes the totals to path: Prometheus text for *.prom, JSON otherwise."""
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(self.to_prometheus() if path.endswith(".prom") else self.to_json())
+
+    def reset(self):
+        with self._lock:
+            self._stages.clear()
+
+
+default_registry = MetricsRegistry()
+
+
+def stage(name, bytes=0, items=0):
+    """Times a block as a call of a stage in the default registry."""
+    return default_registry.stage(name, bytes, items)
+
+
+class RunProfiler:
+    """
+    Optional cProfile and tracemalloc hook around one run.
+
+    Disabled profilers cost nothing, so call sites can always wrap a run and
+    let a CLI flag or app checkbox decide.
+
+    Usage:
+        with RunProfiler(enabled=args.profile) as profiler:
+            run()
+        print(profiler.report())
+    """
+
+    def __init__(self, enabled=True, memory=True, top=25):
+        self.enabled = enabled
+        self.memory = memory
+        self.top = top
+        self.profile = None
+        self.peak_memory = None
+        self.top_allocations = []
+        self._started_tracemalloc = False
+
+    def __enter__(self):
+        if self.enabled:
+            if self.memory and not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracemalloc = True
+            self.profile = cProfile.Profile()
+            self.profile.enable()
+        return self
+
+    def __exit__(self, *exc_info):
+        if not self.enabled:
+            return False
+        self.profile.disable()
+        if self.memory and tracemalloc.is_tracing():
+            self.peak_memory = tracemalloc.get_traced_memory()[1]
+            snapshot = tracemalloc.take_snapshot()
+            self.top_allocations = [str(stat) for stat in snapshot.statistics("lineno")[:self.top]]
+            if self._started_tracemalloc:
+                tracemalloc.stop()
+        return False
+
+    def report(self, sort="cumulative"):
+        """Returns the top functions and allocations as text ('' when disabled)."""
+        if self.profile is None:
+            return ""
+        out = io.StringIO()
+        pstats.Stats(self.profile, stream=out).sort_stats(sort).print_stats(self.top)
+        if self.peak_memory is not None:
+            out.write(f"Peak traced memory: {self.peak_memory / 1e6:.1f} MB\n")
+            out.write("\n".join(self.top_allocations) + "\n")
+        return out.getvalue()
+
+    def dump(self, path):
+        """Writes raw cProfile stats (readable with pstats or snakeviz)."""
+        if self.profile is not None:
+            self.profile.dump_stats(path)
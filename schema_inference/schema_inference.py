@@ -1,19 +1,40 @@
 import os
 import sys
-from multi_format_processing.extract_text import extract_text_from_pdf
-from .schema_inference_logic import infer_schema
+from multi_format_processing.extract_text import extract_text_from_file
+from pipeline.dedup import PAGE_BREAK, DuplicateIndex
+from pipeline.ingest import iter_documents
+from pipeline.logging_config import configure_logging
+from .schema_inference_logic import infer_schema, infer_schema_streaming
 import logging
 
-# Set up logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-def process_dataset(file_path):
+def _extract_text(path, cache=None, page_break="\n"):
+    """Extracts document text, reusing the cached text for already-seen file content."""
+    if cache is None:
+        return extract_text_from_file(path, page_break=page_break)
+    key = cache.key_for_file(path) + (":pages" if page_break == PAGE_BREAK else "")
+    record = cache.get(key)
+    if record is not None:
+        logger.info(f"Cache hit for {path}")
+        return record["text"]
+    text = extract_text_from_file(path, page_break=page_break)
+    if text:
+        cache.put(key, {"text": text})
+    return text
+
+
+def process_dataset(file_path, cache=None, dedup=None, top_k=None):
     """
     Processes a file or directory of files to infer schemas.
 
     Args:
         file_path (str): Path to the file or directory.
+        cache (ExtractionCache): Optional cache of extracted text keyed by file content.
+        dedup (DuplicateIndex): Optional near-duplicate index; duplicate documents
+            are skipped and repeated pages dropped before schema inference.
+        top_k (int): Keep only this many frequent terms per schema, counted in
+            bounded memory; None keeps every distinct word.
 
     Returns:
         dict: Inferred schemas for each document.
@@ -21,37 +42,34 @@ def process_dataset(file_path):
     schemas = {}
 
     logger.info(f"Processing: {file_path}")
-    try:
-        if os.path.isfile(file_path):
-            text = extract_text_from_pdf(file_path)
+    if not os.path.exists(file_path):
+        logger.error(f"Invalid path: {file_path}")
+        return schemas
+
+    # Recurses into subdirectories; a failing document does not stop the others
+    for path in iter_documents(file_path):
+        try:
+            text = _extract_text(path, cache, PAGE_BREAK if dedup is not None else "\n")
+            if text and dedup is not None:
+                text, duplicate_of, _ = dedup.deduplicate(text, path)
+                if duplicate_of is not None:
+                    continue
             if text:
-                schema = infer_schema(text)
-                schemas[file_path] = schema
+                schemas[path] = (infer_schema(text) if top_k is None
+                                 else infer_schema_streaming(text.splitlines(keepends=True), top_k))
             else:
-                logger.warning(f"No text extracted from {file_path}. Skipping.")
-        elif os.path.isdir(file_path):
-            for filename in os.listdir(file_path):
-                file_ext = filename.lower().split('.')[-1]
-                if file_ext == "pdf":
-                    full_path = os.path.join(file_path, filename)
-                    text = extract_text_from_pdf(full_path)
-                    if text:
-                        schema = infer_schema(text)
-                        schemas[full_path] = schema
-                    else:
-                        logger.warning(f"No text extracted from {full_path}. Skipping.")
-        else:
-            logger.error(f"Invalid path: {file_path}")
-
-    except Exception as e:
-        logger.error(f"Error processing {file_path}: {e}")
+                logger.warning(f"No text extracted from {path}. Skipping.")
+        except Exception as e:
+            logger.error(f"Error processing {path}: {e}")
 
     return schemas
 
 
 if __name__ == "__main__":
-    dataset_dir = "dataset_example"  # Change to your dataset directory
-    schemas = process_dataset(dataset_dir)
+    configure_logging()
+    # For large corpora use `python -m pipeline.ingest`, which runs in parallel and can resume
+    dataset_dir = sys.argv[1] if len(sys.argv) > 1 else "dataset_example"
+    schemas = process_dataset(dataset_dir, dedup=DuplicateIndex())
 
     if schemas:
         for doc, schema in schemas.items():
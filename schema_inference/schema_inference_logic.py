@@ -1,7 +1,5 @@
 import logging
 
-# Set up logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 def infer_schema(text):
@@ -35,3 +33,183 @@ def infer_schema(text):
     except Exception as e:
         logger.error(f"Error inferring schema: {e}")
         raise RuntimeError(f"Error inferring schema: {e}")
+
+
+class TopKCounter:
+    """
+    Bounded frequent-term counter (Space-Saving with batched eviction).
+
+    Keeps at most 2 * k terms; when full it prunes back to the k most frequent
+    and raises the floor to the largest pruned count. No term outside the
+    table can have been seen more than floor times, so a term entering the
+    table starts at floor + 1 with floor as its error. Every estimate is an
+    upper bound on the true count and exceeds it by at most the term's error.
+    Counters from different shards can be merged.
+    """
+
+    def __init__(self, k=1000):
+        self.k = k
+        self.counts = {}
+        # Per-term overestimate bound; terms without an entry are exact
+        self.errors = {}
+        self.floor = 0
+
+    def update(self, terms):
+        for term in terms:
+            count = self.counts.get(term)
+            if count is not None:
+                self.counts[term] = count + 1
+                continue
+            self.counts[term] = self.floor + 1
+            if self.floor:
+                self.errors[term] = self.floor
+            if len(self.counts) > 2 * self.k:
+                self._prune()
+
+    def _prune(self):
+        ranked = sorted(self.counts.items(), key=lambda item: item[1], reverse=True)
+        if len(ranked) > self.k:
+            self.floor = max(self.floor, ranked[self.k][1])
+        self.counts = dict(ranked[:self.k])
+        self.errors = {term: error for term, error in self.errors.items() if term in self.counts}
+
+    def merge(self, other):
+        # A term missing from one counter may have been seen up to that counter's floor times there
+        for term in self.counts.keys() - other.counts.keys():
+            self.counts[term] += other.floor
+            self.errors[term] = self.errors.get(term, 0) + other.floor
+        for term, count in other.counts.items():
+            if term in self.counts:
+                self.counts[term] += count
+                error = self.errors.get(term, 0) + other.errors.get(term, 0)
+            else:
+                self.counts[term] = count + self.floor
+                error = other.errors.get(term, 0) + self.floor
+            if error:
+                self.errors[term] = error
+        self.floor += other.floor
+        if len(self.counts) > self.k:
+            self._prune()
+        return self
+
+    def error(self, term):
+        """Returns how much the count of a term may exceed its true count."""
+        return self.errors.get(term, 0) if term in self.counts else self.floor
+
+    def most_common(self, n=None):
+        ranked = sorted(self.counts.items(), key=lambda item: item[1], reverse=True)
+        return ranked[:n or self.k]
+
+
+class StreamingSchemaInference:
+    """
+    Infers a schema from text chunks with running counters.
+
+    Memory depends on top_k rather than on the input size. Words split across
+    chunk boundaries are joined before counting, and partial results from
+    different shards can be combined with merge().
+    """
+
+    def __init__(self, top_k=1000, sample_chars=100):
+        self.top_k = top_k
+        self.sample_chars = sample_chars
+        self.word_count = 0
+        self.total_word_length = 0
+        self.sample_text = ""
+        self.terms = TopKCounter(top_k)
+        self._carry = ""
+
+    def update(self, chunk):
+        """
+        Consumes one chunk of text.
+
+        Args:
+            chunk (str): Next piece of the document.
+        """
+        if len(self.sample_text) < self.sample_chars:
+            self.sample_text += chunk[:self.sample_chars - len(self.sample_text)]
+        text = self._carry + chunk
+        words = text.split()
+        # A trailing word may continue in the next chunk
+        if words and not text[-1].isspace():
+            self._carry = words.pop()
+        else:
+            self._carry = ""
+        self._count(words)
+
+    def _count(self, words):
+        self.word_count += len(words)
+        self.total_word_length += sum(len(word) for word in words)
+        self.terms.update(words)
+
+    def finish(self):
+        """Counts the word held back from the last chunk."""
+        if self._carry:
+            self._count([self._carry])
+            self._carry = ""
+        return self
+
+    def merge(self, other):
+        """
+        Adds the counters of another (finished) shard into this one.
+
+        Args:
+            other (StreamingSchemaInference): Shard to merge.
+
+        Returns:
+            StreamingSchemaInference: self
+        """
+        self.finish()
+        other.finish()
+        self.word_count += other.word_count
+        self.total_word_length += other.total_word_length
+        self.terms.merge(other.terms)
+        if len(self.sample_text) < self.sample_chars:
+            self.sample_text += other.sample_text[:self.sample_chars - len(self.sample_text)]
+        return self
+
+    def schema(self):
+        """
+        Returns the schema in the same shape as infer_schema.
+
+        'unique_entities' holds the top_k most frequent terms instead of every
+        distinct word; 'top_terms' adds their estimated counts, each at most
+        'count_error_bound' above the true count (and never below it).
+
+        Returns:
+            dict: Inferred schema.
+        """
+        self.finish()
+        if not self.word_count:
+            raise RuntimeError("Error inferring schema: No text extracted from the document.")
+        top_terms = self.terms.most_common(self.top_k)
+        return {
+            "word_count": self.word_count,
+            "unique_entities": [term for term, _ in top_terms],
+            "average_word_length": self.total_word_length / self.word_count,
+            "sample_text": self.sample_text,
+            "top_terms": top_terms,
+            "count_error_bound": max((self.terms.error(term) for term, _ in top_terms), default=0)
+        }
+
+
+def infer_schema_streaming(chunks, top_k=1000):
+    """
+    Infers a schema from an iterable of text chunks in bounded memory.
+
+    Chunks are concatenated as given, so page texts should keep a trailing
+    separator, e.g. (page + "\n" for page in iter_pdf_pages(path)).
+
+    Args:
+        chunks (iterable): Text chunks, e.g. pages from iter_pdf_pages.
+        top_k (int): Number of frequent terms kept.
+
+    Returns:
+        dict: Inferred schema (see StreamingSchemaInference.schema).
+    """
+    inference = StreamingSchemaInference(top_k=top_k)
+    for chunk in chunks:
+        inference.update(chunk)
+    schema = inference.schema()
+    logger.info("Schema inferred successfully.")
+    return schema
@@ -0,0 +1,42 @@
+import unittest
+from benchmarks.suite import WORDS_PER_DOCUMENT, find_regressions, synthetic_corpus
+
+THRESHOLDS = {"throughput_drop": 0.2, "memory_growth": 0.25, "stages": {"visualize_graph": {"throughput_drop": 0.5}}}
+
+
+def measurement(throughput, peak_mb):
+    return {"throughput": throughput, "peak_mb": peak_mb, "unit": "items"}
+
+
+class TestBenchmarkSuite(unittest.TestCase):
+
+    def test_synthetic_corpus_is_deterministic_and_scales(self):
+        small, again, large = synthetic_corpus(1), synthetic_corpus(1), synthetic_corpus(3)
+        self.assertEqual(small, again)
+        self.assertEqual(len(small["documents"]), 1)
+        self.assertEqual(len(large["documents"]), 3)
+        self.assertGreaterEqual(len(small["documents"][0][1].split()), WORDS_PER_DOCUMENT)
+        self.assertEqual(len(large["entities"]["Person"]), 3 * len(small["entities"]["Person"]))
+        for rel in small["relationships"]:
+            self.assertIn(rel["subject"], small["documents"][0][1])
+
+    def test_find_regressions(self):
+        baseline = {
+            "infer_schema@synthetic_1x": measurement(100.0, 10.0),
+            "visualize_graph@synthetic_1x": measurement(100.0, 10.0),
+            "build_knowledge_graph@synthetic_1x": measurement(100.0, 10.0),
+        }
+        results = {
+            "infer_schema@synthetic_1x": measurement(70.0, 10.0),
+            "visualize_graph@synthetic_1x": measurement(70.0, 10.0),
+            "build_knowledge_graph@synthetic_1x": measurement(95.0, 20.0),
+            "new_stage@synthetic_1x": measurement(1.0, 1.0),
+        }
+        regressions = find_regressions(results, baseline, THRESHOLDS)
+        self.assertEqual(len(regressions), 2)
+        self.assertTrue(regressions[0].startswith("build_knowledge_graph@synthetic_1x: peak memory"))
+        self.assertTrue(regressions[1].startswith("infer_schema@synthetic_1x: throughput"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+import spacy
+from entity_extraction.bulk_extraction import BulkExtractor, chunk_text
+
+
+def make_nlp():
+    nlp = spacy.blank("en")
+    ruler = nlp.add_pipe("entity_ruler")
+    ruler.add_patterns([
+        {"label": "ORG", "pattern": "Reserve Bank"},
+        {"label": "GPE", "pattern": "India"},
+    ])
+    return nlp
+
+
+class TestChunkText(unittest.TestCase):
+
+    def test_chunks_cut_at_sentence_boundaries(self):
+        text = "One two. Three four five. Six."
+        self.assertEqual(list(chunk_text(text, 20)), ["One two. ", "Three four five. ", "Six."])
+
+    def test_chunks_reassemble_to_text(self):
+        text = "A sentence without an end " * 50
+        chunks = list(chunk_text(text, 64))
+        self.assertEqual("".join(chunks), text)
+        self.assertTrue(all(len(chunk) <= 64 for chunk in chunks))
+
+    def test_short_text_is_one_chunk(self):
+        self.assertEqual(list(chunk_text("Short.", 100)), ["Short."])
+
+    def test_invalid_size(self):
+        with self.assertRaises(ValueError):
+            list(chunk_text("text", 0))
+
+
+class TestBulkExtractor(unittest.TestCase):
+
+    def test_streams_one_result_per_document(self):
+        extractor = BulkExtractor(nlp=make_nlp(), batch_size=2, max_chunk_chars=30)
+        documents = [
+            ("a", "The Reserve Bank met. It sets rates in India. The Reserve Bank spoke."),
+            ("b", ""),
+            ("c", "India grew."),
+        ]
+        results = list(extractor.extract(iter(documents)))
+        self.assertEqual([doc_id for doc_id, _, _ in results], ["a", "b", "c"])
+        self.assertEqual(results[0][1], {"Organization": ["Reserve Bank"], "Location": ["India"]})
+        self.assertEqual(results[1][1], {})
+        self.assertEqual(results[2][1], {"Location": ["India"]})
+
+if __name__ == "__main__":
+    unittest.main()
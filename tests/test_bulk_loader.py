@@ -0,0 +1,54 @@
+import io
+import unittest
+from rdflib import BNode, Dataset, Graph, Literal, URIRef, XSD
+from graph_population.bulk_loader import (EX, UriInterner, bulk_add, extraction_triples, nt_term, term_from_n3,
+                                          write_nquads, write_ntriples)
+
+
+class TestBulkLoader(unittest.TestCase):
+
+    def test_interner_reuses_uris(self):
+        interner = UriInterner()
+        first = interner("Reserve Bank")
+        self.assertIs(interner("Reserve Bank"), first)
+        self.assertEqual(first, URIRef(EX["Reserve_Bank"]))
+        self.assertEqual(len(interner), 1)
+
+    def test_bulk_add_in_batches(self):
+        entities = {"Organization": ["Reserve Bank", "SEBI"], "Location": ["India"]}
+        relationships = [{"subject": "SEBI", "predicate": "regulates", "object": "markets"}]
+        g = Graph()
+        count = bulk_add(g, extraction_triples(entities, relationships), batch_size=2)
+        self.assertEqual(count, 4)
+        self.assertEqual(len(g), 4)
+        self.assertIn((EX["SEBI"], EX["regulates"], EX["markets"]), g)
+
+    def test_ntriples_round_trip(self):
+        g = Graph()
+        g.add((EX["Paris"], EX["name"], Literal('The "City"\nof Light', lang="en")))
+        g.add((EX["Paris"], EX["population"], Literal(2100000)))
+        g.add((EX["Paris"], EX["country"], EX["France"]))
+        out = io.StringIO()
+        self.assertEqual(write_ntriples(g, out, chunk_size=1), 3)
+        parsed = Graph().parse(data=out.getvalue(), format="nt")
+        self.assertEqual(set(parsed), set(g))
+
+    def test_term_from_n3_round_trip(self):
+        terms = [Literal("C:\\new\\x1"), Literal('a\nb"'), Literal('x"""y"'), Literal("tab\tcafé"),
+                 Literal("chat", lang="fr"), Literal(10), Literal("2020-01-01", datatype=XSD.date),
+                 URIRef("http://example.org/a%20b"), BNode("b1")]
+        for term in terms:
+            for text in (term.n3(), nt_term(term)):
+                parsed = term_from_n3(text)
+                self.assertEqual((type(parsed), parsed), (type(term), term), text)
+
+    def test_nquads_keep_graph_names(self):
+        ds = Dataset()
+        ds.graph(URIRef("urn:doc:1")).add((EX["a"], EX["b"], EX["c"]))
+        out = io.StringIO()
+        write_nquads(ds, out)
+        parsed = Dataset().parse(data=out.getvalue(), format="nquads")
+        self.assertIn((EX["a"], EX["b"], EX["c"], URIRef("urn:doc:1")), set(parsed.quads()))
+
+if __name__ == "__main__":
+    unittest.main()
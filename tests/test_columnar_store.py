@@ -0,0 +1,72 @@
+import os
+import tempfile
+import unittest
+from rdflib import Graph, Literal, Namespace, RDF
+from graph_population.columnar_store import ColumnarTripleStore
+
+EX = Namespace("http://example.org/")
+
+
+def sample_graph():
+    graph = Graph()
+    graph.add((EX.London, RDF.type, EX.GPE))
+    graph.add((EX.Paris, RDF.type, EX.GPE))
+    graph.add((EX.Apple, RDF.type, EX.ORG))
+    graph.add((EX.London, EX.population, Literal("9 million")))
+    graph.add((EX.London, EX.twinned_with, EX.Paris))
+    graph.add((EX.Apple, EX.located_in, EX.London))
+    graph.add((EX.Apple, EX.label, Literal("Äpple", lang="sv")))
+    return graph
+
+
+class TestColumnarTripleStore(unittest.TestCase):
+
+    def setUp(self):
+        self.graph = sample_graph()
+        self.store = ColumnarTripleStore.from_graph(self.graph)
+
+    def test_round_trip(self):
+        self.assertEqual(len(self.store), len(self.graph))
+        self.assertEqual(set(self.store.triples()), set(self.graph))
+        self.assertEqual(set(self.store.to_graph()), set(self.graph))
+
+    def test_backslash_literals_round_trip(self):
+        # rdflib.util.from_n3 fails on "\\x" sequences
+        self.graph.add((EX.Apple, EX.path, Literal("C:\\new\\x1")))
+        self.graph.add((EX.Apple, EX.note, Literal('say "hi"\nthere')))
+        store = ColumnarTripleStore.from_graph(self.graph)
+        self.assertEqual(set(store.triples()), set(self.graph))
+        self.assertEqual(set(store.to_graph()), set(self.graph))
+
+    def test_histograms(self):
+        self.assertEqual(self.store.type_counts(), [(EX.GPE, 2), (EX.ORG, 1)])
+        self.assertEqual(dict(self.store.predicate_histogram())[RDF.type], 3)
+        degrees = dict(self.store.degree_counts())
+        self.assertEqual(degrees[EX.London], 4)
+        self.assertNotIn(Literal("9 million"), degrees)
+        self.assertEqual(dict(self.store.degree_counts(include_literals=True))[Literal("9 million")], 1)
+        self.assertEqual(len(self.store.degree_counts(top=2)), 2)
+
+    def test_parquet_round_trip(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "graph.parquet")
+            self.store.write_parquet(path)
+            loaded = ColumnarTripleStore.read_parquet(path)
+        self.assertEqual(set(loaded.triples()), set(self.graph))
+        self.assertEqual(loaded.type_counts(), self.store.type_counts())
+
+    def test_arrow_import_of_plain_strings(self):
+        import pyarrow as pa
+        table = pa.table({"s": ["<http://example.org/A>"], "p": ["<http://example.org/b>"], "o": ['"x"']})
+        store = ColumnarTripleStore.from_arrow(table)
+        self.assertEqual(list(store.triples()), [(EX.A, EX.b, Literal("x"))])
+
+    def test_empty_store(self):
+        store = ColumnarTripleStore.from_graph(Graph())
+        self.assertEqual(len(store), 0)
+        self.assertEqual(store.degree_counts(), [])
+        self.assertEqual(len(ColumnarTripleStore.from_arrow(store.to_arrow())), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import unittest
+from rdflib import Graph, Literal, Namespace, RDF
+from multi_format_processing.conflict_resolution import (
+    CONFIDENCE, VOTE, ConflictResolver, literal_key, resolve_conflicts, resolve_type_conflicts,
+)
+
+EX = Namespace("http://example.org/")
+
+
+class TestConflictResolution(unittest.TestCase):
+
+    def test_resolve_conflicts_removes_listed_entities(self):
+        schema = resolve_conflicts({"entities": ["A", "B", "C"]}, ["B", "D"])
+        self.assertEqual(schema["entities"], ["A", "C"])
+
+    def test_duplicate_literals_collapse(self):
+        self.assertEqual(literal_key(Literal("UK ")), literal_key(Literal("uk")))
+        self.assertEqual(literal_key(Literal(9)), literal_key(Literal(9.0)))
+        graph = Graph()
+        graph.add((EX.London, EX.country, Literal("UK")))
+        graph.add((EX.London, EX.country, Literal("  UK")))
+        resolved, conflicts = ConflictResolver().resolve_graph(graph)
+        self.assertEqual(len(resolved), 1)
+        self.assertEqual(conflicts, [])
+
+    def test_vote_picks_majority_value(self):
+        claims = [
+            (EX.London, EX.population, Literal("9 million"), "a"),
+            (EX.London, EX.population, Literal("9 million"), "b"),
+            (EX.London, EX.population, Literal("8 million"), "c"),
+            (EX.London, EX.country, Literal("UK"), "a"),
+        ]
+        kept, conflicts = ConflictResolver(rules={EX.population: VOTE}).resolve(claims)
+        self.assertIn((EX.London, EX.population, Literal("9 million")), kept)
+        self.assertNotIn((EX.London, EX.population, Literal("8 million")), kept)
+        self.assertEqual(len(kept), 2)
+        self.assertEqual(conflicts[0]["dropped"], [Literal("8 million")])
+
+    def test_confidence_prefers_trusted_source(self):
+        claims = [
+            (EX.London, EX.population, Literal("9 million"), "a"),
+            (EX.London, EX.population, Literal("9 million"), "b"),
+            (EX.London, EX.population, Literal("8 million"), "census"),
+        ]
+        resolver = ConflictResolver(rules={EX.population: CONFIDENCE},
+                                    source_confidence={"a": 0.2, "b": 0.2, "census": 0.9})
+        kept, _ = resolver.resolve(claims)
+        self.assertEqual(kept, [(EX.London, EX.population, Literal("8 million"))])
+
+    def test_type_conflict_between_entity_classes(self):
+        claims = [
+            (EX.Apple, RDF.type, EX.Organization, "a"),
+            (EX.Apple, RDF.type, EX.Organization, "b"),
+            (EX.Apple, RDF.type, EX.Person, "c"),
+            (EX.Apple, RDF.type, EX.Entity, "c"),
+        ]
+        resolver = ConflictResolver(entity_classes={EX.Organization, EX.Person})
+        kept, conflicts = resolver.resolve(claims)
+        self.assertEqual(set(kept), {(EX.Apple, RDF.type, EX.Organization), (EX.Apple, RDF.type, EX.Entity)})
+        self.assertEqual(len(conflicts), 1)
+
+    def test_unknown_policy_rejected(self):
+        with self.assertRaises(ValueError):
+            ConflictResolver(rules={EX.population: "latest"})
+
+    def test_resolve_type_conflicts_across_documents(self):
+        merged, conflicts = resolve_type_conflicts({
+            "d1": {"ORG": ["Apple"], "GPE": ["Paris"]},
+            "d2": {"ORG": ["Apple"]},
+            "d3": {"PERSON": ["Apple"]},
+        })
+        self.assertEqual(merged, {"ORG": ["Apple"], "GPE": ["Paris"]})
+        self.assertEqual(conflicts, [{"entity": "Apple", "kept": "ORG", "dropped": ["PERSON"]}])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import os
+import tempfile
+import unittest
+from pipeline.dedup import PAGE_BREAK, DuplicateIndex, MinHasher, shingle_hashes, similarity
+
+
+def report(topic, words=200):
+    return " ".join(f"{topic} figure {i} rose sharply in quarter {i % 4}." for i in range(words // 8))
+
+
+class TestMinHash(unittest.TestCase):
+
+    def test_similarity_tracks_overlap(self):
+        hasher = MinHasher()
+        base = report("Revenue")
+        edited = base.replace("figure 3 ", "figure three ").upper()
+        other = report("Inflation")
+        signature = hasher.signature(shingle_hashes(base))
+        self.assertGreater(similarity(signature, hasher.signature(shingle_hashes(edited))), 0.85)
+        self.assertLess(similarity(signature, hasher.signature(shingle_hashes(other))), 0.3)
+
+    def test_signatures_are_stable(self):
+        hashes = shingle_hashes(report("Revenue"))
+        self.assertTrue((MinHasher().signature(hashes) == MinHasher().signature(hashes)).all())
+
+
+class TestDuplicateIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.index = DuplicateIndex(self.tmp.name)
+
+    def tearDown(self):
+        self.index.close()
+        self.tmp.cleanup()
+
+    def test_near_duplicate_documents(self):
+        self.assertIsNone(self.index.check_and_add(report("Revenue"), "a.pdf"))
+        source, score = self.index.check_and_add(report("Revenue") + " Reissued.", "b.pdf")
+        self.assertEqual(source, "a.pdf")
+        self.assertGreaterEqual(score, 0.85)
+        self.assertIsNone(self.index.check_and_add(report("Inflation"), "c.pdf"))
+        self.assertEqual(self.index.stats(), {"documents": 2, "pages": 0, "duplicates": 1})
+
+    def test_same_source_and_short_texts_never_match(self):
+        self.index.check_and_add(report("Revenue"), "a.pdf")
+        self.assertIsNone(self.index.check_and_add(report("Revenue"), "a.pdf"))
+        self.index.check_and_add("Page intentionally left blank", "b.pdf")
+        self.assertIsNone(self.index.check_and_add("Page intentionally left blank", "c.pdf"))
+
+    def test_index_persists(self):
+        self.index.check_and_add(report("Revenue"), "a.pdf")
+        reopened = DuplicateIndex(self.tmp.name)
+        self.assertEqual(reopened.check_and_add(report("Revenue"), "b.pdf")[0], "a.pdf")
+        reopened.close()
+
+    def test_deduplicate_drops_repeated_pages(self):
+        disclaimer = report("Disclaimer")
+        first = PAGE_BREAK.join([report("Revenue"), disclaimer, report("Margins"), disclaimer])
+        text, duplicate_of, dropped = self.index.deduplicate(first, "a.pdf")
+        self.assertIsNone(duplicate_of)
+        self.assertEqual(dropped, 1)
+        self.assertEqual(text.count("Disclaimer figure 1 "), 1)
+        self.assertNotIn(PAGE_BREAK, text)
+
+        # The shared disclaimer is dropped from another report, the whole copy is skipped
+        text, _, dropped = self.index.deduplicate(PAGE_BREAK.join([report("Inflation"), disclaimer]), "b.pdf")
+        self.assertEqual((dropped, "Disclaimer" in text), (1, False))
+        self.assertEqual(self.index.deduplicate(first, "copy.pdf")[:2], (None, "a.pdf"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,41 @@
+import unittest
+from spacy.tokens import Doc
+from spacy.vocab import Vocab
+from entity_extraction.spacy_extraction import entities_from_doc, relationships_from_doc, extract_from_doc
+
+
+def make_doc():
+    # "Apple bought Beats ." parsed by hand so the tests don't need a trained model
+    words = ["Apple", "bought", "Beats", "."]
+    return Doc(
+        Vocab(),
+        words=words,
+        heads=[1, 1, 1, 1],
+        deps=["nsubj", "ROOT", "dobj", "punct"],
+        pos=["PROPN", "VERB", "PROPN", "PUNCT"],
+        ents=["B-ORG", "O", "B-PRODUCT", "O"],
+        sent_starts=[True, False, False, False],
+    )
+
+
+class TestEntityExtraction(unittest.TestCase):
+
+    def test_entities_from_doc(self):
+        entities = entities_from_doc(make_doc())
+        self.assertEqual(entities, {"Organization": ["Apple"], "Product": ["Beats"]})
+
+    def test_relationships_from_doc(self):
+        relationships = relationships_from_doc(make_doc())
+        self.assertEqual(relationships, [{"subject": "Apple", "predicate": "bought", "object": "Beats"}])
+
+    def test_relationships_without_parse(self):
+        doc = Doc(Vocab(), words=["Apple", "bought", "Beats"])
+        self.assertEqual(relationships_from_doc(doc), [])
+
+    def test_extract_from_doc_single_parse(self):
+        entities, relationships = extract_from_doc(make_doc())
+        self.assertIn("Organization", entities)
+        self.assertEqual(len(relationships), 1)
+
+if __name__ == "__main__":
+    unittest.main()
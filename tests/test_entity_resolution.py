@@ -0,0 +1,57 @@
+import unittest
+from graph_population.entity_resolution import EntityResolver, UnionFind, normalize_entity, resolve_extraction
+
+
+class TestEntityResolution(unittest.TestCase):
+
+    def test_normalize_entity(self):
+        self.assertEqual(normalize_entity("Apple Inc."), "apple")
+        self.assertEqual(normalize_entity("  The Reserve   Bank of India's "), "reserve bank of india")
+        self.assertEqual(normalize_entity("Ltd"), "ltd")
+        self.assertEqual(normalize_entity("..."), "")
+
+    def test_union_find(self):
+        union_find = UnionFind()
+        union_find.union("a", "b")
+        union_find.union("c", "d")
+        union_find.union("b", "d")
+        union_find.find("e")
+        self.assertEqual(sorted(sorted(group) for group in union_find.groups()), [["a", "b", "c", "d"], ["e"]])
+
+    def test_resolve_merges_variants(self):
+        mentions = ["Apple Inc.", "Apple Inc", "Apple Inc", "Microsoft", "Reserve Bank of India", "Reserve Bank of Indla"]
+        canonical = EntityResolver(threshold=0.7).resolve(mentions)
+        self.assertEqual(canonical["Apple Inc."], "Apple Inc")
+        self.assertEqual(canonical["Microsoft"], "Microsoft")
+        self.assertEqual(canonical["Reserve Bank of Indla"], canonical["Reserve Bank of India"])
+
+    def test_dissimilar_names_stay_apart(self):
+        canonical = EntityResolver().resolve(["Nifty 50", "Nifty Bank", "Sensex"])
+        self.assertEqual(len(set(canonical.values())), 3)
+
+    def test_different_numbers_stay_apart(self):
+        canonical = EntityResolver(threshold=0.7).resolve(["Nifty 50 Index", "Nifty 500 Index", "Nifty 50 index"])
+        self.assertEqual(canonical["Nifty 50 index"], canonical["Nifty 50 Index"])
+        self.assertNotEqual(canonical["Nifty 500 Index"], canonical["Nifty 50 Index"])
+
+    def test_types_are_not_mixed(self):
+        types = {"Jordan": "Person", "Jordan.": "Location", "Reserve Bank of Indla": "Organization"}
+        canonical = EntityResolver(threshold=0.7).resolve(
+            ["Jordan", "Jordan.", "Reserve Bank of India", "Reserve Bank of Indla"], types)
+        self.assertNotEqual(canonical["Jordan"], canonical["Jordan."])
+        # Untyped mentions still join a typed cluster
+        self.assertEqual(canonical["Reserve Bank of India"], canonical["Reserve Bank of Indla"])
+
+    def test_resolve_extraction_links_relationships(self):
+        entities = {"Organization": ["Apple Inc.", "Apple Inc"], "Product": ["iPhone"]}
+        relationships = [
+            {"subject": "Apple", "predicate": "makes", "object": "iPhone"},
+            {"subject": "Apple Inc", "predicate": "makes", "object": "iPhone"},
+        ]
+        resolved_entities, resolved_relationships = resolve_extraction(entities, relationships)
+        self.assertEqual(len(resolved_entities["Organization"]), 1)
+        self.assertEqual(len(resolved_relationships), 1)
+        self.assertEqual(resolved_relationships[0]["subject"], resolved_entities["Organization"][0])
+
+if __name__ == "__main__":
+    unittest.main()
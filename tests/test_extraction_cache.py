@@ -0,0 +1,55 @@
+import tempfile
+import unittest
+from pipeline.extraction_cache import ExtractionCache
+
+
+class TestExtractionCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_round_trip_and_hit_metric(self):
+        cache = ExtractionCache(self.tmp.name)
+        key = cache.key_for(b"%PDF-1.4 content")
+        self.assertIsNone(cache.get(key))
+        record = {"text": "Paris", "entities": {"Location": ["Paris"]}, "relationships": []}
+        cache.put(key, record)
+        self.assertEqual(cache.get(key), record)
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["entries"]), (1, 1, 1))
+        self.assertEqual(stats["hit_rate"], 0.5)
+        cache.close()
+
+    def test_key_depends_on_version(self):
+        old = ExtractionCache(self.tmp.name, version="1")
+        new = ExtractionCache(self.tmp.name, version="2")
+        self.assertNotEqual(old.key_for(b"same bytes"), new.key_for(b"same bytes"))
+        old.close()
+        new.close()
+
+    def test_evicts_least_recently_used(self):
+        cache = ExtractionCache(self.tmp.name, max_bytes=250)
+        keys = [cache.key_for(bytes([i])) for i in range(3)]
+        cache.put(keys[0], {"text": "a" * 80})
+        cache.put(keys[1], {"text": "b" * 80})
+        cache.get(keys[0])
+        cache.put(keys[2], {"text": "c" * 80})
+        self.assertIsNotNone(cache.get(keys[0]))
+        self.assertIsNone(cache.get(keys[1]))
+        self.assertIsNotNone(cache.get(keys[2]))
+        cache.close()
+
+    def test_persists_across_instances(self):
+        cache = ExtractionCache(self.tmp.name)
+        key = cache.key_for(b"doc")
+        cache.put(key, {"text": "doc"})
+        cache.close()
+        reopened = ExtractionCache(self.tmp.name)
+        self.assertEqual(reopened.get(key), {"text": "doc"})
+        reopened.close()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+import unittest
+import networkx as nx
+import numpy as np
+from rdflib import Graph, Literal, Namespace, RDF
+from scipy import sparse
+from graph_population.columnar_store import ColumnarTripleStore
+from graph_population.graph_analytics import GraphAnalytics, colour_classes, label_propagation, pagerank
+from graph_population.graph_query import GraphIndex, GraphIndexCache
+
+EX = Namespace("http://example.org/")
+
+
+def two_cliques():
+    # Two 4-cliques joined by one link, typed and with literals that must be ignored
+    graph = Graph()
+    for group, members in (("Bank", ["RBI", "SBI", "HDFC", "ICICI"]), ("Tech", ["TCS", "Infosys", "Wipro", "HCL"])):
+        for i, left in enumerate(members):
+            graph.add((EX[left], RDF.type, EX[group]))
+            graph.add((EX[left], EX.label, Literal(left)))
+            for right in members[i + 1:]:
+                graph.add((EX[left], EX.partner_of, EX[right]))
+    graph.add((EX.HDFC, EX.lends_to, EX.TCS))
+    graph.add((EX.Nifty50, EX.word_count, Literal(10)))
+    return graph
+
+
+class TestSparseAlgorithms(unittest.TestCase):
+
+    def test_pagerank_matches_networkx(self):
+        directed = nx.gnm_random_graph(300, 1200, directed=True, seed=4)
+        adjacency = sparse.csr_matrix(nx.to_scipy_sparse_array(directed, nodelist=range(300)))
+        expected = nx.pagerank(directed, tol=1e-12)
+        ranks = pagerank(adjacency)
+        self.assertAlmostEqual(ranks.sum(), 1.0)
+        self.assertLess(max(abs(ranks[i] - expected[i]) for i in range(300)), 1e-6)
+
+    def test_label_propagation_finds_planted_groups(self):
+        groups = nx.planted_partition_graph(5, 30, 0.5, 0.005, seed=7)
+        adjacency = sparse.csr_matrix(nx.to_scipy_sparse_array(groups, nodelist=range(150)))
+        communities = label_propagation(adjacency)
+        for start in range(0, 150, 30):
+            self.assertEqual(len(set(communities[start:start + 30].tolist())), 1)
+        self.assertEqual(len(set(communities.tolist())), 5)
+
+    def test_label_propagation_does_not_oscillate_on_bipartite_shapes(self):
+        # Fully synchronous updates swap the labels of these forever
+        for shape in (nx.path_graph(2), nx.path_graph(4), nx.star_graph(6), nx.complete_bipartite_graph(3, 4)):
+            adjacency = sparse.csr_matrix(nx.to_scipy_sparse_array(shape, nodelist=range(len(shape))))
+            self.assertEqual(label_propagation(adjacency).tolist(), [0] * len(shape))
+
+    def test_colour_classes_are_independent(self):
+        graph = nx.gnm_random_graph(200, 800, seed=3)
+        adjacency = sparse.csr_matrix(nx.to_scipy_sparse_array(graph, nodelist=range(200)))
+        classes = colour_classes(adjacency)
+        self.assertEqual(sorted(np.concatenate(classes).tolist()), list(range(200)))
+        for nodes in classes:
+            self.assertEqual(adjacency[nodes][:, nodes].nnz, 0)
+
+
+class TestGraphAnalytics(unittest.TestCase):
+
+    def setUp(self):
+        self.index = GraphIndex(two_cliques())
+        self.analytics = self.index.analytics()
+
+    def test_summary_and_attributes(self):
+        summary = self.analytics.summary()
+        self.assertEqual((summary["nodes"], summary["links"]), (9, 13))
+        self.assertEqual((summary["components"], summary["largest_component"]), (2, 8))
+        self.assertEqual(summary["communities"], 3)
+        self.assertGreater(summary["modularity"], 0.3)
+        hdfc = self.analytics.node_attributes(EX.HDFC)
+        self.assertEqual((hdfc["label"], hdfc["type"], hdfc["degree"]), ("HDFC", "Bank", 4))
+        self.assertIsNone(self.analytics.node_attributes(EX.Bank))
+
+    def test_rankings_and_communities(self):
+        top = [entity["label"] for entity in self.analytics.top_entities(2, by="degree")]
+        self.assertEqual(sorted(top), ["HDFC", "TCS"])
+        communities = self.analytics.communities(top_members=2)
+        self.assertEqual([c["size"] for c in communities], [4, 4, 1])
+        self.assertEqual([c["links"] for c in communities], [6, 6, 0])
+        self.assertEqual({tuple(c["types"]) for c in communities[:2]}, {("Bank",), ("Tech",)})
+        self.assertEqual(len(communities[0]["top_members"]), 2)
+
+    def test_computed_once_per_version(self):
+        cache = GraphIndexCache()
+        graph = two_cliques()
+        self.assertIs(cache.get(graph, "v1").analytics(), cache.get(graph, "v1").analytics())
+
+    def test_store_and_networkx(self):
+        from_store = GraphAnalytics.from_store(ColumnarTripleStore.from_graph(two_cliques()))
+        self.assertEqual(from_store.summary(), self.analytics.summary())
+        graph = self.analytics.to_networkx()
+        self.assertEqual(graph.number_of_edges(), 13)
+        self.assertEqual(graph.nodes["TCS"]["type"], "Tech")
+
+    def test_empty_graph(self):
+        analytics = GraphIndex(Graph()).analytics()
+        self.assertEqual(analytics.summary()["nodes"], 0)
+        self.assertEqual(analytics.communities(), [])
+        self.assertEqual(analytics.top_entities(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+import unittest
+from rdflib import Graph, Literal, Namespace
+from graph_population.graph_query import GraphIndex, GraphIndexCache, graph_version
+
+EX = Namespace("http://example.org/")
+
+
+def sample_graph():
+    graph = Graph()
+    graph.add((EX.London, EX.country, EX.UK))
+    graph.add((EX.London, EX.population, Literal("9 million")))
+    graph.add((EX.UK, EX.member_of, EX.G7))
+    graph.add((EX.France, EX.member_of, EX.G7))
+    graph.add((EX.Paris, EX.country, EX.France))
+    graph.add((EX.Paris, EX.twinned_with, EX.London))
+    graph.add((EX.Lyon, EX.country, EX.France))
+    graph.add((EX.Tokyo, EX.population, Literal("14 million")))
+    return graph
+
+
+class TestGraphIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.graph = sample_graph()
+        self.index = GraphIndex(self.graph)
+
+    def test_pattern_lookups_match_rdflib(self):
+        patterns = [(None, None, None), (EX.London, None, None), (None, EX.country, None),
+                    (None, None, EX.France), (EX.Paris, EX.country, None), (None, EX.member_of, EX.G7),
+                    (EX.Nowhere, None, None)]
+        for s, p, o in patterns:
+            self.assertEqual(set(self.index.triples(s, p, o)), set(self.graph.triples((s, p, o))))
+
+    def test_neighborhood(self):
+        self.assertEqual(self.index.neighborhood(EX.Lyon, hops=1), {EX.Lyon: 0, EX.France: 1})
+        two_hops = self.index.neighborhood(EX.Lyon, hops=2)
+        self.assertEqual(set(two_hops), {EX.Lyon, EX.France, EX.G7, EX.Paris})
+        # Literals are not graph nodes
+        self.assertNotIn(Literal("9 million"), self.index.neighborhood(EX.London, hops=3))
+        self.assertEqual(self.index.neighborhood(EX.Nowhere), {})
+
+    def test_shortest_path(self):
+        self.assertEqual(self.index.shortest_path(EX.Lyon, EX.London), [EX.Lyon, EX.France, EX.Paris, EX.London])
+        self.assertIsNone(self.index.shortest_path(EX.Lyon, EX.London, max_hops=2))
+        self.assertIsNone(self.index.shortest_path(EX.Lyon, EX.Tokyo))
+        self.assertEqual(self.index.shortest_path(EX.UK, EX.UK), [EX.UK])
+
+    def test_sparql_passthrough(self):
+        rows = self.index.sparql("SELECT ?s WHERE { ?s <http://example.org/country> <http://example.org/France> }")
+        self.assertEqual({row[0] for row in rows}, {EX.Paris, EX.Lyon})
+        self.assertTrue(self.index.sparql("ASK { ?s ?p ?o }"))
+
+    def test_results_are_cached(self):
+        first = self.index.triples(p=EX.country)
+        self.assertIs(self.index.triples(p=EX.country), first)
+
+    def test_index_cache_follows_graph_version(self):
+        cache = GraphIndexCache()
+        index = cache.get(self.graph)
+        self.assertIs(cache.get(self.graph), index)
+        version = graph_version(self.graph)
+        self.graph.add((EX.Berlin, EX.country, EX.Germany))
+        self.assertNotEqual(graph_version(self.graph), version)
+        self.assertIsNot(cache.get(self.graph), index)
+
+
+if __name__ == '__main__':
+    unittest.main()
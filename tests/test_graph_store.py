@@ -0,0 +1,64 @@
+import os
+import tempfile
+import unittest
+from rdflib import Literal, URIRef
+from graph_population.graph_store import GraphStore
+from graph_population.knowledge_graph_builder import EX, build_knowledge_graph, update_knowledge_graph
+
+SCHEMAS = {
+    "doc one": {"word_count": 2, "unique_entities": ["Paris", "France"]},
+    "doc two": {"word_count": 1, "unique_entities": ["Paris"]},
+}
+
+
+class TestGraphStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = GraphStore(os.path.join(self.tmp.name, "graph.db"))
+
+    def tearDown(self):
+        self.store.close()
+        self.tmp.cleanup()
+
+    def test_incremental_matches_full_build(self):
+        update_knowledge_graph(self.store, SCHEMAS)
+        full = build_knowledge_graph(SCHEMAS)
+        self.assertEqual(set(self.store.to_graph()), set(full))
+        self.assertEqual(len(self.store), len(full))
+        self.assertEqual(self.store.documents(), ["doc one", "doc two"])
+
+    def test_remove_document_keeps_shared_triples(self):
+        update_knowledge_graph(self.store, SCHEMAS)
+        self.store.remove_document("doc two")
+        paris_name = (URIRef(EX["Paris"]), EX.entity_name, Literal("Paris"))
+        self.assertIn(paris_name, set(self.store.triples()))
+        self.assertEqual(set(self.store.to_graph()), set(build_knowledge_graph({"doc one": SCHEMAS["doc one"]})))
+
+    def test_re_adding_document_replaces_its_triples(self):
+        update_knowledge_graph(self.store, SCHEMAS)
+        update_knowledge_graph(self.store, {"doc one": {"word_count": 1, "unique_entities": ["Lyon"]}})
+        triples = set(self.store.triples(doc_id="doc one"))
+        self.assertIn((URIRef(EX["Lyon"]), EX.entity_name, Literal("Lyon")), triples)
+        self.assertNotIn((URIRef(EX["France"]), EX.entity_name, Literal("France")), triples)
+
+    def test_backslash_literals_round_trip(self):
+        # rdflib.util.from_n3 fails on "\\x" sequences; schema words can contain them
+        schemas = {"doc": {"word_count": 3, "unique_entities": ["C:\\new\\x1", 'say "hi"\nthere', "naïve\\u0041"]}}
+        update_knowledge_graph(self.store, schemas)
+        self.assertEqual(set(self.store.to_graph()), set(build_knowledge_graph(schemas)))
+        self.assertEqual(len(list(self.store.claims())), len(build_knowledge_graph(schemas)))
+
+    def test_pattern_lookup(self):
+        update_knowledge_graph(self.store, SCHEMAS)
+        matches = list(self.store.triples((None, EX.word_count, None)))
+        self.assertEqual(len(matches), 2)
+
+    def test_claims_keep_document_provenance(self):
+        update_knowledge_graph(self.store, SCHEMAS)
+        paris_name = (URIRef(EX["Paris"]), EX.entity_name, Literal("Paris"))
+        docs = {claim[3] for claim in self.store.claims() if claim[:3] == paris_name}
+        self.assertEqual(docs, {"doc one", "doc two"})
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from pipeline.ingest import Manifest, file_signature, ingest_directory, iter_documents
+
+DATASET_PDF = os.path.join(os.path.dirname(__file__), "..", "schema_inference", "dataset_example", "ind_nifty50.pdf")
+
+
+def read_jsonl(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+class TestIngestDirectory(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = os.path.join(self.tmp.name, "corpus")
+        self.output = os.path.join(self.tmp.name, "output")
+        os.makedirs(os.path.join(self.root, "nested"))
+        self.page = os.path.join(self.root, "page.html")
+        with open(self.page, "w", encoding="utf-8") as f:
+            f.write("<html><body><p>Reserve Bank of India sets the repo rate.</p><script>x()</script></body></html>")
+        shutil.copy(DATASET_PDF, os.path.join(self.root, "nested", "nifty.pdf"))
+        with open(os.path.join(self.root, "nested", "broken.docx"), "wb") as f:
+            f.write(b"not a zip file")
+        with open(os.path.join(self.root, "notes.txt"), "w") as f:
+            f.write("ignored")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_iter_documents_recurses_supported_files(self):
+        names = [os.path.relpath(path, self.root) for path in iter_documents(self.root)]
+        self.assertEqual(names, ["page.html", os.path.join("nested", "broken.docx"), os.path.join("nested", "nifty.pdf")])
+
+    def test_ingest_and_resume(self):
+        report = ingest_directory(self.root, self.output, max_workers=1, ocr=False)
+        self.assertEqual(report.processed, 2)
+        self.assertEqual([os.path.basename(f["path"]) for f in report.failures], ["broken.docx"])
+        results = {os.path.basename(r["path"]): r for r in read_jsonl(os.path.join(self.output, "results.jsonl"))}
+        self.assertEqual(set(results), {"page.html", "nifty.pdf"})
+        self.assertIn("word_count", results["page.html"]["schema"])
+
+        # Finished files are skipped, failed ones retried
+        report = ingest_directory(self.root, self.output, max_workers=1, ocr=False)
+        self.assertEqual((report.processed, report.skipped, len(report.failures)), (0, 2, 1))
+
+        # A changed file is processed again
+        with open(self.page, "a", encoding="utf-8") as f:
+            f.write("<p>More text.</p>")
+        report = ingest_directory(self.root, self.output, max_workers=1, ocr=False)
+        self.assertEqual((report.processed, report.skipped), (1, 1))
+
+    def test_schema_keeps_top_terms(self):
+        with open(self.page, "w", encoding="utf-8") as f:
+            f.write("<html><body><p>" + " ".join(f"term{i}" for i in range(50)) + " Nifty Nifty Nifty</p></body></html>")
+        ingest_directory(self.page, self.output, max_workers=1, ocr=False, top_k=5)
+        schema = read_jsonl(os.path.join(self.output, "results.jsonl"))[0]["schema"]
+        self.assertEqual(len(schema["unique_entities"]), 5)
+        self.assertEqual(schema["unique_entities"][0], "Nifty")
+        self.assertEqual(schema["word_count"], 53)
+
+        ingest_directory(self.page, os.path.join(self.tmp.name, "full"), max_workers=1, ocr=False, top_k=None)
+        schema = read_jsonl(os.path.join(self.tmp.name, "full", "results.jsonl"))[0]["schema"]
+        self.assertEqual(len(schema["unique_entities"]), 51)
+        self.assertNotIn("top_terms", schema)
+
+    def test_near_duplicates_are_not_analysed(self):
+        report_text = " ".join(f"Nifty50 constituent {i} gained in the quarter." for i in range(20))
+        for name, suffix in (("original.html", ""), ("reissue.html", " Reissued.")):
+            with open(os.path.join(self.root, name), "w", encoding="utf-8") as f:
+                f.write(f"<html><body><p>{report_text}{suffix}</p></body></html>")
+        report = ingest_directory(self.root, self.output, max_workers=1, ocr=False)
+        self.assertEqual((report.processed, report.duplicates), (4, 1))
+        results = {os.path.basename(r["path"]): r for r in read_jsonl(os.path.join(self.output, "results.jsonl"))}
+        self.assertEqual(os.path.basename(results["reissue.html"]["duplicate_of"]), "original.html")
+        self.assertNotIn("schema", results["reissue.html"])
+
+        report = ingest_directory(self.root, os.path.join(self.tmp.name, "fresh"), max_workers=1, ocr=False,
+                                  dedup=False)
+        self.assertEqual(report.duplicates, 0)
+
+    def test_manifest_ignores_torn_line(self):
+        path = os.path.join(self.tmp.name, "manifest.jsonl")
+        manifest = Manifest(path)
+        manifest.record(self.page, file_signature(self.page), "done")
+        manifest.close()
+        with open(path, "a") as f:
+            f.write('{"path": "trunc')
+        manifest = Manifest(path)
+        self.assertTrue(manifest.is_done(self.page, file_signature(self.page)))
+        # The next record must not be glued onto the torn line
+        pdf = os.path.join(self.root, "nested", "nifty.pdf")
+        manifest.record(pdf, file_signature(pdf), "done")
+        manifest.close()
+        manifest = Manifest(path)
+        self.assertTrue(manifest.is_done(self.page, file_signature(self.page)))
+        self.assertTrue(manifest.is_done(pdf, file_signature(pdf)))
+        manifest.close()
+        with open(path) as f:
+            self.assertEqual(len(f.read().splitlines()), 2)
+
+    def test_torn_result_line_is_not_duplicated(self):
+        ingest_directory(self.root, self.output, max_workers=1, ocr=False, dedup=False)
+        results_path = os.path.join(self.output, "results.jsonl")
+        manifest_path = os.path.join(self.output, "manifest.jsonl")
+        # Simulate a crash while the last result was written, before its checkpoint
+        results = read_jsonl(results_path)
+        with open(results_path, "r+", encoding="utf-8") as f:
+            f.truncate(os.path.getsize(results_path) - 10)
+        entries = [entry for entry in read_jsonl(manifest_path) if entry["path"] != results[-1]["path"]]
+        with open(manifest_path, "w", encoding="utf-8") as f:
+            f.writelines(json.dumps(entry) + "\n" for entry in entries)
+
+        report = ingest_directory(self.root, self.output, max_workers=1, ocr=False, dedup=False)
+        self.assertEqual(report.processed, 1)
+        self.assertEqual([r["path"] for r in read_jsonl(results_path)], [r["path"] for r in results])
+
+if __name__ == '__main__':
+    unittest.main()
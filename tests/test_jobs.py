@@ -0,0 +1,81 @@
+import os
+import tempfile
+import threading
+import unittest
+from pipeline.jobs import CANCELLED, COMPLETED, FAILED, INTERRUPTED, JobManager, JobStore
+
+
+def staged_job(context, value):
+    context.stage("extract", 0.3)
+    context.stage("nlp", 0.7)
+    return {"value": value * 2}
+
+
+def failing_job(context):
+    raise ValueError("broken PDF")
+
+
+class TestJobs(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "jobs.db")
+        self.manager = JobManager(JobStore(self.path), max_workers=2)
+
+    def tearDown(self):
+        self.manager.shutdown()
+        self.manager.store.close()
+        self.tmp.cleanup()
+
+    def test_job_completes_with_result(self):
+        job_id = self.manager.submit("doc.pdf", staged_job, 21)
+        job = self.manager.wait(job_id, timeout=5)
+        self.assertEqual(job["status"], COMPLETED)
+        self.assertEqual(job["result"], {"value": 42})
+        self.assertEqual(job["progress"], 1.0)
+
+    def test_failure_is_recorded(self):
+        job = self.manager.wait(self.manager.submit("bad.pdf", failing_job), timeout=5)
+        self.assertEqual(job["status"], FAILED)
+        self.assertEqual(job["error"], "broken PDF")
+
+    def test_cancel_running_job_at_next_stage(self):
+        started = threading.Event()
+        release = threading.Event()
+
+        def blocking_job(context):
+            context.stage("extract", 0.1)
+            started.set()
+            release.wait(5)
+            context.stage("nlp", 0.5)
+            return {}
+
+        job_id = self.manager.submit("big.pdf", blocking_job)
+        started.wait(5)
+        self.assertTrue(self.manager.cancel(job_id))
+        release.set()
+        job = self.manager.wait(job_id, timeout=5)
+        self.assertEqual(job["status"], CANCELLED)
+        self.assertEqual(job["stage"], "extract")
+
+    def test_jobs_run_concurrently(self):
+        barrier = threading.Barrier(2, timeout=5)
+
+        def meeting_job(context):
+            barrier.wait()
+            return {}
+
+        ids = [self.manager.submit(f"doc{i}", meeting_job) for i in range(2)]
+        self.assertEqual([self.manager.wait(i, timeout=5)["status"] for i in ids], [COMPLETED, COMPLETED])
+
+    def test_unfinished_jobs_are_interrupted_on_reopen(self):
+        store = JobStore(self.path)
+        store.create("stale", "old.pdf")
+        store.close()
+        reopened = JobStore(self.path)
+        self.assertEqual(reopened.get("stale")["status"], INTERRUPTED)
+        self.assertEqual(reopened.list()[0]["id"], "stale")
+        reopened.close()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+import io
+import os
+import tempfile
+import tracemalloc
+import unittest
+import docx
+# Imported up front so loading spaCy does not count towards the measured peak
+import entity_extraction.bulk_extraction  # noqa: F401
+from multi_format_processing.extract_text import extract_text_from_pdf
+from pipeline.large_files import SpooledUpload, TextSpool, extract_entities_chunked, extract_large_file
+
+DATASET_PDF = os.path.join(os.path.dirname(__file__), "..", "schema_inference", "dataset_example", "ind_nifty50.pdf")
+
+
+class FakeEntityExtractor:
+    """Stands in for the app's EntityExtractor: one entity per chunk"""
+
+    def extract_batch(self, documents, batch_size=32, max_chunk_chars=100000):
+        for doc_id, text in documents:
+            yield doc_id, {"Organization": [text.split()[0]]}, [{"subject": doc_id}]
+
+
+class TestSpooledUpload(unittest.TestCase):
+
+    def test_copies_and_removes(self):
+        source = io.BytesIO(b"x" * 3000)
+        source.read(10)
+        with SpooledUpload(source, suffix=".pdf", chunk_size=1024) as upload:
+            self.assertEqual(upload.size, 3000)
+            self.assertTrue(upload.path.endswith(".pdf"))
+            with open(upload.path, "rb") as f:
+                self.assertEqual(f.read(), b"x" * 3000)
+        self.assertFalse(os.path.exists(upload.path))
+
+
+class TestTextSpool(unittest.TestCase):
+
+    def test_preview_and_chunks(self):
+        sentences = [f"Sentence number {i} mentions Infosys. " for i in range(2000)]
+        with TextSpool(preview_chars=100) as spool:
+            for sentence in sentences:
+                spool.write(sentence)
+            self.assertEqual(spool.preview, "".join(sentences)[:100])
+            self.assertTrue(spool.truncated)
+            chunks = list(spool.iter_chunks(max_chars=1000))
+        self.assertEqual("".join(chunks), "".join(sentences))
+        self.assertTrue(all(len(chunk) <= 1000 for chunk in chunks))
+        self.assertTrue(all(chunk.endswith(". ") for chunk in chunks))
+
+    def test_memory_does_not_grow_with_text(self):
+        line = "The Reserve Bank of India kept the repo rate unchanged. " * 20 + "\n"
+        with TextSpool() as spool:
+            tracemalloc.start()
+            for _ in range(20000):
+                spool.write(line)
+            longest = max(len(chunk) for chunk in spool.iter_chunks(50000))
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            self.assertGreater(spool.chars, 20 * 1024 * 1024)
+        self.assertLessEqual(longest, 50000)
+        self.assertLess(peak, 5 * 1024 * 1024)
+
+
+class TestExtractLargeFile(unittest.TestCase):
+
+    def test_pdf_matches_in_memory_extraction(self):
+        with TextSpool() as spool:
+            extract_large_file(DATASET_PDF, "pdf", spool, max_workers=1)
+            text = "".join(spool.iter_chunks())
+        self.assertEqual(text.strip(), extract_text_from_pdf(DATASET_PDF, max_workers=1, ocr=False))
+
+    def test_docx_and_chunked_entities(self):
+        document = docx.Document()
+        for i in range(50):
+            document.add_paragraph(f"Company{i} reported results. " * 10)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "report.docx")
+            document.save(path)
+            with TextSpool() as spool:
+                extract_large_file(path, "docx", spool)
+                entities, relationships = extract_entities_chunked(spool, FakeEntityExtractor(), max_chunk_chars=1000)
+        self.assertEqual(len(relationships), len(entities["Organization"]))
+        self.assertGreater(len(relationships), 10)
+
+    def test_unsupported_type(self):
+        with TextSpool() as spool, self.assertRaises(ValueError):
+            extract_large_file(DATASET_PDF, "zip", spool)
+
+
+if __name__ == "__main__":
+    unittest.main()
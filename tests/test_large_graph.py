@@ -0,0 +1,47 @@
+import unittest
+import networkx as nx
+from rdflib import Graph, Namespace
+from visualization.large_graph import (LayoutCache, expand_neighborhood, graph_to_networkx,
+                                       sample_nodes, visualize_large_graph)
+
+EX = Namespace("http://example.org/")
+
+
+class TestLargeGraph(unittest.TestCase):
+
+    def test_graph_to_networkx_uses_local_names(self):
+        g = Graph()
+        g.add((EX["SEBI"], EX["regulates"], EX["markets"]))
+        G = graph_to_networkx(g)
+        self.assertEqual(G.edges["SEBI", "markets"]["label"], "regulates")
+
+    def test_degree_sampling_keeps_hubs(self):
+        G = nx.star_graph(50)
+        nodes = sample_nodes(G, max_nodes=5)
+        self.assertEqual(len(nodes), 5)
+        self.assertIn(0, nodes)
+
+    def test_kcore_sampling_prefers_dense_core(self):
+        G = nx.complete_graph(5)
+        G.add_edges_from((0, n) for n in range(5, 30))
+        nodes = sample_nodes(G, max_nodes=5, method="kcore")
+        self.assertEqual(nodes, {0, 1, 2, 3, 4})
+
+    def test_expand_neighborhood(self):
+        G = nx.path_graph(6)
+        self.assertEqual(expand_neighborhood(G, {0}, [3], hops=1), {0, 2, 3, 4})
+        self.assertEqual(expand_neighborhood(G, set(), ["missing"]), set())
+
+    def test_layout_is_cached(self):
+        cache = LayoutCache()
+        G = nx.path_graph(10)
+        self.assertIs(cache.layout(G), cache.layout(nx.path_graph(10)))
+
+    def test_visualize_caps_nodes(self):
+        fig, shown, total = visualize_large_graph(nx.barabasi_albert_graph(1000, 2, seed=1), max_nodes=100,
+                                                  layout_cache=LayoutCache())
+        self.assertEqual((shown, total), (100, 1000))
+        self.assertEqual(fig.data[1].type, "scattergl")
+
+if __name__ == "__main__":
+    unittest.main()
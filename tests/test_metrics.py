@@ -0,0 +1,69 @@
+import json
+import threading
+import unittest
+from pipeline.metrics import MetricsRegistry, RunProfiler
+
+
+class TestMetricsRegistry(unittest.TestCase):
+
+    def setUp(self):
+        self.registry = MetricsRegistry()
+
+    def test_stage_records_counts_and_times(self):
+        with self.registry.stage("extract", bytes=100) as record:
+            record.items = 3
+        with self.registry.stage("extract", bytes=50, items=1):
+            sum(range(10000))
+        totals = self.registry.snapshot()["extract"]
+        self.assertEqual((totals["calls"], totals["bytes"], totals["items"], totals["errors"]), (2, 150, 4, 0))
+        self.assertGreater(totals["wall_seconds"], 0)
+        self.assertGreaterEqual(totals["cpu_seconds"], 0)
+
+    def test_failed_stage_counts_error_and_reraises(self):
+        with self.assertRaises(ValueError):
+            with self.registry.stage("nlp_parse"):
+                raise ValueError("boom")
+        self.assertEqual(self.registry.snapshot()["nlp_parse"]["errors"], 1)
+
+    def test_thread_safety(self):
+        def work():
+            for _ in range(200):
+                with self.registry.stage("ocr", items=1):
+                    pass
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(self.registry.snapshot()["ocr"]["items"], 800)
+
+    def test_merge_and_exports(self):
+        self.registry.record("graph_build", 1.5, 1.0, bytes=10, items=2)
+        self.registry.merge({"graph_build": {"calls": 1, "wall_seconds": 0.5, "items": 1}})
+        self.assertEqual(json.loads(self.registry.to_json())["graph_build"]["items"], 3)
+        text = self.registry.to_prometheus()
+        self.assertIn('kg_pipeline_stage_wall_seconds_total{stage="graph_build"} 2.0', text)
+        self.assertIn("# TYPE kg_pipeline_stage_calls_total counter", text)
+        self.registry.reset()
+        self.assertEqual(self.registry.snapshot(), {})
+
+
+class TestRunProfiler(unittest.TestCase):
+
+    def test_disabled_profiler_reports_nothing(self):
+        with RunProfiler(enabled=False) as profiler:
+            sum(range(100))
+        self.assertEqual(profiler.report(), "")
+
+    def test_enabled_profiler_reports_functions_and_memory(self):
+        def allocate():
+            return [str(i) for i in range(10000)]
+        with RunProfiler() as profiler:
+            allocate()
+        report = profiler.report()
+        self.assertIn("allocate", report)
+        self.assertIn("Peak traced memory", report)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import io
+import unittest
+from PIL import Image
+from multi_format_processing.ocr_engine import OcrEngine, fill_scanned_pages, otsu_threshold, preprocess_image
+
+
+def fake_ocr(image, lang="eng"):
+    return f"{image.mode} {image.size[0]}x{image.size[1]}"
+
+
+def scanned_pdf_bytes(pages=3):
+    images = [Image.new("RGB", (200, 100), "white") for _ in range(pages)]
+    out = io.BytesIO()
+    images[0].save(out, format="PDF", save_all=True, append_images=images[1:])
+    return out.getvalue()
+
+
+class TestOcrEngine(unittest.TestCase):
+
+    def test_preprocess_downsamples_and_binarizes(self):
+        image = Image.new("RGB", (4000, 3000), "white")
+        processed = preprocess_image(image, max_pixels=1000 * 750)
+        self.assertEqual(processed.mode, "1")
+        self.assertEqual(processed.size, (1000, 750))
+
+    def test_small_images_keep_their_size(self):
+        processed = preprocess_image(Image.new("L", (300, 200)), binarize=False)
+        self.assertEqual((processed.mode, processed.size), ("L", (300, 200)))
+
+    def test_otsu_splits_two_levels(self):
+        image = Image.new("L", (10, 10), 30)
+        image.paste(220, (0, 0, 10, 5))
+        self.assertTrue(30 <= otsu_threshold(image) < 220)
+
+    def test_ocr_images_reports_timings_in_order(self):
+        engine = OcrEngine(max_workers=2, ocr_function=fake_ocr, max_pixels=100 * 100)
+        sources = [(i, Image.new("RGB", (200 + i, 200))) for i in range(5)]
+        results = list(engine.ocr_images(sources))
+        self.assertEqual([result["key"] for result in results], [0, 1, 2, 3, 4])
+        self.assertEqual(results[0]["size"], (200, 200))
+        self.assertTrue(results[0]["text"].startswith("1 "))
+        self.assertIn("ocr_seconds", results[0])
+
+    def test_failed_image_does_not_stop_batch(self):
+        engine = OcrEngine(max_workers=2, ocr_function=fake_ocr)
+        results = list(engine.ocr_images([("bad", b"not an image"), ("good", Image.new("L", (10, 10)))]))
+        self.assertIn("error", results[0])
+        self.assertEqual(results[1]["text"], "1 10x10")
+
+    def test_fill_scanned_pages(self):
+        engine = OcrEngine(max_workers=2, ocr_function=fake_ocr)
+        pages = fill_scanned_pages(scanned_pdf_bytes(), ["", "has text", ""], engine)
+        self.assertEqual(pages, ["1 200x100", "has text", "1 200x100"])
+
+if __name__ == "__main__":
+    unittest.main()
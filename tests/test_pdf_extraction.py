@@ -0,0 +1,29 @@
+import os
+import unittest
+from multi_format_processing.pdf_extraction import iter_pdf_pages
+
+SAMPLE_PDF = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                          "schema_inference", "dataset_example", "ind_nifty50.pdf")
+
+
+class TestPdfExtraction(unittest.TestCase):
+
+    def test_parallel_matches_serial_page_order(self):
+        serial = list(iter_pdf_pages(SAMPLE_PDF, max_workers=1))
+        parallel = list(iter_pdf_pages(SAMPLE_PDF, max_workers=2, pages_per_task=1))
+        self.assertGreater(len(serial), 1)
+        self.assertEqual(parallel, serial)
+
+    def test_accepts_pdf_bytes(self):
+        with open(SAMPLE_PDF, "rb") as f:
+            content = f.read()
+        self.assertEqual(list(iter_pdf_pages(content, max_workers=1)),
+                         list(iter_pdf_pages(SAMPLE_PDF, max_workers=1)))
+
+    def test_is_lazy(self):
+        pages = iter_pdf_pages(SAMPLE_PDF, max_workers=2, pages_per_task=1)
+        self.assertIsInstance(next(pages), str)
+        pages.close()
+
+if __name__ == "__main__":
+    unittest.main()
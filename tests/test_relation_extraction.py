@@ -0,0 +1,104 @@
+import unittest
+import spacy
+from spacy.tokens import Doc
+from spacy.vocab import Vocab
+from entity_extraction.relation_extraction import RelationExtractor, _sentence_batches, get_relation_extractor
+
+
+def make_doc(words, heads, deps, pos, ents=None, vocab=None):
+    # Parsed by hand so the tests don't need a trained model; heads are absolute indices
+    return Doc(
+        vocab or spacy.blank("en").vocab,
+        words=words,
+        heads=heads,
+        deps=deps,
+        pos=pos,
+        ents=ents,
+        sent_starts=[i == 0 for i in range(len(words))],
+    )
+
+
+def make_sentences(count):
+    # "CompanyN bought StartupN ." repeated, with both arguments tagged as organisations
+    words, heads, deps, pos, ents, sent_starts = [], [], [], [], [], []
+    for i in range(count):
+        offset = len(words)
+        words += [f"Company{i}", "bought", f"Startup{i}", "."]
+        heads += [offset + 1, offset + 1, offset + 1, offset + 1]
+        deps += ["nsubj", "ROOT", "dobj", "punct"]
+        pos += ["PROPN", "VERB", "PROPN", "PUNCT"]
+        ents += ["B-ORG", "O", "B-ORG", "O"]
+        sent_starts += [True, False, False, False]
+    return Doc(spacy.blank("en").vocab, words=words, heads=heads, deps=deps, pos=pos, ents=ents,
+               sent_starts=sent_starts)
+
+
+class TestRelationExtractor(unittest.TestCase):
+
+    def test_arguments_expand_to_entities(self):
+        # "The Reserve Bank raised interest rates ."
+        doc = make_doc(
+            ["The", "Reserve", "Bank", "raised", "interest", "rates", "."],
+            [2, 2, 3, 3, 5, 3, 3],
+            ["det", "compound", "nsubj", "ROOT", "compound", "dobj", "punct"],
+            ["DET", "PROPN", "PROPN", "VERB", "NOUN", "NOUN", "PUNCT"],
+            ["O", "B-ORG", "I-ORG", "O", "O", "O", "O"],
+        )
+        relationships = RelationExtractor(doc.vocab).extract(doc)
+        self.assertEqual(relationships, [{"subject": "Reserve Bank", "predicate": "raised", "object": "interest rates"}])
+
+    def test_compounds_without_noun_chunks(self):
+        # A vocabulary without a language has no noun chunk iterator
+        doc = make_doc(
+            ["Reserve", "Bank", "raised", "rates"],
+            [1, 2, 2, 2],
+            ["compound", "nsubj", "ROOT", "dobj"],
+            ["PROPN", "PROPN", "VERB", "NOUN"],
+            vocab=Vocab(),
+        )
+        relationships = RelationExtractor(doc.vocab).extract(doc)
+        self.assertEqual(relationships[0]["subject"], "Reserve Bank")
+
+    def test_preposition_and_passive_agent(self):
+        # "Beats was acquired by Apple in Cupertino"
+        doc = make_doc(
+            ["Beats", "was", "acquired", "by", "Apple", "in", "Cupertino"],
+            [2, 2, 2, 2, 3, 2, 5],
+            ["nsubjpass", "auxpass", "ROOT", "agent", "pobj", "prep", "pobj"],
+            ["PROPN", "AUX", "VERB", "ADP", "PROPN", "ADP", "PROPN"],
+        )
+        relationships = RelationExtractor(doc.vocab).extract(doc)
+        self.assertIn({"subject": "Apple", "predicate": "acquired", "object": "Beats"}, relationships)
+        self.assertIn({"subject": "Beats", "predicate": "acquired in", "object": "Cupertino"}, relationships)
+
+    def test_pronoun_arguments_are_dropped(self):
+        doc = make_doc(["It", "bought", "Beats"], [1, 1, 1], ["nsubj", "ROOT", "dobj"], ["PRON", "VERB", "PROPN"])
+        self.assertEqual(RelationExtractor(doc.vocab).extract(doc), [])
+
+    def test_extractor_is_cached_per_vocab(self):
+        vocab = Vocab()
+        self.assertIs(get_relation_extractor(vocab), get_relation_extractor(vocab))
+
+    def test_parallel_matches_serial(self):
+        doc = make_sentences(6)
+        extractor = RelationExtractor(doc.vocab)
+        serial = extractor.extract(doc)
+        self.assertEqual(len(serial), 6)
+        self.assertEqual(extractor.extract_parallel(doc, n_process=2, sentences_per_batch=2), serial)
+
+    def test_sentence_batches_keep_annotations(self):
+        doc = make_sentences(5)
+        parts = list(_sentence_batches(doc, list(doc.sents), 2))
+        self.assertEqual([len(list(part.sents)) for part in parts], [2, 2, 1])
+        self.assertEqual("".join(part.text_with_ws for part in parts), doc.text_with_ws)
+        self.assertEqual([ent.text for part in parts for ent in part.ents], [ent.text for ent in doc.ents])
+        self.assertEqual([token.dep_ for part in parts for token in part], [token.dep_ for token in doc])
+
+    def test_predicate_uses_lemmas_when_annotated(self):
+        doc = make_doc(["Apple", "bought", "Beats"], [1, 1, 1], ["nsubj", "ROOT", "dobj"], ["PROPN", "VERB", "PROPN"])
+        doc[1].lemma_ = "buy"
+        self.assertEqual(RelationExtractor(doc.vocab).extract(doc)[0]["predicate"], "buy")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,7 @@
 import sys
 import os
 import unittest
-from schema_inference.schema_inference_logic import infer_schema
+from schema_inference.schema_inference_logic import infer_schema, infer_schema_streaming, StreamingSchemaInference, TopKCounter
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
@@ -37,5 +37,70 @@ class TestSchemaInference(unittest.TestCase):
         schema = infer_schema(doc)
         self.assertGreaterEqual(schema["word_count"], 1)
 
+class TestStreamingSchemaInference(unittest.TestCase):
+
+    def test_matches_infer_schema(self):
+        doc = "Paris is the capital of France. Paris is large."
+        chunks = [doc[i:i + 7] for i in range(0, len(doc), 7)]
+        streamed = infer_schema_streaming(chunks)
+        schema = infer_schema(doc)
+        self.assertEqual(streamed["word_count"], schema["word_count"])
+        self.assertAlmostEqual(streamed["average_word_length"], schema["average_word_length"])
+        self.assertEqual(set(streamed["unique_entities"]), set(schema["unique_entities"]))
+        self.assertEqual(streamed["top_terms"][0], ("Paris", 2))
+
+    def test_memory_is_bounded(self):
+        chunks = (f"word{i} common " for i in range(10000))
+        schema = infer_schema_streaming(chunks, top_k=10)
+        self.assertEqual(schema["word_count"], 20000)
+        self.assertLessEqual(len(schema["unique_entities"]), 10)
+        self.assertEqual(schema["top_terms"][0], ("common", 10000))
+
+    def test_merge_shards(self):
+        left = StreamingSchemaInference()
+        left.update("alpha beta ")
+        right = StreamingSchemaInference()
+        right.update("beta gamma")
+        schema = left.merge(right).schema()
+        self.assertEqual(schema["word_count"], 4)
+        self.assertEqual(schema["top_terms"][0], ("beta", 2))
+
+    def test_empty_stream(self):
+        with self.assertRaises(RuntimeError):
+            infer_schema_streaming(iter(["  ", ""]))
+
+    def test_top_k_counter_prunes(self):
+        counter = TopKCounter(k=2)
+        counter.update(["a", "a", "a", "b", "b", "c", "d", "e"])
+        self.assertLessEqual(len(counter.counts), 4)
+        self.assertEqual(counter.most_common(1), [("a", 3)])
+
+    def test_top_k_counter_bounds_hold_after_repeated_pruning(self):
+        # "t" is pruned many times before it becomes frequent; its true count is 150
+        stream = []
+        for period in range(50):
+            stream += ["t"] + [f"w{period}_{i}" for i in range(11)]
+        stream += ["t"] * 100
+        counter = TopKCounter(k=2)
+        counter.update(stream)
+        count = dict(counter.most_common())["t"]
+        self.assertGreaterEqual(count, 150)
+        self.assertLessEqual(count - counter.error("t"), 150)
+
+        schema = infer_schema_streaming([" ".join(stream)], top_k=2)
+        count = dict(schema["top_terms"])["t"]
+        self.assertLessEqual(count - schema["count_error_bound"], 150)
+        self.assertGreaterEqual(count, 150)
+
+    def test_top_k_counter_merge_keeps_bounds(self):
+        left, right = TopKCounter(k=2), TopKCounter(k=2)
+        left.update(["a", "b", "c", "d", "e", "a", "a"])
+        right.update(["b", "x", "y", "z", "q", "b", "a"])
+        merged = left.merge(right)
+        for term, true_count in (("a", 4), ("b", 3)):
+            if term in merged.counts:
+                self.assertGreaterEqual(merged.counts[term], true_count)
+                self.assertLessEqual(merged.counts[term] - merged.error(term), true_count)
+
 if __name__ == "__main__":
     unittest.main()
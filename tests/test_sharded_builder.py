@@ -0,0 +1,58 @@
+import json
+import os
+import tempfile
+import unittest
+from rdflib import Graph
+from graph_population.columnar_store import ColumnarTripleStore
+from graph_population.knowledge_graph_builder import build_knowledge_graph, build_sharded_store
+from graph_population.sharded_builder import main, shard_items
+
+SCHEMAS = {
+    f"doc {i}": {"word_count": 10 + i, "unique_entities": ["Nifty50", "Reserve Bank", f"Company {i}"]}
+    for i in range(12)
+}
+
+
+class TestShardedBuilder(unittest.TestCase):
+
+    def test_shard_items(self):
+        shards = shard_items(list(range(10)), 4)
+        self.assertEqual([len(shard) for shard in shards], [3, 3, 2, 2])
+        self.assertEqual(sum(shards, []), list(range(10)))
+        self.assertEqual(shard_items([1, 2], 8), [[1], [2]])
+        self.assertEqual(shard_items([], 4), [])
+
+    def test_merge_drops_duplicates_across_shards(self):
+        items = list(SCHEMAS.items())
+        parts = [ColumnarTripleStore.from_graph(build_knowledge_graph(dict(items[:8]))),
+                 ColumnarTripleStore.from_graph(build_knowledge_graph(dict(items[4:])))]
+        merged = ColumnarTripleStore.merge(parts)
+        expected = build_knowledge_graph(SCHEMAS)
+        self.assertEqual(len(merged), len(expected))
+        self.assertEqual(set(merged.triples()), set(expected))
+        self.assertEqual(len(ColumnarTripleStore.merge([])), 0)
+
+    def test_sharded_build_matches_serial(self):
+        expected = set(build_knowledge_graph(SCHEMAS))
+        self.assertEqual(set(build_sharded_store(SCHEMAS, max_workers=1).triples()), expected)
+        self.assertEqual(set(build_sharded_store(SCHEMAS, max_workers=2).to_graph()), expected)
+
+    def test_main_builds_from_ingestion_results(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            results = os.path.join(tmp, "results.jsonl")
+            with open(results, "w", encoding="utf-8") as f:
+                for doc, schema in SCHEMAS.items():
+                    f.write(json.dumps({"path": doc, "schema": schema}) + "\n")
+                f.write(json.dumps({"path": "copy", "duplicate_of": "doc 1"}) + "\n")
+                # Torn last line left by an interrupted ingestion run
+                f.write('{"path": "doc 99", "sch')
+            nt_path, parquet_path = os.path.join(tmp, "graph.nt"), os.path.join(tmp, "graph.parquet")
+            self.assertEqual(main([results, "--output", nt_path, "--workers", "1"]), 0)
+            self.assertEqual(main([results, "--output", parquet_path, "--workers", "1"]), 0)
+            expected = set(build_knowledge_graph(SCHEMAS))
+            self.assertEqual(set(Graph().parse(nt_path, format="nt")), expected)
+            self.assertEqual(set(ColumnarTripleStore.read_parquet(parquet_path).triples()), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
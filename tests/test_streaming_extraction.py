@@ -0,0 +1,119 @@
+import io
+import os
+import tempfile
+import unittest
+import docx
+from multi_format_processing.extract_text import extract_text_from_docx, extract_text_from_html
+from multi_format_processing.streaming_extraction import extract_docx_text, extract_html_text, iter_docx_text
+
+PAGE = b"""<!DOCTYPE html><html><head><title>Markets today</title><script>var x = "<p>no</p>";</script>
+<style>p { color: red }</style></head><body>
+<nav><a href="/">Home</a> | <a href="/about">About</a></nav><header><h1>Site name</h1></header>
+<div class="article">Intro <b>bold</b> text.<p>Reserve Bank of India kept the <i>repo rate</i> unchanged.</p>
+after the paragraph <!-- hidden --> continues<ul><li>Nifty 50</li><li>Sensex &amp; Bank Nifty</li></ul>
+<div class="share-buttons">Share on X</div><div id="cookie-banner">We use cookies</div>
+<table><tr><td>HDFC</td><td>1,600</td></tr></table></div><footer>Copyright 2024</footer></body></html>"""
+
+EXPECTED_LINES = [
+    "Markets today",
+    "Intro bold text.",
+    "Reserve Bank of India kept the repo rate unchanged.",
+    "after the paragraph continues",
+    "Nifty 50",
+    "Sensex & Bank Nifty",
+    "HDFC\t1,600",
+]
+
+
+def sample_docx():
+    document = docx.Document()
+    document.sections[0].header.paragraphs[0].text = "Annual Report"
+    document.sections[0].footer.paragraphs[0].text = "Page footer"
+    document.add_paragraph("Reserve Bank of India raised rates.")
+    table = document.add_table(rows=2, cols=2)
+    for (row, col), text in {(0, 0): "Year", (0, 1): "Rate", (1, 0): "2023", (1, 1): "6.5%"}.items():
+        table.cell(row, col).text = text
+    document.add_paragraph("")
+    document.add_paragraph("Closing remarks.")
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+class TestStreamingDocx(unittest.TestCase):
+
+    def test_paragraphs_tables_headers_and_footers(self):
+        self.assertEqual(list(iter_docx_text(sample_docx())), [
+            "Annual Report", "Reserve Bank of India raised rates.", "Year\tRate", "2023\t6.5%",
+            "Closing remarks.", "Page footer",
+        ])
+
+    def test_without_headers(self):
+        text = extract_docx_text(io.BytesIO(sample_docx()), include_headers=False)
+        self.assertNotIn("Annual Report", text)
+        self.assertTrue(text.endswith("Closing remarks."))
+
+    def test_file_extractor(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "report.docx")
+            with open(path, "wb") as f:
+                f.write(sample_docx())
+            self.assertIn("2023\t6.5%", extract_text_from_docx(path))
+            broken = os.path.join(tmp, "broken.docx")
+            with open(broken, "wb") as f:
+                f.write(b"not a zip")
+            self.assertIsNone(extract_text_from_docx(broken))
+
+    def test_nested_table_stays_in_its_cell(self):
+        document = docx.Document()
+        outer = document.add_table(rows=1, cols=3)
+        outer.cell(0, 0).text = "A"
+        outer.cell(0, 2).text = "C"
+        inner = outer.cell(0, 1).add_table(rows=1, cols=2)
+        inner.cell(0, 0).text = "x"
+        inner.cell(0, 1).text = "y"
+        outer.cell(0, 1).add_paragraph("after inner")
+        buffer = io.BytesIO()
+        document.save(buffer)
+        self.assertEqual(list(iter_docx_text(buffer.getvalue(), include_headers=False)), ["A\tx y after inner\tC"])
+
+
+class TestStreamingHtml(unittest.TestCase):
+
+    def test_drops_boilerplate_and_keeps_order(self):
+        self.assertEqual(extract_html_text([PAGE]).split("\n"), EXPECTED_LINES)
+
+    def test_chunking_does_not_change_output(self):
+        for size in (1, 7, 100):
+            chunks = [PAGE[i:i + size] for i in range(0, len(PAGE), size)]
+            self.assertEqual(extract_html_text(chunks).split("\n"), EXPECTED_LINES)
+
+    def test_article_headers_are_content(self):
+        html = (b"<html><body><header>Site name</header><article><header><h1>Rates held</h1></header>"
+                b"<p>Body.</p><footer>By A. Writer</footer></article><footer>Copyright</footer></body></html>")
+        self.assertEqual(extract_html_text([html]).split("\n"), ["Rates held", "Body.", "By A. Writer"])
+
+    def test_declared_encoding(self):
+        html = "<html><body><p>Société Générale</p></body></html>".encode("latin-1")
+        self.assertEqual(extract_html_text([html], encoding="latin-1"), "Société Générale")
+
+    def test_undeclared_encoding_is_utf8(self):
+        self.assertEqual(extract_html_text([b"<p>caf\xc3", b"\xa9</p>"]), "café")
+
+    def test_meta_charset_and_byte_order_mark(self):
+        html = '<html><head><meta charset="windows-1252"></head><body><p>Société</p></body></html>'
+        self.assertEqual(extract_html_text([html.encode("cp1252")]), "Société")
+        self.assertEqual(extract_html_text(["<p>café</p>".encode("utf-16")]), "café")
+
+    def test_file_extractor(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "page.html")
+            with open(path, "wb") as f:
+                f.write(PAGE)
+            text = extract_text_from_html(path)
+        self.assertNotIn("cookies", text)
+        self.assertIn("Reserve Bank of India", text)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from multi_format_processing.url_ingestion import ValidatorStore, ingest_urls
+
+PAGE = b"<html><head><style>p {}</style><script>var x;</script></head><body><p>Nifty 50</p> <p>index</p></body></html>"
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path == "/missing":
+            self.send_response(404)
+            self.end_headers()
+            return
+        if self.path.startswith("/slow"):
+            time.sleep(0.1)
+        if self.headers.get("If-None-Match") == '"v1"':
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("ETag", '"v1"')
+        self.send_header("Content-Length", str(len(PAGE)))
+        self.end_headers()
+        self.wfile.write(PAGE)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestUrlIngestion(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+        cls.base = f"http://127.0.0.1:{cls.server.server_address[1]}"
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def test_batch_fetch_with_failures(self):
+        urls = [f"{self.base}/page{i}" for i in range(20)] + [f"{self.base}/missing"]
+        results, report = ingest_urls(urls, concurrency=8, per_host=4)
+        self.assertEqual(len(results), 21)
+        self.assertEqual(report.fetched, 20)
+        self.assertEqual(len(report.failures), 1)
+        self.assertGreater(report.pages_per_second, 0)
+        texts = {result["text"] for result in results if "text" in result}
+        self.assertEqual(texts, {"Nifty 50\nindex"})
+
+    def test_queued_requests_do_not_time_out(self):
+        # 40 requests to one host, 2 at a time, take about 2s in all; each one only 0.1s
+        urls = [f"{self.base}/slow{i}" for i in range(40)]
+        results, report = ingest_urls(urls, concurrency=16, per_host=2, timeout=1)
+        self.assertEqual(report.failures, [])
+        self.assertEqual(report.fetched, 40)
+
+    def test_conditional_get_reuses_text(self):
+        validators = ValidatorStore()
+        url = f"{self.base}/cached"
+        ingest_urls([url], validators=validators)
+        results, report = ingest_urls([url], validators=validators)
+        self.assertEqual(report.not_modified, 1)
+        self.assertEqual(results[0]["status"], 304)
+        self.assertEqual(results[0]["text"], "Nifty 50\nindex")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,222 @@
+import hashlib
+import logging
+from collections import OrderedDict
+
+import networkx as nx
+import plotly.graph_objects as go
+
+from pipeline.metrics import VISUALIZE, stage
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_NODES = 2000
+
+
+def local_name(term):
+    """Returns the last path segment of a URI, used as the node label."""
+    return str(term).split('/')[-1]
+
+
+def graph_to_networkx(graph):
+    """
+    Copies an rdflib Graph into an undirected networkx Graph of node labels.
+
+    Args:
+        graph (rdflib.Graph): Knowledge graph.
+
+    Returns:
+        networkx.Graph: Nodes are local names; edges carry the predicate as 'label'.
+    """
+    G = nx.Graph()
+    G.add_edges_from(
+        (local_name(s), local_name(o), {'label': local_name(p)}) for s, p, o in graph
+    )
+    return G
+
+
+def sample_nodes(G, max_nodes=DEFAULT_MAX_NODES, method="degree"):
+    """
+    Picks at most max_nodes of the most connected nodes.
+
+    Args:
+        G (networkx.Graph): Full graph.
+        max_nodes (int): Node budget.
+        method (str): 'degree' ranks by degree; 'kcore' ranks by core number first,
+            keeping the densest core of the graph together.
+
+    Returns:
+        set: Selected nodes.
+    """
+    if G.number_of_nodes() <= max_nodes:
+        return set(G.nodes)
+    if method == "kcore":
+        G = G.copy()
+        G.remove_edges_from(nx.selfloop_edges(G))
+        core = nx.core_number(G)
+        ranked = sorted(G.nodes, key=lambda n: (core[n], G.degree(n)), reverse=True)
+    elif method == "degree":
+        ranked = sorted(G.nodes, key=G.degree, reverse=True)
+    else:
+        raise ValueError(f"Unknown sampling method: {method}")
+    return set(ranked[:max_nodes])
+
+
+def expand_neighborhood(G, nodes, seeds, hops=1):
+    """
+    Adds the k-hop neighborhood of seed nodes to a node selection.
+
+    Args:
+        G (networkx.Graph): Full graph.
+        nodes (set): Currently selected nodes.
+        seeds (iterable): Nodes to expand around; unknown nodes are ignored.
+        hops (int): Neighborhood radius.
+
+    Returns:
+        set: The expanded selection.
+    """
+    expanded = set(nodes)
+    frontier = {seed for seed in seeds if seed in G}
+    expanded |= frontier
+    for _ in range(hops):
+        frontier = {nbr for node in frontier for nbr in G.neighbors(node)} - expanded
+        expanded |= frontier
+    return expanded
+
+
+def graph_fingerprint(G):
+    """Returns a stable hash of a graph's edges, used as the layout cache key."""
+    digest = hashlib.sha1()
+    for u, v in sorted(tuple(sorted((str(u), str(v)))) for u, v in G.edges):
+        digest.update(f"{u}\t{v}\n".encode("utf-8"))
+    for node in sorted(str(n) for n in nx.isolates(G)):
+        digest.update(f"{node}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+class LayoutCache:
+    """In-process LRU cache of node positions keyed by graph fingerprint."""
+
+    def __init__(self, max_entries=32):
+        self.max_entries = max_entries
+        self._layouts = OrderedDict()
+
+    def layout(self, G, iterations=None, seed=42):
+        """
+        Returns spring-layout positions for G, computing them only on a miss.
+
+        Views over 500 nodes start from a spectral layout and get fewer spring
+        iterations, since each iteration is quadratic in the node count.
+
+        Args:
+            G (networkx.Graph): Graph to lay out.
+            iterations (int): Spring layout iterations; chosen from the size if None.
+            seed (int): Random seed so reruns produce the same picture.
+
+        Returns:
+            dict: Node -> (x, y).
+        """
+        n = G.number_of_nodes()
+        if iterations is None:
+            iterations = max(5, min(50, int(50 * (500 / max(n, 1)) ** 2)))
+        key = (graph_fingerprint(G), iterations, seed)
+        if key in self._layouts:
+            self._layouts.move_to_end(key)
+            return self._layouts[key]
+        initial = nx.spectral_layout(G) if n > 500 else None
+        pos = nx.spring_layout(G, pos=initial, iterations=iterations, seed=seed)
+        self._layouts[key] = pos
+        if len(self._layouts) > self.max_entries:
+            self._layouts.popitem(last=False)
+        return pos
+
+
+default_layout_cache = LayoutCache()
+
+
+def large_graph_figure(G, pos, show_labels=None):
+    """
+    Draws a graph with WebGL traces.
+
+    Edges are one Scattergl line trace; node labels are only drawn as text for
+    small graphs and are otherwise shown on hover.
+
+    Args:
+        G (networkx.Graph): Graph to draw.
+        pos (dict): Node -> (x, y).
+        show_labels (bool): Draw text labels; defaults to True under 200 nodes.
+
+    Returns:
+        plotly.graph_objects.Figure: The figure.
+    """
+    if show_labels is None:
+        show_labels = G.number_of_nodes() < 200
+
+    edge_x = []
+    edge_y = []
+    for u, v in G.edges:
+        x0, y0 = pos[u]
+        x1, y1 = pos[v]
+        edge_x.extend([x0, x1, None])
+        edge_y.extend([y0, y1, None])
+
+    edge_trace = go.Scattergl(
+        x=edge_x, y=edge_y,
+        line=dict(width=0.5, color='#888'),
+        hoverinfo='none',
+        mode='lines'
+    )
+
+    nodes = list(G.nodes)
+    degrees = [G.degree(node) for node in nodes]
+    node_trace = go.Scattergl(
+        x=[pos[node][0] for node in nodes],
+        y=[pos[node][1] for node in nodes],
+        mode='markers+text' if show_labels else 'markers',
+        hoverinfo='text',
+        text=[f"{node} ({degree})" for node, degree in zip(nodes, degrees)],
+        textposition='bottom center',
+        marker=dict(
+            size=[min(6 + degree, 30) for degree in degrees],
+            color=degrees,
+            colorscale='Blues',
+            line_width=0.5
+        )
+    )
+
+    return go.Figure(data=[edge_trace, node_trace],
+                     layout=go.Layout(
+                         showlegend=False,
+                         hovermode='closest',
+                         margin=dict(b=0, l=0, r=0, t=0),
+                         xaxis=dict(showgrid=False, zeroline=False, showticklabels=False),
+                         yaxis=dict(showgrid=False, zeroline=False, showticklabels=False)
+                     ))
+
+
+def visualize_large_graph(graph, max_nodes=DEFAULT_MAX_NODES, method="degree",
+                          focus=(), hops=1, layout_cache=default_layout_cache):
+    """
+    Renders a sampled, WebGL view of a large knowledge graph.
+
+    Args:
+        graph (rdflib.Graph or networkx.Graph): Graph to render.
+        max_nodes (int): Node budget for the sample.
+        method (str): Sampling method, 'degree' or 'kcore'.
+        focus (iterable): Node labels whose neighborhood is added to the sample.
+        hops (int): Neighborhood radius around the focus nodes.
+        layout_cache (LayoutCache): Cache reused across reruns.
+
+    Returns:
+        tuple: (plotly Figure, number of nodes shown, total number of nodes)
+    """
+    with stage(VISUALIZE) as record:
+        G = graph if isinstance(graph, nx.Graph) else graph_to_networkx(graph)
+        nodes = sample_nodes(G, max_nodes, method)
+        if focus:
+            nodes = expand_neighborhood(G, nodes, focus, hops)
+        view = G.subgraph(nodes)
+        pos = layout_cache.layout(view)
+        logger.info(f"Rendering {view.number_of_nodes()} of {G.number_of_nodes()} nodes")
+        fig = large_graph_figure(view, pos)
+        record.items = view.number_of_nodes()
+    return fig, view.number_of_nodes(), G.number_of_nodes()